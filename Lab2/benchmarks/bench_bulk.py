@@ -0,0 +1,59 @@
+# Надходження партії з складу та продажі за день: цикл add_book / purchase_book
+# проти пакетних add_books / purchase_books.
+# Запуск з каталогу Lab2: python -m benchmarks.bench_bulk --rows 500000
+import argparse
+import time
+
+from bookstore import Bookstore
+
+
+def shipment(count: int):
+    # Близько чверті рядків - поповнення книг, що вже є
+    for i in range(count):
+        n = i % (count * 3 // 4 or 1)
+        yield f"Title {n}", f"Author {n % 5000}", 5.0 + (n % 4000) / 100, 1 + i % 20
+
+
+def sales(count: int):
+    for i in range(count):
+        yield f"Title {(i * 7) % count}", 1 + i % 3
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def looped_sales(store: Bookstore, count: int) -> float:
+    total = 0.0
+    for title, quantity in sales(count):
+        try:
+            total += store.purchase_book(title, quantity)
+        except ValueError:
+            pass
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500000)
+    args = parser.parse_args()
+
+    looped = Bookstore()
+    add_loop = timed(lambda: [looped.add_book(*row) for row in shipment(args.rows)])
+    bulk = Bookstore()
+    add_bulk = timed(lambda: bulk.add_books(shipment(args.rows)))
+    assert bulk.inventory == looped.inventory and bulk.check_inventory_value()
+    print(f"add {args.rows:,} rows:      loop {add_loop:6.2f} s | add_books      {add_bulk:6.2f} s "
+          f"({add_loop / add_bulk:.1f}x)")
+
+    buy_loop = timed(lambda: looped_sales(looped, args.rows))
+    buy_bulk = timed(lambda: bulk.purchase_books(sales(args.rows)))
+    assert bulk.inventory == looped.inventory and bulk.check_inventory_value()
+    print(f"purchase {args.rows:,} rows: loop {buy_loop:6.2f} s | purchase_books {buy_bulk:6.2f} s "
+          f"({buy_loop / buy_bulk:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Загальносайтова акція: apply_discount для кожної назви проти пакетної акції
+# з поверненням цін після завершення.
+# Запуск з каталогу Lab2: python -m benchmarks.bench_promotions --books 200000
+import argparse
+import time
+
+from bookstore import Bookstore
+
+
+def build_store(count: int) -> Bookstore:
+    store = Bookstore()
+    for i in range(count):
+        store.add_book(f"Title {i}", f"Author {i % 5000}", 5.0 + (i % 4000) / 100, 1 + i % 20)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=200000)
+    args = parser.parse_args()
+    discounts = {f"Title {i}": (10, 15, 20, 25)[i % 4] for i in range(args.books)}
+
+    store = build_store(args.books)
+    start = time.perf_counter()
+    for title, discount in discounts.items():
+        store.apply_discount(title, discount)
+    per_title = time.perf_counter() - start
+    looped = {title: book["price"] for title, book in store.inventory.items()}
+
+    store = build_store(args.books)
+    start = time.perf_counter()
+    promotion_id = store.schedule_promotion(discounts)
+    batched = time.perf_counter() - start
+    assert {title: book["price"] for title, book in store.inventory.items()} == looped
+
+    start = time.perf_counter()
+    store.end_promotion(promotion_id)
+    revert = time.perf_counter() - start
+    assert store.check_inventory_value()
+
+    print(f"{args.books:,} titles: apply_discount loop {per_title:6.2f} s | "
+          f"promotion {batched:6.2f} s ({per_title / batched:.1f}x) | revert {revert:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,118 @@
+import heapq
+import itertools
+import math
+import time
+from money import PRICE_SCALE, discount_ratio, from_units, scale_units, to_units
+
+
 class Bookstore:
     def __init__(self):
         self.inventory = {}
+        # Вартість складу підтримується інкрементно в мінімальних одиницях (ціна * кількість),
+        # тож inventory_value() та зведення за автором і категорією читаються за O(1).
+        # Зміни інвентарю слід робити через методи класу; check_inventory_value()
+        # порівнює накопичені суми з повним перерахунком
+        self._price_units = {}
+        self._total_units = 0
+        self._author_units = {}
+        self._category_units = {}
+        # Заплановані акції: id -> {"discounts", "start", "end", "changed"}; _promotion_events -
+        # купа (час, id, дія), _promoted - назва -> id активної акції
+        self.promotions = {}
+        self._promotion_events = []
+        self._promoted = {}
+        self._promotion_ids = itertools.count(1)
+        self._clock = time.time
 
-    def add_book(self, title: str, author: str, price: float, quantity: int):
+    def add_book(self, title: str, author: str, price: float, quantity: int, category: str = None):
         if quantity < 0:
             raise ValueError("Quantity cannot be negative")
         if price < 0:
             raise ValueError("Price cannot be negative")
+        if not math.isfinite(price):
+            raise ValueError("Price must be a finite number")
         if title in self.inventory:
-            self.inventory[title]["quantity"] += quantity
+            book = self.inventory[title]
+            book["quantity"] += quantity
         else:
-            self.inventory[title] = {
+            # Ціна в одиницях рахується до зміни стану: якщо to_units відмовить, книги не буде
+            units = to_units(price)
+            book = self.inventory[title] = {
                 "author": author,
                 "price": price,
-                "quantity": quantity
+                "quantity": quantity,
+                "category": category
             }
+            self._price_units[title] = units
+        self._adjust_value(book, self._price_units[title] * quantity)
+
+    def add_books(self, books) -> list:
+        # Пакетне додавання: books - ітерований об'єкт або генератор кортежів
+        # (title, author, price, quantity[, category]). Результат той самий, що й у циклу
+        # add_book, але вартість складу оновлюється одним проходом наприкінці.
+        # Некоректні рядки пропускаються; повертається список (номер рядка, повідомлення)
+        inventory = self.inventory
+        price_units = self._price_units
+        units_of = {}  # ціни в партії часто повторюються, тож to_units рахується раз на ціну
+        by_author = {}
+        by_category = {}
+        failures = []
+        # finally: зміни вже оброблених рядків потрапляють у зведення, навіть якщо
+        # ітератор партії сам кине виняток
+        try:
+            for index, row in enumerate(books):
+                # Увесь рядок перевіряється до будь-яких змін інвентарю
+                try:
+                    if len(row) == 4:
+                        title, author, price, quantity = row
+                        category = None
+                    else:
+                        title, author, price, quantity, category = row
+                    if quantity < 0:
+                        raise ValueError("Quantity cannot be negative")
+                    if price < 0:
+                        raise ValueError("Price cannot be negative")
+                    if not math.isfinite(price):
+                        raise ValueError("Price must be a finite number")
+                    # Назва, автор і категорія стають ключами словників, тож мають бути хешованими
+                    hash((title, author, category))
+                    book = inventory.get(title)
+                    if book is None:
+                        units = units_of.get(price)
+                        if units is None:
+                            units = units_of[price] = to_units(price)
+                except (TypeError, ValueError) as error:
+                    failures.append((index, str(error)))
+                    continue
+                if book is None:
+                    inventory[title] = {
+                        "author": author,
+                        "price": price,
+                        "quantity": quantity,
+                        "category": category
+                    }
+                    price_units[title] = units
+                else:
+                    book["quantity"] += quantity
+                    units = price_units[title]
+                    author = book["author"]
+                    category = book.get("category")
+                delta = units * quantity
+                if delta:
+                    by_author[author] = by_author.get(author, 0) + delta
+                    if category is not None:
+                        by_category[category] = by_category.get(category, 0) + delta
+        finally:
+            self._apply_deltas(by_author, by_category)
+        return failures
 
     def remove_book(self, title: str):
         if title in self.inventory:
-            del self.inventory[title]
+            book = self.inventory.pop(title)
+            self._adjust_value(book, -self._price_units.pop(title) * book["quantity"])
 
     def search_book(self, title: str) -> dict:
+        self.run_promotions()
         if not title:
             return None
         if title in self.inventory:
@@ -33,6 +125,7 @@ class Bookstore:
         return None
 
     def purchase_book(self, title: str, quantity: int) -> float:
+        self.run_promotions()
         if title not in self.inventory:
             raise ValueError("Book not found")
         if self.inventory[title]["quantity"] == 0:
@@ -40,20 +133,210 @@ class Bookstore:
         if self.inventory[title]["quantity"] < quantity:
             raise ValueError("Not enough books in inventory")
         self.inventory[title]["quantity"] -= quantity
+        self._adjust_value(self.inventory[title], -self._price_units[title] * quantity)
         return self.inventory[title]["price"] * quantity
 
+    def purchase_books(self, purchases) -> tuple:
+        # Пакетна покупка: purchases - ітерований об'єкт пар (title, quantity), що
+        # обробляються по черзі, як у циклі purchase_book. Рядки з помилкою не
+        # переривають пакет. Повертає (загальна сума, [(номер рядка, повідомлення)])
+        self.run_promotions()
+        inventory = self.inventory
+        price_units = self._price_units
+        by_author = {}
+        by_category = {}
+        failures = []
+        total_units = 0
+        try:
+            for index, row in enumerate(purchases):
+                # Форма рядка, тип кількості та хешованість назви перевіряються до змін
+                try:
+                    title, quantity = row
+                    book = inventory.get(title)
+                    if book is None:
+                        failures.append((index, "Book not found"))
+                        continue
+                    stock = book["quantity"]
+                    if stock == 0:
+                        failures.append((index, "Book is out of stock"))
+                        continue
+                    if stock < quantity:
+                        failures.append((index, "Not enough books in inventory"))
+                        continue
+                    units = price_units[title] * quantity
+                    remaining = stock - quantity
+                except (TypeError, ValueError) as error:
+                    failures.append((index, str(error)))
+                    continue
+                book["quantity"] = remaining
+                if units:
+                    total_units += units
+                    author = book["author"]
+                    by_author[author] = by_author.get(author, 0) - units
+                    category = book["category"]
+                    if category is not None:
+                        by_category[category] = by_category.get(category, 0) - units
+        finally:
+            self._apply_deltas(by_author, by_category)
+        return from_units(total_units), failures
+
     def inventory_value(self) -> float:
-        total = 0.0
+        self.run_promotions()
+        return from_units(self._total_units)
+
+    def value_by_author(self) -> dict:
+        return {author: from_units(units) for author, units in self._author_units.items()}
+
+    def value_by_category(self) -> dict:
+        # Книги без категорії входять лише до загальної вартості
+        return {category: from_units(units) for category, units in self._category_units.items()}
+
+    def check_inventory_value(self) -> bool:
+        # Перевірка узгодженості: повний перерахунок з інвентарю має збігтися з накопиченими сумами
+        total = 0
+        by_author = {}
+        by_category = {}
         for book in self.inventory.values():
-            total += book["price"] * book["quantity"]
-        return total
+            units = to_units(book["price"]) * book["quantity"]
+            total += units
+            if units:
+                by_author[book["author"]] = by_author.get(book["author"], 0) + units
+                if book.get("category") is not None:
+                    by_category[book["category"]] = by_category.get(book["category"], 0) + units
+        return (total == self._total_units and by_author == self._author_units
+                and by_category == self._category_units)
+
+    def _adjust_value(self, book: dict, delta: int):
+        # Додає зміну вартості до загальної суми та зведень; порожні зведення видаляються
+        if not delta:
+            return
+        self._total_units += delta
+        self._bump(self._author_units, book["author"], delta)
+        if book.get("category") is not None:
+            self._bump(self._category_units, book["category"], delta)
+
+    @staticmethod
+    def _bump(rollup: dict, key, delta: int):
+        units = rollup.get(key, 0) + delta
+        if units:
+            rollup[key] = units
+        else:
+            del rollup[key]
 
     def apply_discount(self, title: str, discount_percentage: float):
-        if title in self.inventory and 0 <= discount_percentage <= 100:
-            self.inventory[title]['price'] *= (1 - discount_percentage / 100)
+        # Нова ціна округлюється до цілих мінімальних одиниць, тож повторні акції
+        # не накопичують похибок множення float
+        if 0 <= discount_percentage <= 100:
+            self._apply_discounts({title: discount_percentage})
 
     def apply_promotion(self, promotion_details: dict):
-        for title, discount in promotion_details.items():
-            self.apply_discount(title, discount)
+        # Як і раніше, книги, яких немає, та некоректні відсотки пропускаються
+        self._apply_discounts({title: discount for title, discount in promotion_details.items()
+                               if 0 <= discount <= 100})
+
+    # Акції з початком і кінцем
+    def schedule_promotion(self, discounts: dict, start: float = None, end: float = None) -> int:
+        # discounts: назва -> відсоток знижки; start і end - моменти time.time().
+        # Увесь набір перевіряється одразу; без start акція починається негайно.
+        # Після завершення ціни повертаються до попередніх за O(змінених книг)
+        for discount in discounts.values():
+            if not 0 <= discount <= 100:
+                raise ValueError("Discount percentage must be between 0 and 100")
+        if start is not None and end is not None and end <= start:
+            raise ValueError("Promotion must end after it starts")
+        promotion_id = next(self._promotion_ids)
+        self.promotions[promotion_id] = {"discounts": dict(discounts), "start": start, "end": end, "changed": None}
+        heapq.heappush(self._promotion_events,
+                       (start if start is not None else float("-inf"), promotion_id, "start"))
+        if end is not None:
+            heapq.heappush(self._promotion_events, (end, promotion_id, "end"))
+        self.run_promotions()
+        return promotion_id
+
+    def run_promotions(self, now: float = None):
+        # Запускає та завершує акції, час яких настав
+        events = self._promotion_events
+        if not events:
+            return
+        now = self._clock() if now is None else now
+        while events and events[0][0] <= now:
+            _, promotion_id, action = heapq.heappop(events)
+            if action == "start":
+                self._start_promotion(promotion_id)
+            else:
+                self.end_promotion(promotion_id)
+
+    def end_promotion(self, promotion_id: int):
+        # Повертає ціни книг, змінених акцією. Якщо ціну після початку акції змінили
+        # вручну або книгу видалили, її не чіпаємо
+        promotion = self.promotions.pop(promotion_id, None)
+        if promotion is None or promotion["changed"] is None:
+            return
+        restore = {}
+        for title, (old_units, new_units) in promotion["changed"].items():
+            del self._promoted[title]
+            if title in self.inventory and self._price_units[title] == new_units:
+                restore[title] = old_units
+        self._set_price_units(restore)
+
+    def _start_promotion(self, promotion_id: int):
+        promotion = self.promotions.get(promotion_id)
+        if promotion is None or promotion["changed"] is not None:
+            return
+        # Книга бере участь лише в одній активній акції одночасно
+        discounts = {title: discount for title, discount in promotion["discounts"].items()
+                     if title not in self._promoted}
+        promotion["changed"] = self._apply_discounts(discounts)
+        for title in promotion["changed"]:
+            self._promoted[title] = promotion_id
+
+    def _apply_discounts(self, discounts: dict) -> dict:
+        # Пакетне застосування знижок: множник обчислюється один раз на кожен відсоток.
+        # Повертає назва -> (стара ціна, нова ціна) у мінімальних одиницях
+        ratios = {}
+        prices = {}
+        changed = {}
+        price_units = self._price_units
+        for title, discount in discounts.items():
+            old_units = price_units.get(title)
+            if old_units is None:
+                continue
+            ratio = ratios.get(discount)
+            if ratio is None:
+                ratio = ratios[discount] = discount_ratio(discount)
+            new_units = scale_units(old_units, *ratio)
+            prices[title] = new_units
+            changed[title] = (old_units, new_units)
+        self._set_price_units(prices)
+        return changed
+
+    def _set_price_units(self, prices: dict):
+        # Встановлює нові ціни та одним проходом оновлює вартість складу і зведення
+        inventory = self.inventory
+        price_units = self._price_units
+        by_author = {}
+        by_category = {}
+        for title, units in prices.items():
+            book = inventory[title]
+            delta = (units - price_units[title]) * book["quantity"]
+            price_units[title] = units
+            book["price"] = units / PRICE_SCALE
+            self._collect_delta(by_author, by_category, book, delta)
+        self._apply_deltas(by_author, by_category)
 
+    @staticmethod
+    def _collect_delta(by_author: dict, by_category: dict, book: dict, delta: int):
+        # Накопичує зміну вартості книги для пакетних операцій (див. _apply_deltas)
+        if delta:
+            by_author[book["author"]] = by_author.get(book["author"], 0) + delta
+            category = book.get("category")
+            if category is not None:
+                by_category[category] = by_category.get(category, 0) + delta
 
+    def _apply_deltas(self, by_author: dict, by_category: dict):
+        # Кожна книга має автора, тож сума змін за авторами - це зміна загальної вартості
+        for author, delta in by_author.items():
+            self._total_units += delta
+            self._bump(self._author_units, author, delta)
+        for category, delta in by_category.items():
+            self._bump(self._category_units, category, delta)
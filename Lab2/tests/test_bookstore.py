@@ -1,3 +1,4 @@
+import time
 import pytest
 from bookstore import Bookstore
 
@@ -76,6 +77,17 @@ def test_add_book_negative_price():
     with pytest.raises(ValueError):
         store.add_book("Negative Price Book", "Author", -10.99, 5)
 
+def test_add_book_non_finite_price():
+    store = Bookstore()
+    for price in (float("inf"), float("nan")):
+        with pytest.raises(ValueError):
+            store.add_book("Infinite Book", "Author", price, 5)
+    assert "Infinite Book" not in store.inventory
+    store.add_book("Infinite Book", "Author", 10.99, 5)
+    store.remove_book("Infinite Book")
+    assert "Infinite Book" not in store.inventory
+    assert store.check_inventory_value()
+
 def test_purchase_book_with_zero_stock():
     store = Bookstore()
     store.add_book("Zero Stock Book", "Author", 10.99, 0)
@@ -103,6 +115,14 @@ def test_apply_discount():
     store.apply_discount("1984", 20)
     assert store.inventory["1984"]["price"] == 12.00
 
+# Тест, що повторні знижки не накопичують похибок округлення
+def test_apply_discount_repeated():
+    store = Bookstore()
+    store.add_book("Dune", "Frank Herbert", 19.99, 1)
+    for _ in range(3):
+        store.apply_discount("Dune", 10)
+    assert store.inventory["Dune"]["price"] == 14.5727
+
 # Тест для акцій
 def test_apply_promotion():
     store = Bookstore()
@@ -113,3 +133,153 @@ def test_apply_promotion():
     assert store.inventory["Brave New World"]["price"] == 18.00
     assert store.inventory["1984"]["price"] == 14.25
 
+
+# Тест інкрементної вартості складу та зведень за автором і категорією
+def test_inventory_value_tracks_changes():
+    store = Bookstore()
+    store.add_book("Book A", "Author A", 20.00, 2, category="Fiction")
+    store.add_book("Book B", "Author B", 15.00, 3, category="Science")
+    store.add_book("Book C", "Author A", 10.99, 1)
+    assert store.inventory_value() == 95.99
+
+    store.purchase_book("Book B", 1)
+    store.apply_discount("Book A", 10)
+    store.apply_promotion({"Book C": 50})
+    store.add_book("Book A", "Author A", 20.00, 1)
+    assert store.inventory_value() == 54.00 + 30.00 + 5.495
+    assert store.value_by_author() == {"Author A": 59.495, "Author B": 30.00}
+    assert store.value_by_category() == {"Fiction": 54.00, "Science": 30.00}
+
+    store.remove_book("Book B")
+    assert store.value_by_author() == {"Author A": 59.495}
+    assert store.value_by_category() == {"Fiction": 54.00}
+    assert store.check_inventory_value()
+
+def test_check_inventory_value_detects_direct_changes():
+    store = Bookstore()
+    store.add_book("Book A", "Author A", 20.00, 2)
+    assert store.check_inventory_value()
+    store.inventory["Book A"]["quantity"] = 5
+    assert not store.check_inventory_value()
+
+# Тест запланованих акцій: початок, завершення та повернення цін
+def test_scheduled_promotion():
+    store = Bookstore()
+    store.add_book("Brave New World", "Aldous Huxley", 20.00, 5)
+    store.add_book("1984", "George Orwell", 15.00, 10)
+    now = time.time()
+    promotion_id = store.schedule_promotion({"Brave New World": 10, "1984": 12.5, "Missing": 50},
+                                            start=now + 100, end=now + 200)
+    store.run_promotions(now=now + 50)
+    assert store.inventory["1984"]["price"] == 15.00
+
+    store.run_promotions(now=now + 100)
+    assert store.inventory["Brave New World"]["price"] == 18.00
+    assert store.inventory["1984"]["price"] == 13.125
+    assert store.inventory_value() == 18.00 * 5 + 13.125 * 10
+    assert set(store.promotions[promotion_id]["changed"]) == {"Brave New World", "1984"}
+
+    store.run_promotions(now=now + 200)
+    assert store.inventory["Brave New World"]["price"] == 20.00
+    assert store.inventory["1984"]["price"] == 15.00
+    assert promotion_id not in store.promotions
+    assert store.check_inventory_value()
+
+def test_promotion_validated_once():
+    store = Bookstore()
+    store.add_book("1984", "George Orwell", 15.00, 10)
+    with pytest.raises(ValueError):
+        store.schedule_promotion({"1984": 10, "Other": 120})
+    assert store.inventory["1984"]["price"] == 15.00
+    with pytest.raises(ValueError):
+        store.schedule_promotion({"1984": 10}, start=200, end=100)
+
+def test_end_promotion_keeps_manual_price_change():
+    store = Bookstore()
+    store.add_book("Brave New World", "Aldous Huxley", 20.00, 5)
+    store.add_book("1984", "George Orwell", 15.00, 10)
+    first = store.schedule_promotion({"Brave New World": 50, "1984": 20})
+    # Книга вже в активній акції, тож друга акція її не змінює
+    second = store.schedule_promotion({"1984": 50})
+    assert store.promotions[second]["changed"] == {}
+    store.apply_discount("Brave New World", 10)
+
+    store.end_promotion(first)
+    assert store.inventory["Brave New World"]["price"] == 9.00
+    assert store.inventory["1984"]["price"] == 15.00
+    assert store.check_inventory_value()
+
+# Тест пакетного додавання книг з помилками в окремих рядках
+def test_add_books_batch():
+    store = Bookstore()
+    rows = (row for row in [
+        ("Book A", "Author A", 20.00, 2, "Fiction"),
+        ("Book B", "Author B", -1.00, 3),
+        ("Book C", "Author A", 10.00, -1),
+        ("Book A", "Author A", 20.00, 1),
+        ("Book D", "Author B", 15.00, 4),
+    ])
+    failures = store.add_books(rows)
+    assert failures == [(1, "Price cannot be negative"), (2, "Quantity cannot be negative")]
+    assert store.inventory["Book A"]["quantity"] == 3
+    assert "Book B" not in store.inventory
+    assert store.inventory_value() == 120.00
+    assert store.value_by_category() == {"Fiction": 60.00}
+    assert store.check_inventory_value()
+
+# Тест пакетної покупки: рядки обробляються по черзі, помилки не переривають пакет
+def test_purchase_books_batch():
+    store = Bookstore()
+    store.add_books([("Book A", "Author A", 14.99, 3), ("Book B", "Author B", 10.00, 0)])
+    total, failures = store.purchase_books([("Book A", 2), ("Book B", 1), ("Missing", 1), ("Book A", 2),
+                                            ("Book A", 1)])
+    assert total == 44.97
+    assert failures == [(1, "Book is out of stock"), (2, "Book not found"), (3, "Not enough books in inventory")]
+    assert store.inventory["Book A"]["quantity"] == 0
+    assert store.inventory_value() == 0
+    assert store.check_inventory_value()
+
+# Тест, що некоректні за формою чи типом рядки не переривають пакет і не псують зведення
+def test_add_books_malformed_rows():
+    store = Bookstore()
+    failures = store.add_books([
+        ("Book A", "Author A", 20.00, 2, "Fiction"),
+        ("Book B",),
+        (["unhashable"], "Author B", 5.00, 1),
+        ("Book C", "Author C", float("nan"), 1),
+        ("Book D", "Author D", float("inf"), 1),
+        ("Book E", "Author E", "10", 1),
+        ("Book F", ["unhashable"], 5.00, 1),
+        None,
+        ("Book A", "Author A", 20.00, 1),
+    ])
+    assert [index for index, _ in failures] == [1, 2, 3, 4, 5, 6, 7]
+    assert store.inventory["Book A"]["quantity"] == 3
+    assert set(store.inventory) == {"Book A"}
+    assert store.inventory_value() == 60.00
+    assert store.check_inventory_value()
+
+def test_purchase_books_malformed_rows():
+    store = Bookstore()
+    store.add_books([("Book A", "Author A", 10.00, 5, "Fiction")])
+    total, failures = store.purchase_books([("Book A", 1), ("Book B",), ("Book A", "2"), (["x"], 1), None,
+                                            ("Book A", 2)])
+    assert total == 30.00
+    assert [index for index, _ in failures] == [1, 2, 3, 4]
+    assert store.inventory["Book A"]["quantity"] == 2
+    assert store.inventory_value() == 20.00
+    assert store.check_inventory_value()
+
+# Тест, що зведення оновлюються, навіть якщо ітератор партії кидає виняток
+def test_bulk_rollups_survive_iterator_error():
+    store = Bookstore()
+    store.add_books([("Book A", "Author A", 10.00, 5)])
+
+    def purchases():
+        yield ("Book A", 2)
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        store.purchase_books(purchases())
+    assert store.inventory["Book A"]["quantity"] == 3
+    assert store.check_inventory_value()
@@ -0,0 +1,56 @@
+# Порівняння пам'яті інвентарю: dict на кожну книгу проти ColumnarInventory.
+# Запуск з каталогу Lab3: python -m benchmarks.bench_memory --sizes 100000,1000000
+import argparse
+import tracemalloc
+
+from bookstore import Bookstore
+from columnar_inventory import ColumnarInventory
+
+
+def rows(size: int):
+    # Рядки створюються заново для кожної книги, як при читанні з файлу чи бази
+    for i in range(size):
+        yield (f"Title of book number {i}", "Author " + str(i % 5000), f"{i:013d}", 10.0 + i % 50, i % 100)
+
+
+def measure(make_inventory, size: int) -> int:
+    tracemalloc.start()
+    inventory = make_inventory()
+    for title, author, isbn, price, quantity in rows(size):
+        inventory[isbn] = {"title": title, "author": author, "price": price, "quantity": quantity}
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del inventory
+    return used
+
+
+def measure_store(make_inventory, size: int) -> int:
+    tracemalloc.start()
+    store = Bookstore(make_inventory())
+    for title, author, isbn, price, quantity in rows(size):
+        store.add_book(title, author, isbn, price, quantity)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100000")
+    args = parser.parse_args()
+
+    for size in map(int, args.sizes.split(",")):
+        dict_bytes = measure(dict, size)
+        columnar_bytes = measure(ColumnarInventory, size)
+        print(f"{size:>9,} books inventory: dict {dict_bytes / 2**20:8.1f} MiB "
+              f"({dict_bytes / size:5.0f} B/book) | columnar {columnar_bytes / 2**20:8.1f} MiB "
+              f"({columnar_bytes / size:5.0f} B/book) | saved {1 - columnar_bytes / dict_bytes:.0%}")
+        dict_store = measure_store(dict, size)
+        columnar_store = measure_store(ColumnarInventory, size)
+        print(f"{size:>9,} books Bookstore incl. search index: dict {dict_store / 2**20:8.1f} MiB | "
+              f"columnar {columnar_store / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Швидкість генерації ідентифікаторів замовлень (ids/с) для кожної стратегії:
+# str(uuid.uuid4()) проти ULID та UUIDv7, поодинці та пакетами.
+# Запуск з каталогу Lab3: python -m benchmarks.bench_order_ids --ids 200000
+import argparse
+import time
+
+from order_ids import ULIDGenerator, UUID4Generator, UUID7Generator
+
+
+def single(generator, count: int) -> list:
+    return [generator() for _ in range(count)]
+
+
+def batched(generator, count: int, batch_size: int) -> list:
+    ids = []
+    for _ in range(count // batch_size):
+        ids.extend(generator.batch(batch_size))
+    return ids
+
+
+def measure(name: str, produce, count: int):
+    start = time.perf_counter()
+    ids = produce()
+    elapsed = time.perf_counter() - start
+    assert len(ids) == count and len(set(ids)) == count
+    print(f"{name:<16} {count / elapsed:12,.0f} ids/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ids", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    count = args.ids - args.ids % args.batch
+
+    for name, generator in (("uuid4", UUID4Generator()), ("ulid", ULIDGenerator()), ("uuid7", UUID7Generator())):
+        measure(name, lambda: single(generator, count), count)
+        measure(f"{name} batch", lambda: batched(generator, count, args.batch), count)
+
+
+if __name__ == "__main__":
+    main()
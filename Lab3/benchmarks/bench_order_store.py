@@ -0,0 +1,85 @@
+# Пам'ять на активне замовлення та швидкість вибірки за статусом:
+# попередній dict замовлення з dict на кожну позицію проти Order/OrderStore.
+# Запуск з каталогу Lab3: python -m benchmarks.bench_order_store --orders 200000
+import argparse
+import time
+import tracemalloc
+import uuid
+
+from order_store import Order, OrderStore
+
+
+
+def status_of(i: int) -> str:
+    # Більшість замовлень уже завершені, а відстежувати треба невелику частку
+    if i % 100 == 0:
+        return "Shipped"
+    if i % 10 == 0:
+        return "Processing"
+    return "Completed"
+
+
+def order_rows(count: int):
+    for i in range(count):
+        lines = tuple((f"{(i * 7 + k) % 100000:013d}", 1 + k, 10.0 + k) for k in range(3))
+        yield (str(uuid.uuid4()), f"Customer {i % 20000}", f"{i} Main St", f"555-{i % 10000:04d}",
+               lines, 42.0, status_of(i))
+
+
+def build_dicts(count: int) -> dict:
+    # Попередній формат: dict замовлення, рядок contact_info та dict на кожну позицію
+    orders = {}
+    for order_id, customer, address, contact, lines, total, status in order_rows(count):
+        orders[order_id] = {
+            "customer_name": customer,
+            "contact_info": f"{address}, {contact}",
+            "items": {isbn: {"quantity": quantity, "price": price} for isbn, quantity, price in lines},
+            "total_amount": total,
+            "status": status,
+            "order_id": order_id
+        }
+    return orders
+
+
+def build_store(count: int) -> OrderStore:
+    store = OrderStore()
+    for row in order_rows(count):
+        store.add(Order(*row))
+    return store
+
+
+def measure(build, count: int):
+    tracemalloc.start()
+    orders = build(count)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return orders, used
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=200000)
+    args = parser.parse_args()
+
+    dicts, dict_bytes = measure(build_dicts, args.orders)
+    store, store_bytes = measure(build_store, args.orders)
+    print(f"memory per live order: dict {dict_bytes / args.orders:6.0f} B | "
+          f"Order + indexes {store_bytes / args.orders:6.0f} B")
+
+    start = time.perf_counter()
+    scanned = [order for order in dicts.values() if order["status"] == "Shipped"]
+    scan_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    indexed = store.by_status("Shipped")
+    index_ms = (time.perf_counter() - start) * 1e3
+    assert len(scanned) == len(indexed)
+    print(f"status query ({len(indexed):,} of {args.orders:,}): scan {scan_ms:7.2f} ms | index {index_ms:7.2f} ms")
+
+    start = time.perf_counter()
+    archived = store.archive(("Completed",))
+    archive_ms = (time.perf_counter() - start) * 1e3
+    print(f"archived {archived:,} completed orders in {archive_ms:.1f} ms; {len(store):,} live orders remain")
+
+
+if __name__ == "__main__":
+    main()
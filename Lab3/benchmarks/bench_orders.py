@@ -0,0 +1,64 @@
+# Пропускна здатність оформлення замовлень під конкуренцією потоків:
+# транзакційний place_order проти виклику purchase_book для кожної позиції.
+# Запуск з каталогу Lab3: python -m benchmarks.bench_orders --threads 8
+import argparse
+import random
+import threading
+import time
+
+from bookstore import Bookstore
+
+HOT_BOOKS = 100
+
+
+def build_store(books: int) -> Bookstore:
+    store = Bookstore()
+    for i in range(books):
+        store.add_book(f"Book {i}", "Author", f"{i:013d}", 10.0, 10**9)
+    return store
+
+
+def run(threads: int, orders_per_thread: int, place) -> float:
+    start_barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        start_barrier.wait()
+        for _ in range(orders_per_thread):
+            place([(f"{rng.randrange(HOT_BOOKS):013d}", 1) for _ in range(3)])
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * orders_per_thread / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--orders", type=int, default=5000, help="orders per thread")
+    args = parser.parse_args()
+
+    store = build_store(HOT_BOOKS)
+
+    def purchase_loop(items):
+        # Не атомарно: при помилці на другій позиції перша вже списана
+        for isbn, quantity in items:
+            store.purchase_book(isbn, quantity)
+
+    def transactional(items):
+        store.place_order("Buyer", "Street", "555", items)
+
+    loop_rate = run(args.threads, args.orders, purchase_loop)
+    place_rate = run(args.threads, args.orders, transactional)
+    print(f"{args.threads} threads, 3 items/order over {HOT_BOOKS} hot books")
+    print(f"purchase_book loop: {loop_rate:>10,.0f} orders/s (no atomicity, no order record)")
+    print(f"place_order:        {place_rate:>10,.0f} orders/s ({place_rate / loop_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
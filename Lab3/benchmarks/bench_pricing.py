@@ -0,0 +1,80 @@
+# Порівняння пакетного price_orders з викликом apply_discounts для кожного кошика.
+# Варіанти чергуються --repeat разів і для кожного береться найкращий час; суми без
+# розбивки вимірюються і з NumPy (якщо його встановлено), і без нього.
+# Запуск з каталогу Lab3: python -m benchmarks.bench_pricing --carts 100000
+import argparse
+import random
+import time
+from unittest import mock
+
+import bookstore
+from bookstore import Bookstore
+
+
+def best_times(runs: dict, repeat: int) -> dict:
+    # Варіанти запускаються по черзі repeat разів, і для кожного береться найкращий час:
+    # так шум спільної машини однаково впливає на всі варіанти
+    best = dict.fromkeys(runs, float("inf"))
+    for _ in range(repeat):
+        for name, run in runs.items():
+            start = time.perf_counter()
+            run()
+            best[name] = min(best[name], time.perf_counter() - start)
+    return best
+
+
+def price_totals(store, carts, numpy):
+    with mock.patch("bookstore.numpy", numpy):
+        return store.price_orders(carts, itemize=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--carts", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    store = Bookstore()
+    isbns = [f"{i:013d}" for i in range(args.books)]
+    for isbn in isbns:
+        store.add_book(f"Book {isbn}", "Author", isbn, round(rng.uniform(5, 50), 2), 100)
+    for isbn in rng.sample(isbns, args.books // 5):
+        store.add_discount(isbn, rng.choice([5, 10, 12.5, 15, 20]))
+    # Популярні книги трапляються в кошиках частіше
+    hot = isbns[:1000]
+    carts = [[(rng.choice(hot) if rng.random() < 0.7 else rng.choice(isbns), rng.randint(1, 3))
+              for _ in range(rng.randint(1, 8))] for _ in range(args.carts)]
+
+    looped = [store.apply_discounts(items) for items in carts]
+    runs = {
+        "loop": lambda: [store.apply_discounts(items) for items in carts],
+        # Поточний спосіб отримати розбивку: apply_discounts плюс окремий розрахунок кожного рядка
+        "itemized loop": lambda: [
+            {"total_amount": store.apply_discounts(items),
+             "items": [(isbn, quantity, store.inventory[isbn]["price"], store.get_discount(isbn))
+                       for isbn, quantity in items]}
+            for items in carts],
+        "itemized": lambda: store.price_orders(carts),
+        "totals": lambda: price_totals(store, carts, None),
+    }
+    if bookstore.numpy is not None:
+        runs["totals, numpy"] = lambda: price_totals(store, carts, bookstore.numpy)
+    for name in ("itemized", "totals", "totals, numpy"):
+        if name in runs:
+            priced = runs[name]()
+            assert looped == [order["total_amount"] for order in priced], "batch totals differ from apply_discounts"
+
+    best = best_times(runs, args.repeat)
+    for name in ("itemized", "totals", "totals, numpy"):
+        if name not in best:
+            continue
+        baseline = best["itemized loop" if name == "itemized" else "loop"]
+        print(f"{name:>13}: per-cart loop {args.carts / baseline:>10,.0f} carts/s | "
+              f"price_orders {args.carts / best[name]:>10,.0f} carts/s "
+              f"({baseline / best[name]:.1f}x), totals identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Порівняння пошуку через інвертований індекс з повним переглядом інвентарю.
+# Запуск з каталогу Lab3: python -m benchmarks.bench_search --sizes 10000,100000,1000000
+import argparse
+import random
+import time
+
+from bookstore import Bookstore
+
+
+def scan_search(inventory: dict, title=None, author=None):
+    # Попередня реалізація search_books: перегляд усіх книг з lower() на кожному кроці
+    results = []
+    for isbn, book in inventory.items():
+        title_match = title is None or title.lower() in book["title"].lower()
+        author_match = author is None or author.lower() in book["author"].lower()
+        if title_match and author_match:
+            results.append(isbn)
+    return results
+
+
+def build_store(size: int, rng: random.Random) -> Bookstore:
+    words = [f"word{i}" for i in range(20000)]
+    names = [f"Name{i} Surname{i % 3000}" for i in range(5000)]
+    store = Bookstore()
+    for i in range(size):
+        title = " ".join(rng.choice(words) for _ in range(rng.randint(2, 5)))
+        store.add_book(title.capitalize(), rng.choice(names), f"{i:013d}", 10.0, 5)
+    return store
+
+
+def timed(fn, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for size in map(int, args.sizes.split(",")):
+        start = time.perf_counter()
+        store = build_store(size, rng)
+        build_seconds = time.perf_counter() - start
+        titles = [rng.choice(list(store.inventory.values()))["title"] for _ in range(args.queries)]
+        title_queries = [title.split()[0][2:] for title in titles]  # підрядок усередині слова
+        prefix_queries = [title.split()[0][:7] for title in titles]
+        author_queries = [f"Surname{rng.randrange(3000)}" for _ in range(args.queries)]
+
+        indexed = timed(lambda q: store.search_books(title=q), title_queries)
+        scanned = timed(lambda q: scan_search(store.inventory, title=q), title_queries)
+        indexed_author = timed(lambda q: store.search_books(author=q, limit=20), author_queries)
+        scanned_author = timed(lambda q: scan_search(store.inventory, author=q), author_queries)
+        prefix = timed(lambda q: store.suggest_books(q), prefix_queries)
+
+        print(f"{size:>9,} books (build {build_seconds:5.1f} s): "
+              f"title index {indexed * 1e3:8.3f} ms vs scan {scanned * 1e3:8.2f} ms | "
+              f"author index {indexed_author * 1e3:8.3f} ms vs scan {scanned_author * 1e3:8.2f} ms | "
+              f"suggest {prefix * 1e3:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
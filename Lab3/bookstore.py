@@ -1,10 +1,55 @@
-import uuid
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+from itertools import accumulate, chain
+from operator import itemgetter, mul
+from money import PRICE_SCALE, discounted_units, from_units
+from order_ids import UUID7Generator
+from order_store import Order, OrderStore
+from search_index import SearchIndex
+
+# NumPy необов'язковий: з ним price_orders(itemize=False) рахує суми кошиків
+# в int64, без нього - цілими Python з тим самим результатом
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Межа, до якої цілі суми точно представляються у float64 (і тим паче в int64)
+_EXACT_MAX = 2 ** 53
 
 class Bookstore:
-    def __init__(self):
-        self.inventory = {}
-        self.orders = {}
+    # Кількість смуг замків на запаси книг (див. _locked)
+    LOCK_STRIPES = 64
+
+    def __init__(self, inventory=None, id_generator=None):
+        # inventory - будь-яке відображення ISBN -> книга; за замовчуванням dict,
+        # для великих каталогів можна передати ColumnarInventory().
+        # id_generator - генератор ідентифікаторів замовлень і резервів (див. order_ids);
+        # за замовчуванням UUIDv7, впорядковані за часом створення
+        self.inventory = inventory if inventory is not None else {}
+        self.id_generator = id_generator if id_generator is not None else UUID7Generator()
+        self.orders = OrderStore()
         self.discounts = {}
+        self.reservations = {}
+        self._stock_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._reservations_lock = threading.Lock()
+        self._expiry_heap = []
+        self._clock = time.monotonic
+
+    @property
+    def inventory(self) -> dict:
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, inventory: dict):
+        # Заміна інвентарю повністю перебудовує пошуковий індекс і скидає кеш цін
+        self._inventory = inventory
+        self._effective_prices = {}
+        self._search_index = SearchIndex(inventory)
+        for isbn, book in inventory.items():
+            self._search_index.add(isbn, book["title"], book["author"])
 
     # Функція 1: Керування інвентарем книг
     def book_exists(self, isbn: str) -> bool:
@@ -21,6 +66,16 @@ class Bookstore:
             "price": price,
             "quantity": quantity
         }
+        self._search_index.add(isbn, title, author)
+
+    def update_price(self, isbn: str, price: float):
+        # Змінює ціну книги; ціну слід змінювати саме тут, щоб скинути кеш ціни зі знижкою
+        if price < 0:
+            raise ValueError("Price cannot be negative")
+        if not self.book_exists(isbn):
+            raise ValueError("Book not found")
+        self.inventory[isbn]["price"] = price
+        self._effective_prices.pop(isbn, None)
 
     # Функція 2: Обробка покупок книг
     def is_quantity_sufficient(self, book: dict, quantity: int) -> bool:
@@ -28,18 +83,33 @@ class Bookstore:
         return quantity <= book["quantity"]
 
     def purchase_book(self, isbn: str, quantity: int) -> float:
-        # Оформлює покупку книги
+        # Оформлює покупку книги; прострочені резерви спершу повертаються на склад
+        self.expire_reservations()
         if not self.book_exists(isbn):
             raise ValueError("Book not found")
 
         book = self.inventory[isbn]
 
-        if not self.is_quantity_sufficient(book, quantity):
-            raise ValueError("Insufficient quantity")
+        with self._locked([isbn]):
+            if not self.is_quantity_sufficient(book, quantity):
+                raise ValueError("Insufficient quantity")
 
-        book["quantity"] -= quantity
+            book["quantity"] -= quantity
         return book["price"] * quantity
 
+    @contextmanager
+    def _locked(self, isbns):
+        # Захоплює замки смуг для всіх ISBN у фіксованому порядку номерів смуг,
+        # тож паралельні замовлення з різним порядком книг не блокують одне одного назавжди
+        stripes = sorted({hash(isbn) % self.LOCK_STRIPES for isbn in isbns})
+        for stripe in stripes:
+            self._stock_locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._stock_locks[stripe].release()
+
     # Функція 3: Відстеження замовлень клієнтів
     def validate_order_items(self, items: list):
         # Перевіряє валідність книг в замовленні (існування та кількість)
@@ -57,53 +127,176 @@ class Bookstore:
             total_amount += self.inventory[isbn]["price"] * quantity
         return total_amount
 
-    def create_order(self, customer_name: str, address: str, contact_info: str, items: list) -> dict:
+    def create_order(self, customer_name: str, address: str, contact_info: str, items: list) -> Order:
         # Створює нове замовлення
+        self.expire_reservations()
         self.validate_order_items(items)
+        return self._record_order(customer_name, address, contact_info, items, "Processing")
 
+    def _record_order(self, customer_name: str, address: str, contact_info: str, items: list, status: str,
+                      reservation_id: str = None) -> Order:
         total_amount = self.calculate_total_amount(items)
-        order_items = {isbn: {"quantity": quantity, "price": self.inventory[isbn]["price"]} for isbn, quantity in items}
-
-        order_id = str(uuid.uuid4())  # унікальний ідентифікатор замовлення
-        self.orders[order_id] = {
-            "customer_name": customer_name,
-            "contact_info": f"{address}, {contact_info}",
-            "items": order_items,
-            "total_amount": total_amount,
-            "status": "Processing"
-        }
-
-        order_response = self.orders[order_id]
-        order_response["order_id"] = order_id
+        # Повторний ISBN у списку позицій замінює попередній, як і раніше
+        order_items = {isbn: quantity for isbn, quantity in items}
+        lines = tuple((isbn, quantity, self.inventory[isbn]["price"]) for isbn, quantity in order_items.items())
 
-        return order_response
+        # Унікальний ідентифікатор видається під замком сховища замовлень
+        return self.orders.create(
+            lambda order_id: Order(order_id, customer_name, address, contact_info, lines, total_amount,
+                                   status, reservation_id),
+            self.id_generator)
 
     def update_order_status(self, order_id: str, status: str):
-        # Оновлює статус замовлення
+        # Оновлює статус замовлення (разом з індексом статусів)
+        self.orders.set_status(order_id, status)
+
+    def orders_by_status(self, status: str) -> list:
+        # Активні замовлення з вказаним статусом, без перегляду всіх замовлень
+        return self.orders.by_status(status)
+
+    def orders_by_customer(self, customer_name: str) -> list:
+        return self.orders.by_customer(customer_name)
+
+    def recent_orders(self, seconds: float) -> list:
+        # Активні замовлення, створені за останні seconds секунд. Ідентифікатори впорядковані
+        # за часом, тож межа діапазону - це найменший id для моменту now - seconds
+        boundary = self.id_generator.lower_bound(time.time() - seconds)
+        return self.orders.since(boundary)
+
+    def archive_orders(self, statuses=("Completed", "Cancelled"), sink=None) -> int:
+        # Переносить завершені замовлення з активних до архіву (див. OrderStore.archive)
+        return self.orders.archive(statuses, sink)
+
+    # Транзакційні замовлення з резервуванням запасів
+    def reserve_items(self, items: list, ttl: float = None) -> str:
+        # Резервує всі позиції разом або жодної. Перевірка та списання відбуваються під
+        # замками всіх задіяних книг: спершу перевіряються всі рядки, і лише потім
+        # змінюються запаси, тож у разі помилки склад лишається незмінним.
+        # ttl - час (у секундах), після якого непідтверджений резерв повертається на склад
+        self.expire_reservations()
+        quantities = {}
+        for isbn, quantity in items:
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            quantities[isbn] = quantities.get(isbn, 0) + quantity
+
+        with self._locked(quantities):
+            books = []
+            for isbn, quantity in quantities.items():
+                if not self.book_exists(isbn):
+                    raise ValueError("Book not found")
+                book = self.inventory[isbn]
+                if not self.is_quantity_sufficient(book, quantity):
+                    raise ValueError("Insufficient quantity")
+                books.append((book, quantity))
+            for book, quantity in books:
+                book["quantity"] -= quantity
+
+        reservation_id = self.id_generator()
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._reservations_lock:
+            self.reservations[reservation_id] = {"items": quantities, "expires_at": expires_at, "order_id": None}
+            if expires_at is not None:
+                heapq.heappush(self._expiry_heap, (expires_at, reservation_id))
+        return reservation_id
+
+    def confirm_reservation(self, reservation_id: str) -> dict:
+        # Робить резерв остаточним (наприклад, після оплати). Резерв, час якого минув,
+        # але який ще не прибрав expire_reservations, не підтверджується, а повертається на склад
+        with self._reservations_lock:
+            reservation = self.reservations.pop(reservation_id, None)
+        if reservation is None:
+            raise ValueError("Reservation not found or expired")
+        if reservation["expires_at"] is not None and reservation["expires_at"] <= self._clock():
+            self._cancel_reservation(reservation)
+            raise ValueError("Reservation not found or expired")
+        return reservation
+
+    def release_reservation(self, reservation_id: str):
+        # Скасовує резерв і повертає книги на склад
+        with self._reservations_lock:
+            reservation = self.reservations.pop(reservation_id, None)
+        if reservation is None:
+            raise ValueError("Reservation not found or expired")
+        self._cancel_reservation(reservation)
+
+    def expire_reservations(self, now: float = None) -> int:
+        # Повертає на склад резерви, час яких минув; повертає їхню кількість
+        now = self._clock() if now is None else now
+        expired = []
+        with self._reservations_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                _, reservation_id = heapq.heappop(self._expiry_heap)
+                reservation = self.reservations.pop(reservation_id, None)
+                if reservation is not None:
+                    expired.append(reservation)
+        for reservation in expired:
+            self._cancel_reservation(reservation)
+        return len(expired)
+
+    def _cancel_reservation(self, reservation: dict):
+        items = reservation["items"]
+        with self._locked(items):
+            for isbn, quantity in items.items():
+                self.inventory[isbn]["quantity"] += quantity
+        if reservation["order_id"] in self.orders:
+            self.orders.set_status(reservation["order_id"], "Cancelled")
+
+    def place_order(self, customer_name: str, address: str, contact_info: str, items: list,
+                    payment_timeout: float = None) -> Order:
+        # Створює замовлення, одночасно списуючи всі позиції зі складу.
+        # Якщо задано payment_timeout, замовлення чекає оплати (pay_order), а після
+        # спливу часу резерв повертається на склад і замовлення скасовується
+        reservation_id = self.reserve_items(items, ttl=payment_timeout)
+        if payment_timeout is None:
+            self.confirm_reservation(reservation_id)
+            return self._record_order(customer_name, address, contact_info, items, "Processing")
+
+        order = self._record_order(customer_name, address, contact_info, items, "Awaiting payment", reservation_id)
+        with self._reservations_lock:
+            reservation = self.reservations.get(reservation_id)
+            if reservation is not None:
+                reservation["order_id"] = order.order_id
+        if reservation is None:
+            # резерв сплив ще до реєстрації замовлення
+            self.orders.set_status(order.order_id, "Cancelled")
+        return order
+
+    def pay_order(self, order_id: str):
+        # Підтверджує оплату замовлення, що очікує на неї
+        self.expire_reservations()
         if order_id not in self.orders:
             raise ValueError("Order not found")
-
-        self.orders[order_id]["status"] = status
+        order = self.orders[order_id]
+        if order["status"] != "Awaiting payment":
+            raise ValueError("Order is not awaiting payment")
+        self.confirm_reservation(order["reservation_id"])
+        self.orders.set_status(order_id, "Processing")
 
     # Функція 4: Пошук книг
-    def search_books(self, title=None, author=None, isbn=None):
-        results = []
-        for book_isbn, book in self.inventory.items():
-            # Перевірка умов пошуку
-            title_match = title is None or title.lower() in book["title"].lower()
-            author_match = author is None or author.lower() in book["author"].lower()
-            isbn_match = isbn is None or isbn == book_isbn
-
-            # Додавання результатів пошуку
-            if title_match and author_match and isbn_match:
-                results.append({
-                    "title": book["title"],
-                    "author": book["author"],
-                    "isbn": book_isbn,
-                    "price": book["price"],
-                    "quantity": book["quantity"]
-                })
-        return results
+    def book_info(self, isbn: str) -> dict:
+        # Повертає опис книги разом з поточними ціною та кількістю
+        book = self.inventory[isbn]
+        return {
+            "title": book["title"],
+            "author": book["author"],
+            "isbn": isbn,
+            "price": book["price"],
+            "quantity": book["quantity"]
+        }
+
+    def search_books(self, title=None, author=None, isbn=None, limit=None):
+        # Пошук підрядка в назві та авторі через інвертований індекс;
+        # результати впорядковані за релевантністю, limit обмежує їх кількість
+        candidates = None
+        if isbn is not None:
+            candidates = [isbn] if self.book_exists(isbn) else []
+        found = self._search_index.search({"title": title, "author": author}, limit=limit, candidates=candidates)
+        return [self.book_info(book_isbn) for book_isbn in found]
+
+    def suggest_books(self, prefix: str, limit: int = 10) -> list:
+        # Підказки під час набору: книги, у назві яких є слово з цим префіксом
+        return [self.book_info(isbn) for isbn in self._search_index.suggest(prefix, limit)]
 
     # Функція 5: Управління знижками
     def add_discount(self, isbn: str, discount_percentage: float):
@@ -115,20 +308,115 @@ class Bookstore:
             raise ValueError("Book not found")
 
         self.discounts[isbn] = discount_percentage
+        self._effective_prices.pop(isbn, None)
 
     def get_discount(self, isbn: str) -> float:
         # Отримання знижки
         return self.discounts.get(isbn, 0)
 
+    def effective_price_units(self, isbn: str) -> int:
+        # Ціна зі знижкою в цілих мінімальних одиницях (див. money.py).
+        # Кешується до зміни знижки чи ціни цієї книги (add_discount, update_price)
+        units = self._effective_prices.get(isbn)
+        if units is None:
+            price = self.inventory[isbn]["price"]
+            units = self._effective_prices[isbn] = discounted_units(price, self.get_discount(isbn))
+        return units
+
     def apply_discounts(self, items: list) -> float:
-        # Застосування знижок до загальної вартості замовлення
-        total_amount = 0
+        # Застосування знижок до загальної вартості замовлення.
+        # Сума накопичується цілими мінімальними одиницями, тому вона точна
+        total_units = 0
         for isbn, quantity in items:
             if not self.book_exists(isbn):
                 raise ValueError(f"Book with ISBN {isbn} not found")
-            book = self.inventory[isbn]
-            price = book["price"]
-            discount = self.get_discount(isbn)
-            final_price = price * (1 - discount / 100)
-            total_amount += final_price * quantity
-        return total_amount
\ No newline at end of file
+            units = self._effective_prices.get(isbn)
+            if units is None:
+                units = self.effective_price_units(isbn)
+            total_units += units * quantity
+        return from_units(total_units)
+
+    def price_orders(self, carts: list, itemize: bool = True) -> list:
+        # Пакетне ціноутворення для багатьох кошиків одночасно.
+        # Ціна зі знижкою береться один раз для кожного унікального ISBN у пакеті,
+        # а далі кожен рядок кошика - лише вибірка з цієї таблиці. Суми, як і в
+        # apply_discounts, рахуються цілими мінімальними одиницями, тож збігаються точно.
+        # Рядки розбивки - кортежі (isbn, quantity, price, discount, final_price, amount);
+        # itemize=False повертає лише суми (див. _price_totals).
+        if not itemize:
+            totals = self._price_totals(carts)
+            if totals is not None:
+                return [{"total_amount": total} for total in totals]
+        table = {}
+        priced = []
+        for items in carts:
+            total_units = 0
+            breakdown = [] if itemize else None
+            for isbn, quantity in items:
+                entry = table.get(isbn)
+                if entry is None:
+                    if not self.book_exists(isbn):
+                        raise ValueError(f"Book with ISBN {isbn} not found")
+                    entry = table[isbn] = (self.inventory[isbn]["price"], self.get_discount(isbn),
+                                           self.effective_price_units(isbn))
+                price, discount, units = entry
+                amount_units = units * quantity
+                total_units += amount_units
+                if itemize:
+                    breakdown.append((isbn, quantity, price, discount, from_units(units), from_units(amount_units)))
+            priced.append({"total_amount": from_units(total_units), "items": breakdown} if itemize
+                          else {"total_amount": from_units(total_units)})
+        return priced
+
+    def _price_totals(self, carts: list):
+        # Суми кошиків без розбивки. Основна вартість - пошук ціни за рядком ISBN для
+        # кожного рядка кошика, а не арифметика, тож рядки всіх кошиків вирівнюються
+        # в один список, а ціни вибираються з кешу effective_price_units через map на рівні C.
+        # Ціни зі знижкою - цілі мінімальні одиниці; сума кошика - різниця накопичених
+        # сум на його межах (порожній кошик дає 0). З NumPy добутки й накопичення
+        # рахуються в int64, без нього - itertools.accumulate над цілими Python.
+        # Повертає None, якщо варто скористатися звичайним циклом
+        lines = list(chain.from_iterable(carts))
+        inventory, cache = self.inventory, self._effective_prices
+        unique = set(map(itemgetter(0), lines))
+        if not all(map(inventory.__contains__, unique)):
+            # Перший невідомий ISBN у порядку кошиків дає ту саму помилку, що й цикл
+            missing = next(isbn for isbn, _ in lines if isbn not in inventory)
+            raise ValueError(f"Book with ISBN {missing} not found")
+        for isbn in unique.difference(cache):
+            self.effective_price_units(isbn)
+        # Дробові кількості (1.5) рахуються лише звичайним циклом: int64 їх обрізав би,
+        # а суми float залежать від порядку додавання
+        if not set(map(type, map(itemgetter(1), lines))) <= {int}:
+            return None
+        ends = list(accumulate(map(len, carts)))
+        try:
+            if numpy is not None:
+                return self._sum_carts_numpy(lines, ends)
+            sums = list(accumulate(map(mul, map(cache.__getitem__, map(itemgetter(0), lines)),
+                                       map(itemgetter(1), lines)), initial=0))
+        except KeyError:
+            # Ціну щойно змінили в іншому потоці
+            return None
+        return [from_units(sums[end] - sums[start]) for start, end in zip(chain((0,), ends), ends)]
+
+    def _sum_carts_numpy(self, lines: list, ends: list):
+        # Поки суми менші за 2 ** 53, вони точні і в int64, і після ділення на
+        # PRICE_SCALE у float64 - тобто дають ті самі float, що й from_units
+        count = len(lines)
+        try:
+            units = numpy.fromiter(map(self._effective_prices.__getitem__, map(itemgetter(0), lines)),
+                                   numpy.int64, count)
+            quantities = numpy.fromiter(map(itemgetter(1), lines), numpy.int64, count)
+        except OverflowError:
+            return None
+        # Межа за модулем: великі від'ємні ціни теж можуть переповнити int64.
+        # Крайні значення беруться як цілі Python, бо abs(-2 ** 63) в int64 переповнюється
+        if count and (max(-int(units.min()), int(units.max()))
+                      * max(-int(quantities.min()), int(quantities.max())) * count >= _EXACT_MAX):
+            return None
+        sums = numpy.zeros(count + 1, dtype=numpy.int64)
+        numpy.cumsum(units * quantities, out=sums[1:])
+        ends = numpy.array(ends, dtype=numpy.int64)
+        starts = numpy.concatenate(([0], ends[:-1])).astype(numpy.int64)
+        return ((sums[ends] - sums[starts]) / PRICE_SCALE).tolist()
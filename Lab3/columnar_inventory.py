@@ -0,0 +1,110 @@
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+
+class BookView(MutableMapping):
+    # Легке представлення однієї книги у стовпцевому інвентарі.
+    # Підтримує той самий доступ book["price"], book["quantity"] -= n, що й dict,
+    # але читає та пише значення безпосередньо у стовпці.
+    __slots__ = ("_inventory", "_slot")
+
+    def __init__(self, inventory: "ColumnarInventory", slot: int):
+        self._inventory = inventory
+        self._slot = slot
+
+    def __getitem__(self, field: str):
+        return self._inventory.column(field)[self._slot]
+
+    def __setitem__(self, field: str, value):
+        column = self._inventory.column(field)
+        if field in ("title", "author"):
+            value = sys.intern(value)
+        column[self._slot] = value
+
+    def __delitem__(self, field: str):
+        raise TypeError("Book fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(ColumnarInventory.FIELDS)
+
+    def __len__(self) -> int:
+        return len(ColumnarInventory.FIELDS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class ColumnarInventory(MutableMapping):
+    # Інвентар, що зберігає книги стовпцями замість окремого dict на кожну книгу:
+    # ціни та кількості лежать у суцільних типізованих масивах (array 'd' та 'q'),
+    # назви й автори - у списках інтернованих рядків, а ISBN відображається на номер
+    # слота. Видалені слоти повторно використовуються для нових книг.
+    FIELDS = ("title", "author", "price", "quantity")
+
+    def __init__(self, books: dict = None):
+        self._slots = {}
+        self._free = []
+        self._titles = []
+        self._authors = []
+        self._prices = array("d")
+        self._quantities = array("q")
+        self._columns = {
+            "title": self._titles,
+            "author": self._authors,
+            "price": self._prices,
+            "quantity": self._quantities,
+        }
+        if books:
+            self.update(books)
+
+    def column(self, field: str):
+        try:
+            return self._columns[field]
+        except KeyError:
+            raise KeyError(field) from None
+
+    def slot(self, isbn: str) -> int:
+        return self._slots[isbn]
+
+    def __getitem__(self, isbn: str) -> BookView:
+        return BookView(self, self._slots[isbn])
+
+    def __setitem__(self, isbn: str, book):
+        title = sys.intern(book["title"])
+        author = sys.intern(book["author"])
+        # Ціна й кількість спершу перетворюються на типи стовпців: якщо значення не
+        # підходить (1.5 або 2 ** 70 для кількості), жоден стовпець ще не змінено
+        price = array(self._prices.typecode, [book["price"]])[0]
+        quantity = array(self._quantities.typecode, [book["quantity"]])[0]
+        slot = self._slots.get(isbn)
+        if slot is None and self._free:
+            slot = self._free.pop()
+        if slot is None:
+            slot = len(self._titles)
+            self._titles.append(title)
+            self._authors.append(author)
+            self._prices.append(price)
+            self._quantities.append(quantity)
+        else:
+            self._titles[slot] = title
+            self._authors[slot] = author
+            self._prices[slot] = price
+            self._quantities[slot] = quantity
+        self._slots[isbn] = slot
+
+    def __delitem__(self, isbn: str):
+        slot = self._slots.pop(isbn)
+        # Звільняємо посилання на рядки, щоб не тримати їх у пам'яті
+        self._titles[slot] = ""
+        self._authors[slot] = ""
+        self._free.append(slot)
+
+    def __contains__(self, isbn) -> bool:
+        return isbn in self._slots
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
@@ -0,0 +1,23 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+
+# Грошові суми в розрахунках зберігаються цілими числами мінімальних одиниць,
+# щоб підсумки не накопичували похибок двійкових float.
+# Мінімальна одиниця - сота частка цента: так ціни зі знижкою на зразок
+# 10.99 * 0.85 = 9.3415 представляються точно.
+PRICE_SCALE = 10000
+_UNIT = Decimal(1) / PRICE_SCALE
+
+
+def to_units(amount) -> int:
+    # repr(float) дає найкоротше десяткове подання, тож 10.99 стає рівно 109900
+    return int((Decimal(repr(amount)) * PRICE_SCALE).to_integral_value(ROUND_HALF_EVEN))
+
+
+def from_units(units: int) -> float:
+    return units / PRICE_SCALE
+
+
+def discounted_units(price, discount_percentage) -> int:
+    # Ціна зі знижкою, округлена до мінімальної одиниці
+    discounted = Decimal(repr(price)) * (100 - Decimal(repr(discount_percentage))) / 100
+    return int((discounted / _UNIT).to_integral_value(ROUND_HALF_EVEN))
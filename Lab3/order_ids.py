@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+# Генератори ідентифікаторів замовлень.
+# Кожен генератор - callable, що повертає рядок, а batch(n) видає n ідентифікаторів
+# за одне захоплення замка. ULID та UUIDv7 впорядковані за часом створення:
+# 48 біт мілісекунд плюс лічильник, який на початку кожної мілісекунди
+# ініціалізується випадковим значенням, а в межах мілісекунди збільшується на 1.
+# Тож ідентифікатори монотонно зростають і їх можна порівнювати як рядки, а
+# системне джерело випадковості читається не частіше одного разу на мілісекунду.
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Пари символів base32 для кожного 10-бітного значення: кодування за 8 зверненнями до таблиці
+_PAIRS = [first + second for first in _CROCKFORD for second in _CROCKFORD]
+
+
+class UUID4Generator:
+    # Випадкові UUID4 (попередня поведінка create_order); не впорядковані за часом
+    def __call__(self) -> str:
+        return str(uuid.uuid4())
+
+    def batch(self, count: int) -> list:
+        return [str(uuid.uuid4()) for _ in range(count)]
+
+    def lower_bound(self, timestamp: float) -> str:
+        raise ValueError("UUID4 ids are not time-ordered")
+
+
+class TimeOrderedGenerator(ABC):
+    # Спільна основа ULID та UUIDv7; підкласи задають розмір лічильника та формат
+    COUNTER_BITS = 80
+
+    def __init__(self, clock=time.time_ns):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def _next(self, count: int) -> tuple:
+        # Резервує count послідовних значень лічильника; повертає (мілісекунди, перше значення)
+        with self._lock:
+            now_ms = self._clock() // 1000000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                # Старший біт лічильника нульовий, щоб у межах мілісекунди було місце для зростання
+                self._counter = int.from_bytes(os.urandom(16), "big") >> (129 - self.COUNTER_BITS)
+            elif self._counter + count >= 1 << self.COUNTER_BITS:
+                # Лічильник вичерпано (або годинник пішов назад) - позичаємо наступну мілісекунду
+                self._last_ms += 1
+                self._counter = 0
+            first = self._counter
+            self._counter += count
+            return self._last_ms, first
+
+    def __call__(self) -> str:
+        ms, counter = self._next(1)
+        return self._format(ms, counter)
+
+    def batch(self, count: int) -> list:
+        ms, first = self._next(count)
+        fmt = self._format
+        return [fmt(ms, counter) for counter in range(first, first + count)]
+
+    def lower_bound(self, timestamp: float) -> str:
+        # Найменший ідентифікатор, створений не раніше timestamp (секунди epoch)
+        return self._format(int(timestamp * 1000), 0)
+
+    @abstractmethod
+    def _format(self, ms: int, counter: int) -> str:
+        pass
+
+
+class ULIDGenerator(TimeOrderedGenerator):
+    # ULID: 26 символів base32 Крокфорда (48 біт часу + 80 біт лічильника).
+    # Перші 10 символів кодують лише час, тому кешуються для поточної мілісекунди
+    COUNTER_BITS = 80
+
+    def __init__(self, clock=time.time_ns):
+        super().__init__(clock)
+        self._prefix = (-1, "")
+
+    def _format(self, ms: int, counter: int) -> str:
+        prefix_ms, prefix = self._prefix
+        if prefix_ms != ms:
+            prefix = "".join(_PAIRS[ms >> shift & 1023] for shift in (40, 30, 20, 10, 0))
+            self._prefix = (ms, prefix)
+        p = _PAIRS
+        return (prefix + p[counter >> 70] + p[counter >> 60 & 1023] + p[counter >> 50 & 1023]
+                + p[counter >> 40 & 1023] + p[counter >> 30 & 1023] + p[counter >> 20 & 1023]
+                + p[counter >> 10 & 1023] + p[counter & 1023])
+
+
+class UUID7Generator(TimeOrderedGenerator):
+    # UUIDv7 (RFC 9562): звичайний 36-символьний UUID, впорядкований за часом.
+    # 74 біти rand_a і rand_b разом використовуються як монотонний лічильник
+    COUNTER_BITS = 74
+
+    def _format(self, ms: int, counter: int) -> str:
+        rand_a = counter >> 62
+        rand_b = counter & ((1 << 62) - 1)
+        value = ms << 80 | 0x7 << 76 | rand_a << 64 | 0b10 << 62 | rand_b
+        h = f"{value:032x}"
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
@@ -0,0 +1,161 @@
+import threading
+from collections.abc import Mapping
+
+
+class Order(Mapping):
+    # Компактний запис замовлення. Адреса й контакт зберігаються окремо, а позиції -
+    # кортежем (isbn, quantity, price) замість dict на кожну позицію. Для сумісності
+    # запис читається як dict: order["status"], order["contact_info"], order["items"].
+    # Статус змінюється лише через OrderStore.set_status, щоб індекси лишалися узгодженими.
+    __slots__ = ("order_id", "customer_name", "address", "contact", "lines",
+                 "total_amount", "status", "reservation_id")
+
+    FIELDS = ("customer_name", "contact_info", "items", "total_amount", "status", "order_id")
+
+    def __init__(self, order_id: str, customer_name: str, address: str, contact: str, lines: tuple,
+                 total_amount: float, status: str, reservation_id: str = None):
+        self.order_id = order_id
+        self.customer_name = customer_name
+        self.address = address
+        self.contact = contact
+        self.lines = lines
+        self.total_amount = total_amount
+        self.status = status
+        self.reservation_id = reservation_id
+
+    def __getitem__(self, key: str):
+        if key == "contact_info":
+            return f"{self.address}, {self.contact}"
+        if key == "items":
+            return {isbn: {"quantity": quantity, "price": price} for isbn, quantity, price in self.lines}
+        if key in self.FIELDS or (key == "reservation_id" and self.reservation_id is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        if self.reservation_id is None:
+            return iter(self.FIELDS)
+        return iter(self.FIELDS + ("reservation_id",))
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (self.reservation_id is not None)
+
+    def __repr__(self) -> str:
+        return f"Order({dict(self)!r})"
+
+    def pack(self) -> tuple:
+        # Подання для архіву: один кортеж без об'єкта на кожне замовлення
+        return (self.order_id, self.customer_name, self.address, self.contact, self.lines,
+                self.total_amount, self.status, self.reservation_id)
+
+    @classmethod
+    def unpack(cls, packed: tuple) -> "Order":
+        return cls(*packed)
+
+
+class OrderStore(Mapping):
+    # Сховище активних замовлень з індексами за статусом та ім'ям клієнта.
+    # Індекси - dict order_id -> None (впорядковані множини), тож вибірка за статусом
+    # коштує O(результату), а зміна статусу - O(1).
+    # archive() переносить завершені замовлення з активного словника в архів.
+    def __init__(self):
+        self._orders = {}
+        self._by_status = {}
+        self._by_customer = {}
+        self.archived = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, order_id: str) -> Order:
+        return self._orders[order_id]
+
+    def __iter__(self):
+        return iter(self._orders)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id) -> bool:
+        return order_id in self._orders
+
+    def add(self, order: Order):
+        with self._lock:
+            self._insert(order)
+
+    def create(self, make_order, id_generator) -> Order:
+        # Видає ідентифікатор і додає замовлення під одним замком: навіть за кількох потоків
+        # порядок додавання збігається з порядком монотонних id, на який спирається since()
+        with self._lock:
+            order = make_order(id_generator())
+            self._insert(order)
+        return order
+
+    def _insert(self, order: Order):
+        self._orders[order.order_id] = order
+        self._by_status.setdefault(order.status, {})[order.order_id] = None
+        self._by_customer.setdefault(order.customer_name, {})[order.order_id] = None
+
+    def set_status(self, order_id: str, status: str):
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                raise ValueError("Order not found")
+            if order.status != status:
+                self._discard(self._by_status, order.status, order_id)
+                self._by_status.setdefault(status, {})[order_id] = None
+                order.status = status
+
+    def by_status(self, status: str) -> list:
+        with self._lock:
+            return [self._orders[order_id] for order_id in self._by_status.get(status, ())]
+
+    def by_customer(self, customer_name: str) -> list:
+        with self._lock:
+            return [self._orders[order_id] for order_id in self._by_customer.get(customer_name, ())]
+
+    def since(self, order_id: str) -> list:
+        # Замовлення з ідентифікатором >= order_id у порядку id. Розраховано на замовлення,
+        # додані через create() з монотонним генератором (order_ids): тоді порядок додавання
+        # збігається з порядком id, тому перегляд іде з кінця і зупиняється на першому
+        # меншому - O(результату). Замовлення з довільними id, додані через add(), цю
+        # умову не гарантують
+        found = []
+        with self._lock:
+            for key in reversed(self._orders):
+                if key < order_id:
+                    break
+                found.append(self._orders[key])
+        found.reverse()
+        return found
+
+    def archive(self, statuses=("Completed", "Cancelled"), sink=None) -> int:
+        # Переносить замовлення з вказаними статусами з активного словника.
+        # sink(order) дозволяє записати їх деінде (файл, база); інакше вони
+        # зберігаються в self.archived у вигляді кортежів Order.pack()
+        moved = []
+        with self._lock:
+            for status in statuses:
+                for order_id in self._by_status.pop(status, ()):
+                    order = self._orders.pop(order_id)
+                    self._discard(self._by_customer, order.customer_name, order_id)
+                    moved.append(order)
+        for order in moved:
+            if sink is None:
+                self.archived[order.order_id] = order.pack()
+            else:
+                sink(order)
+        return len(moved)
+
+    def find(self, order_id: str):
+        # Шукає замовлення серед активних, а потім в архіві
+        order = self._orders.get(order_id)
+        if order is None and order_id in self.archived:
+            order = Order.unpack(self.archived[order_id])
+        return order
+
+    @staticmethod
+    def _discard(index: dict, key, order_id: str):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(order_id, None)
+            if not bucket:
+                del index[key]
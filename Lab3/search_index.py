@@ -0,0 +1,163 @@
+import heapq
+import re
+import threading
+from collections import OrderedDict
+
+WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    return text.lower()
+
+
+def tokenize(text: str) -> list:
+    return WORD_RE.findall(normalize(text))
+
+
+class PrefixTrie:
+    # Префіксне дерево слів для підказок під час набору (type-ahead)
+    def __init__(self):
+        self.root = {}
+
+    def add(self, word: str):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = word
+
+    def words_with_prefix(self, prefix: str, limit: int = None) -> list:
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        words = []
+        stack = [node]
+        while stack and (limit is None or len(words) < limit):
+            node = stack.pop()
+            for char, child in node.items():
+                if char == "":
+                    words.append(child)
+                else:
+                    stack.append(child)
+        return words
+
+
+class FieldIndex:
+    # Інвертований індекс одного поля (назви або автора): слово -> множина ISBN
+    # та дерево префіксів. Пошук підрядка спершу знаходить у словнику слова, що містять
+    # найвибірковіше слово запиту, а потім перевіряє лише книги з їхніх списків.
+    # Списки слів для підрядків запитів кешуються; кеш обмежений (LRU), бо кожен новий
+    # запит додає до нього запис.
+    CACHE_SIZE = 1024
+
+    def __init__(self):
+        self.postings = {}
+        self.trie = PrefixTrie()
+        self._containing = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def add(self, isbn: str, text: str):
+        for word in set(tokenize(text)):
+            postings = self.postings.get(word)
+            if postings is None:
+                postings = self.postings[word] = set()
+                self.trie.add(word)
+                with self._cache_lock:
+                    self._containing.clear()  # словник змінився - кеш пошуку слів застарів
+            postings.add(isbn)
+
+    def words_containing(self, token: str) -> list:
+        with self._cache_lock:
+            words = self._containing.get(token)
+            if words is not None:
+                self._containing.move_to_end(token)
+                return words
+        words = [word for word in self.postings if token in word]
+        with self._cache_lock:
+            self._containing[token] = words
+            if len(self._containing) > self.CACHE_SIZE:
+                self._containing.popitem(last=False)
+        return words
+
+    def candidates(self, query: str):
+        # Повертає надмножину книг, що містять query, або None, якщо запит без слів
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        best = None
+        best_size = None
+        for token in set(tokens):
+            words = self.words_containing(token)
+            size = sum(len(self.postings[word]) for word in words)
+            if best_size is None or size < best_size:
+                best, best_size = words, size
+        return set().union(*(self.postings[word] for word in best))
+
+    def prefix_candidates(self, prefix: str) -> set:
+        isbns = set()
+        for word in self.trie.words_with_prefix(normalize(prefix)):
+            isbns |= self.postings[word]
+        return isbns
+
+
+def match_score(query: str, text: str) -> int:
+    # Ранжування збігу: точний збіг > початок тексту > початок слова > будь-який підрядок
+    if text == query:
+        return 4
+    if text.startswith(query):
+        return 3
+    position = text.find(query)
+    if position > 0 and not text[position - 1].isalnum():
+        return 2
+    return 1
+
+
+class SearchIndex:
+    # Індекс пошуку книг за назвою та автором, який оновлюється при додаванні книг.
+    # books - відображення ISBN -> книга (інвентар); текст кандидатів для перевірки
+    # збігу читається з нього й нормалізується під час пошуку, а не зберігається
+    # в індексі другою копією
+    def __init__(self, books):
+        self.books = books
+        self.fields = {"title": FieldIndex(), "author": FieldIndex()}
+        self.positions = {}
+
+    def add(self, isbn: str, title: str, author: str):
+        self.positions.setdefault(isbn, len(self.positions))
+        self.fields["title"].add(isbn, title)
+        self.fields["author"].add(isbn, author)
+
+    def search(self, queries: dict, limit: int = None, candidates=None) -> list:
+        # queries: {"title": ..., "author": ...}; повертає ISBN, відсортовані за релевантністю.
+        # candidates обмежує перевірку заданими ISBN (наприклад, при пошуку за ISBN)
+        queries = {field: normalize(query) for field, query in queries.items() if query}
+        if candidates is None:
+            for field, query in queries.items():
+                found = self.fields[field].candidates(query)
+                if found is not None and (candidates is None or len(found) < len(candidates)):
+                    candidates = found
+        if candidates is None:
+            candidates = self.positions  # запит без слів (наприклад, лише розділові знаки)
+
+        ranked = []
+        for isbn in candidates:
+            book = self.books[isbn]
+            score = 0
+            for field, query in queries.items():
+                text = normalize(book[field])
+                if query not in text:
+                    break
+                score += match_score(query, text)
+            else:
+                ranked.append((-score, self.positions[isbn], isbn))
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, ranked)
+        else:
+            ranked.sort()
+        return [isbn for _, _, isbn in ranked]
+
+    def suggest(self, prefix: str, limit: int = 10) -> list:
+        # Книги, у назві яких є слово з таким префіксом, у порядку додавання
+        isbns = self.fields["title"].prefix_candidates(prefix)
+        return sorted(isbns, key=self.positions.__getitem__)[:limit]
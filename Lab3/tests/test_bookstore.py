@@ -1,5 +1,13 @@
+import threading
+import time
 import unittest
+import uuid
+from array import array
+from unittest import mock
+import bookstore
 from bookstore import Bookstore
+from columnar_inventory import ColumnarInventory
+from order_ids import TimeOrderedGenerator, ULIDGenerator, UUID4Generator, UUID7Generator
 
 class TestBookstore(unittest.TestCase):
 
@@ -62,10 +70,174 @@ class TestBookstore(unittest.TestCase):
         self.assertEqual(order["total_amount"], 21.98)
         self.assertEqual(order["items"]["9780743273565"]["price"], 10.99)
 
+    def test_orders_by_status_and_customer(self):
+        first = self.store.create_order("John Doe", "123 Main St", "555-1234", [("9780743273565", 1)])
+        second = self.store.create_order("Jane Doe", "456 Elm St", "555-5678", [("9780451524935", 1)])
+        third = self.store.create_order("John Doe", "123 Main St", "555-1234", [("9780451524935", 2)])
+        self.store.update_order_status(second["order_id"], "Shipped")
+
+        processing = self.store.orders_by_status("Processing")
+        self.assertEqual([o["order_id"] for o in processing], [first["order_id"], third["order_id"]])
+        self.assertEqual([o["order_id"] for o in self.store.orders_by_status("Shipped")], [second["order_id"]])
+        self.assertEqual(len(self.store.orders_by_customer("John Doe")), 2)
+
+    def test_update_status_unknown_order(self):
+        with self.assertRaises(ValueError):
+            self.store.update_order_status("missing", "Shipped")
+
+    def test_archive_completed_orders(self):
+        done = self.store.create_order("John Doe", "123 Main St", "555-1234", [("9780743273565", 1)])
+        active = self.store.create_order("Jane Doe", "456 Elm St", "555-5678", [("9780451524935", 1)])
+        self.store.update_order_status(done["order_id"], "Completed")
+
+        self.assertEqual(self.store.archive_orders(), 1)
+        self.assertNotIn(done["order_id"], self.store.orders)
+        self.assertIn(active["order_id"], self.store.orders)
+        self.assertEqual(self.store.orders_by_customer("John Doe"), [])
+        archived = self.store.orders.find(done["order_id"])
+        self.assertEqual(archived["contact_info"], "123 Main St, 555-1234")
+        self.assertEqual(archived["items"]["9780743273565"]["quantity"], 1)
+
+    def test_order_ids_are_time_ordered(self):
+        first = self.store.create_order("John Doe", "123 Main St", "555-1234", [("9780743273565", 1)])
+        second = self.store.create_order("Jane Doe", "456 Elm St", "555-5678", [("9780451524935", 1)])
+        self.assertEqual(uuid.UUID(first["order_id"]).version, 7)
+        self.assertLess(first["order_id"], second["order_id"])
+
+    def test_recent_orders(self):
+        order = self.store.create_order("John Doe", "123 Main St", "555-1234", [("9780743273565", 1)])
+        self.assertEqual(self.store.recent_orders(60), [order])
+        self.assertEqual(self.store.orders.since(self.store.id_generator.lower_bound(time.time() + 60)), [])
+
+    def test_recent_orders_with_concurrent_writers(self):
+        # Пауза між видачею id і додаванням замовлення дає іншим потокам обігнати потік
+        class SlowGenerator(UUID7Generator):
+            def __call__(self):
+                order_id = super().__call__()
+                time.sleep(0.001)
+                return order_id
+
+        self.store.id_generator = SlowGenerator()
+
+        def worker():
+            for _ in range(10):
+                self.store.create_order("John Doe", "123 Main St", "555-1234", [("9780743273565", 1)])
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids = [order["order_id"] for order in self.store.recent_orders(60)]
+        self.assertEqual(len(ids), 40)
+        self.assertEqual(ids, sorted(ids))
+
+    def test_recent_orders_needs_ordered_ids(self):
+        self.store.id_generator = UUID4Generator()
+        self.store.create_order("John Doe", "123 Main St", "555-1234", [("9780743273565", 1)])
+        with self.assertRaises(ValueError):
+            self.store.recent_orders(60)
+
     def test_create_order_insufficient_quantity(self):
         with self.assertRaises(ValueError):
             self.store.create_order("Bob Brown", "101 Pine St", "555-9999", [("9780451524935", 5)])
 
+    def test_place_order_reserves_all_items(self):
+        order = self.store.place_order("John Doe", "123 Main St", "555-1234",
+                                       [("9780743273565", 2), ("9780451524935", 3)])
+        self.assertEqual(order["status"], "Processing")
+        self.assertEqual(self.store.inventory["9780743273565"]["quantity"], 3)
+        self.assertEqual(self.store.inventory["9780451524935"]["quantity"], 0)
+
+    def test_place_order_all_or_nothing(self):
+        with self.assertRaises(ValueError):
+            self.store.place_order("John Doe", "123 Main St", "555-1234",
+                                   [("9780743273565", 2), ("9780451524935", 4)])
+        with self.assertRaises(ValueError):
+            self.store.place_order("John Doe", "123 Main St", "555-1234",
+                                   [("9780743273565", 3), ("9780743273565", 3)])
+        self.assertEqual(self.store.inventory["9780743273565"]["quantity"], 5)
+        self.assertEqual(self.store.inventory["9780451524935"]["quantity"], 3)
+        self.assertEqual(self.store.orders, {})
+
+    def test_unpaid_order_expires(self):
+        order = self.store.place_order("Jane Doe", "456 Elm St", "555-5678",
+                                       [("9780743273565", 4)], payment_timeout=60)
+        self.assertEqual(order["status"], "Awaiting payment")
+        self.assertEqual(self.store.inventory["9780743273565"]["quantity"], 1)
+        self.assertEqual(self.store.expire_reservations(now=self.store._clock() + 61), 1)
+        self.assertEqual(order["status"], "Cancelled")
+        self.assertEqual(self.store.inventory["9780743273565"]["quantity"], 5)
+        with self.assertRaises(ValueError):
+            self.store.pay_order(order["order_id"])
+
+    # Оплата після спливу часу відхиляється навіть без явного expire_reservations,
+    # а покупки та нові замовлення бачать повернений на склад резерв
+    def test_payment_after_timeout_rejected(self):
+        now = [1000.0]
+        self.store._clock = lambda: now[0]
+        late = self.store.place_order("Jane Doe", "456 Elm St", "555-5678",
+                                      [("9780743273565", 4)], payment_timeout=60)
+        held = self.store.place_order("John Doe", "123 Main St", "555-1234",
+                                      [("9780743273565", 1)], payment_timeout=60)
+        now[0] += 61
+        with self.assertRaises(ValueError):
+            self.store.pay_order(late["order_id"])
+        self.assertEqual(late["status"], "Cancelled")
+        self.assertEqual(held["status"], "Cancelled")
+        self.assertEqual(self.store.inventory["9780743273565"]["quantity"], 5)
+
+        for buy in (lambda: self.store.purchase_book("9780743273565", 5),
+                    lambda: self.store.create_order("A", "B", "C", [("9780743273565", 5)])):
+            self.store.reserve_items([("9780743273565", 5)], ttl=10)
+            now[0] += 11
+            buy()
+            self.store.inventory["9780743273565"]["quantity"] = 5
+
+        reservation_id = self.store.reserve_items([("9780743273565", 2)], ttl=10)
+        now[0] += 11
+        with self.assertRaises(ValueError):
+            self.store.confirm_reservation(reservation_id)
+        self.assertEqual(self.store.inventory["9780743273565"]["quantity"], 5)
+
+    def test_paid_order_keeps_reservation(self):
+        order = self.store.place_order("Jane Doe", "456 Elm St", "555-5678",
+                                       [("9780743273565", 4)], payment_timeout=60)
+        self.store.pay_order(order["order_id"])
+        self.assertEqual(order["status"], "Processing")
+        self.assertEqual(self.store.expire_reservations(now=self.store._clock() + 61), 0)
+        self.assertEqual(self.store.inventory["9780743273565"]["quantity"], 1)
+
+    def test_release_reservation(self):
+        reservation_id = self.store.reserve_items([("9780451524935", 2)])
+        self.store.release_reservation(reservation_id)
+        self.assertEqual(self.store.inventory["9780451524935"]["quantity"], 3)
+        with self.assertRaises(ValueError):
+            self.store.release_reservation(reservation_id)
+
+    def test_concurrent_orders_never_oversell(self):
+        self.store.add_book("Hot Book", "Author", "9780000000100", 10.0, 50)
+        self.store.add_book("Hot Book 2", "Author", "9780000000200", 10.0, 30)
+        start = threading.Barrier(8)
+
+        def worker():
+            start.wait()
+            for _ in range(20):
+                try:
+                    self.store.place_order("Buyer", "Street", "555", [("9780000000100", 1), ("9780000000200", 1)])
+                except ValueError:
+                    pass
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Рівно 30 замовлень, і жодне невдале не списало першу книгу
+        self.assertEqual(len(self.store.orders), 30)
+        self.assertEqual(self.store.inventory["9780000000100"]["quantity"], 20)
+        self.assertEqual(self.store.inventory["9780000000200"]["quantity"], 0)
+
     # Функція 4: Пошук книг
     def test_search_by_title(self):
         results = self.store.search_books(title="1984")
@@ -92,6 +264,42 @@ class TestBookstore(unittest.TestCase):
         results = self.store.search_books(title="Nonexistent Book")
         self.assertEqual(len(results), 0)
 
+    def test_search_substring_inside_word(self):
+        results = self.store.search_books(author="cott fitz")
+        self.assertEqual([r["isbn"] for r in results], ["9780743273565"])
+
+    def test_search_ranked_and_limited(self):
+        self.store.add_book("Gatsby", "Unknown", "9780000000001", 5.0, 1)
+        self.store.add_book("Gatsby Revisited", "Unknown", "9780000000002", 5.0, 1)
+        results = self.store.search_books(title="gatsby")
+        self.assertEqual([r["isbn"] for r in results], ["9780000000001", "9780000000002", "9780743273565"])
+        results = self.store.search_books(title="gatsby", limit=2)
+        self.assertEqual([r["isbn"] for r in results], ["9780000000001", "9780000000002"])
+
+    def test_search_reflects_quantity_changes(self):
+        self.store.purchase_book("9780451524935", 2)
+        results = self.store.search_books(title="1984")
+        self.assertEqual(results[0]["quantity"], 1)
+
+    def test_suggest_books_by_prefix(self):
+        self.store.add_book("Great Expectations", "Charles Dickens", "9780141439563", 9.99, 4)
+        results = self.store.suggest_books("gre")
+        self.assertEqual([r["isbn"] for r in results], ["9780743273565", "9780141439563"])
+        self.assertEqual(self.store.suggest_books("xyz"), [])
+
+    def test_search_word_cache_is_bounded(self):
+        field = self.store._search_index.fields["title"]
+        with mock.patch.object(field, "CACHE_SIZE", 2):
+            for query in ("gat", "sby", "198", "gat"):
+                self.store.search_books(title=query)
+            self.assertEqual(list(field._containing), ["198", "gat"])
+        self.assertEqual(len(self.store.search_books(title="gat")), 1)
+
+    def test_search_after_inventory_reassignment(self):
+        self.store.inventory = {"1111111111111": {"title": "Dune", "author": "Frank Herbert", "price": 9.0, "quantity": 2}}
+        self.assertEqual(len(self.store.search_books(title="dune")), 1)
+        self.assertEqual(self.store.search_books(title="1984"), [])
+
     # Функція 5: Управління знижками
     def test_add_discount(self):
         self.store.add_discount("9780743273565", 15)
@@ -126,6 +334,165 @@ class TestBookstore(unittest.TestCase):
         total_amount = self.store.apply_discounts(items)
         self.assertEqual(total_amount, 0)
 
+    def test_price_orders_matches_apply_discounts(self):
+        self.store.add_discount("9780743273565", 15)
+        self.store.add_discount("9780451524935", 12.5)
+        carts = [
+            [("9780743273565", 2), ("9780451524935", 1)],
+            [("9780451524935", 3)],
+            [],
+            [("9780451524935", 1), ("9780743273565", 7), ("9780451524935", 2)],
+        ]
+        priced = self.store.price_orders(carts)
+        self.assertEqual([order["total_amount"] for order in priced],
+                         [self.store.apply_discounts(items) for items in carts])
+
+    def test_price_orders_breakdown(self):
+        self.store.add_discount("9780743273565", 10)
+        priced = self.store.price_orders([[("9780743273565", 2)]])
+        isbn, quantity, price, discount, final_price, amount = priced[0]["items"][0]
+        self.assertEqual((isbn, quantity, price, discount), ("9780743273565", 2, 10.99, 10))
+        self.assertAlmostEqual(amount, 10.99 * 0.9 * 2)
+        self.assertEqual(self.store.price_orders([[("9780743273565", 2)]], itemize=False),
+                         [{"total_amount": priced[0]["total_amount"]}])
+
+    def test_apply_discounts_exact_total(self):
+        self.store.add_book("Cheap Book", "Author", "9780000000010", 0.1, 10)
+        self.assertEqual(self.store.apply_discounts([("9780000000010", 1)] * 3), 0.3)
+
+    def test_effective_price_cache_invalidation(self):
+        self.store.add_discount("9780743273565", 10)
+        self.assertEqual(self.store.effective_price_units("9780743273565"), 98910)
+        self.store.add_discount("9780743273565", 20)
+        self.assertEqual(self.store.effective_price_units("9780743273565"), 87920)
+        self.store.update_price("9780743273565", 20.00)
+        self.assertEqual(self.store.apply_discounts([("9780743273565", 1)]), 16.0)
+
+    def test_update_price_invalid(self):
+        with self.assertRaises(ValueError):
+            self.store.update_price("9780743273565", -1)
+        with self.assertRaises(ValueError):
+            self.store.update_price("0000000000000", 5)
+
+    def test_price_orders_unknown_book(self):
+        with self.assertRaises(ValueError):
+            self.store.price_orders([[("9780743273565", 1)], [("0000000000000", 1)]])
+
+    # Суми без розбивки (шлях з NumPy, якщо він встановлений, і без нього) збігаються з циклом
+    def test_price_orders_totals_match_loop(self):
+        self.store.add_discount("9780743273565", 15)
+        self.store.add_book("Cheap Book", "Author", "9780000000010", 0.1, 10)
+        carts = [[("9780743273565", 2), ("9780000000010", 3)], [], [("9780451524935", 1)], [],
+                 [("9780000000010", 1)] * 3]
+        expected = [{"total_amount": self.store.apply_discounts(items)} for items in carts]
+        for numpy in {None, bookstore.numpy}:
+            with mock.patch("bookstore.numpy", numpy):
+                self.assertEqual(self.store.price_orders(carts, itemize=False), expected)
+                self.assertEqual(self.store.price_orders([], itemize=False), [])
+                self.assertEqual(self.store.price_orders([[], []], itemize=False),
+                                 [{"total_amount": 0}, {"total_amount": 0}])
+                with self.assertRaisesRegex(ValueError, "0000000000000"):
+                    self.store.price_orders([[("9780743273565", 1)], [("0000000000000", 1), ("1", 1)]],
+                                            itemize=False)
+
+    # Дробові кількості та великі від'ємні ціни дають той самий результат, що й цикл
+    def test_price_orders_totals_fractional_and_negative(self):
+        self.store.add_book("Refund", "Author", "9780000000020", -1e12, 1)
+        carts = [[("9780743273565", 1.5)], [("9780000000020", 1000)], [("9780743273565", 2), ("9780451524935", 0.5)]]
+        expected = [{"total_amount": self.store.apply_discounts(items)} for items in carts]
+        self.assertEqual(expected[0]["total_amount"], 16.485)
+        self.assertEqual(expected[1]["total_amount"], -1e15)
+        for numpy in {None, bookstore.numpy}:
+            with mock.patch("bookstore.numpy", numpy):
+                self.assertEqual(self.store.price_orders(carts, itemize=False), expected)
+                self.assertEqual(self.store.price_orders(carts[1:2], itemize=False), expected[1:2])
+
+
+class TestBookstoreColumnar(TestBookstore):
+    # Ті самі тести для стовпцевого інвентарю
+
+    def setUp(self):
+        self.store = Bookstore(ColumnarInventory())
+        self.store.add_book("The Great Gatsby", "F. Scott Fitzgerald", "9780743273565", 10.99, 5)
+        self.store.add_book("1984", "George Orwell", "9780451524935", 8.99, 3)
+
+    def test_columns_are_typed_arrays(self):
+        inventory = self.store.inventory
+        self.assertIsInstance(inventory.column("price"), array)
+        self.assertIsInstance(inventory.column("quantity"), array)
+        self.store.purchase_book("9780451524935", 1)
+        self.assertEqual(inventory.column("quantity")[inventory.slot("9780451524935")], 2)
+
+    def test_authors_are_interned(self):
+        self.store.add_book("Animal Farm", "George " + "Orwell", "9780451526342", 7.99, 2)
+        inventory = self.store.inventory
+        self.assertIs(inventory["9780451526342"]["author"], inventory["9780451524935"]["author"])
+
+    def test_deleted_slot_is_reused(self):
+        inventory = self.store.inventory
+        slot = inventory.slot("9780451524935")
+        del inventory["9780451524935"]
+        inventory["9780061120084"] = {"title": "To Kill a Mockingbird", "author": "Harper Lee",
+                                      "price": 12.99, "quantity": 10}
+        self.assertEqual(inventory.slot("9780061120084"), slot)
+        self.assertEqual(dict(inventory["9780061120084"])["quantity"], 10)
+        self.assertNotIn("9780451524935", inventory)
+
+    # Тест, що відхилене значення не залишає стовпці різної довжини
+    def test_rejected_value_keeps_columns_aligned(self):
+        inventory = self.store.inventory
+        del inventory["9780451524935"]
+        for quantity in (1.5, 2 ** 70, "3"):
+            for isbn in ("9780061120084", "9780743273565"):
+                with self.assertRaises((TypeError, OverflowError)):
+                    inventory[isbn] = {"title": "New", "author": "Author", "price": 1.0, "quantity": quantity}
+        self.assertEqual({len(inventory.column(field)) for field in ColumnarInventory.FIELDS}, {2})
+        self.assertEqual(dict(inventory["9780743273565"])["title"], "The Great Gatsby")
+        inventory["9780061120084"] = {"title": "To Kill a Mockingbird", "author": "Harper Lee",
+                                      "price": 12.99, "quantity": 10}
+        self.assertEqual(dict(inventory["9780061120084"])["quantity"], 10)
+        self.assertEqual({len(inventory.column(field)) for field in ColumnarInventory.FIELDS}, {2})
+
+
+class TestOrderIds(unittest.TestCase):
+
+    def test_ids_are_monotonic_within_millisecond(self):
+        for generator in (ULIDGenerator(clock=lambda: 1700000000000000000),
+                          UUID7Generator(clock=lambda: 1700000000000000000)):
+            ids = [generator() for _ in range(100)] + generator.batch(100)
+            self.assertEqual(ids, sorted(ids))
+            self.assertEqual(len(set(ids)), 200)
+
+    def test_clock_going_backwards_keeps_order(self):
+        ticks = iter([2000000000, 1000000000, 3000000000])
+        generator = ULIDGenerator(clock=lambda: next(ticks))
+        ids = [generator() for _ in range(3)]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_ulid_format(self):
+        generator = ULIDGenerator(clock=lambda: 1469918176385000000)
+        ulid = generator()
+        self.assertEqual(len(ulid), 26)
+        # 48 біт часу кодуються першими 10 символами
+        self.assertEqual(ulid[:10], "01ARYZ6S41")
+        self.assertTrue(set(ulid) <= set("0123456789ABCDEFGHJKMNPQRSTVWXYZ"))
+
+    def test_uuid7_format(self):
+        generator = UUID7Generator(clock=lambda: 1700000000123000000)
+        value = uuid.UUID(generator())
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        self.assertEqual(value.int >> 80, 1700000000123)
+
+    def test_time_ordered_base_is_abstract(self):
+        with self.assertRaises(TypeError):
+            TimeOrderedGenerator()
+
+    def test_lower_bound_precedes_later_ids(self):
+        generator = UUID7Generator()
+        boundary = generator.lower_bound(time.time() - 1)
+        self.assertLess(boundary, generator())
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
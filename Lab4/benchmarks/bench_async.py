@@ -0,0 +1,69 @@
+# Пропускна здатність і затримки API під uvicorn за різної кількості одночасних клієнтів:
+# 80% читань GET /books/{id} і 20% замовлень POST /orders/.
+# --apps дозволяє порівняти кілька варіантів застосунку (наприклад, попередню синхронну версію).
+# Запуск з каталогу Lab4: python -m benchmarks.bench_async --clients 100 1000 10000 --duration 10
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import tempfile
+
+from benchmarks.loadgen import free_port, json_body, run_load, serve
+
+
+def seed(port: int, count: int):
+    body = "\n".join(json.dumps({"id": i, "title": f"Book {i}", "author": f"Author {i % 100}",
+                                 "price": 10.0, "quantity": 10 ** 9}) for i in range(count))
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("POST", "/books/bulk", body=body, headers={"Content-Type": "application/x-ndjson"})
+    response = conn.getresponse()
+    assert response.status == 200, response.read()
+    conn.close()
+
+
+def mixed_workload(books: int):
+    def next_request(client: int, n: int):
+        if n % 5 == 4:
+            order = {"id": client * 10 ** 7 + n, "book_id": (client + n) % books,
+                     "customer_id": client, "quantity": 1}
+            return "POST", "/orders/", json_body(order), (200,)
+        return "GET", f"/books/{(client * 31 + n) % books}", None, (200,)
+    return next_request
+
+
+def storage_url(scheme: str, directory: str) -> str:
+    if scheme == "sqlite":
+        return "sqlite:" + os.path.join(directory, "bookstore.db")
+    if scheme == "log":
+        return "log:" + directory
+    if scheme == "shared":
+        return "shared:" + os.path.join(directory, "bookstore.db")
+    return "memory"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", nargs="+", default=["src.main:app"])
+    parser.add_argument("--clients", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--storage", choices=["memory", "sqlite", "log", "shared"], default="memory")
+    args = parser.parse_args()
+
+    for app in args.apps:
+        for clients in args.clients:
+            port = free_port()
+            # Кожен запуск отримує власне порожнє сховище
+            with tempfile.TemporaryDirectory() as tmp, \
+                    serve(app, port, env={"BOOKSTORE_STORAGE": storage_url(args.storage, tmp)}):
+                seed(port, args.books)
+                result = asyncio.run(run_load("127.0.0.1", port, clients, args.duration,
+                                              mixed_workload(args.books)))
+            print(f"{app:<22} {clients:>6} clients: {result['rps']:8.0f} req/s  "
+                  f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+                  f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
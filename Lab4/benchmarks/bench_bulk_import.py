@@ -0,0 +1,49 @@
+# Порівняння швидкості імпорту: POST /books/ для кожної книги проти одного POST /books/bulk.
+# Запуск з каталогу Lab4: python -m benchmarks.bench_bulk_import --books 20000
+import argparse
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from src.main import app, books
+
+
+def make_books(count: int):
+    return [{"id": i, "title": f"Book {i}", "author": f"Author {i % 1000}",
+             "price": 10.0 + i % 50, "quantity": i % 100} for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=20000)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    catalog = make_books(args.books)
+
+    books.clear()
+    start = time.perf_counter()
+    for book in catalog:
+        client.post("/books/", json=book)
+    per_item = args.books / (time.perf_counter() - start)
+
+    books.clear()
+    body = "\n".join(json.dumps(book) for book in catalog).encode("utf-8")
+    start = time.perf_counter()
+    response = client.post("/books/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    bulk = args.books / (time.perf_counter() - start)
+    assert response.status_code == 200 and len(books) == args.books
+
+    start = time.perf_counter()
+    exported = client.get("/books/export").content
+    export = args.books / (time.perf_counter() - start)
+    assert exported.count(b"\n") == args.books
+
+    print(f"per-item POST /books/: {per_item:>10,.0f} books/s")
+    print(f"POST /books/bulk:      {bulk:>10,.0f} books/s ({bulk / per_item:.0f}x)")
+    print(f"GET /books/export:     {export:>10,.0f} books/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# Навантажувальний тест API під uvicorn: кілька сценаріїв за заданої кількості клієнтів,
+# RPS і перцентилі затримок, порівняння зі збереженою базовою лінією.
+#   browse - перегляд каталогу сторінками та окремих книг
+#   orders - оформлення замовлень
+#   status - опитування списку замовлень за статусом і окремих замовлень
+#   mixed  - 60% browse, 20% orders, 20% status
+# Запуск з каталогу Lab4:
+#   python -m benchmarks.bench_load --clients 100 --duration 10
+#   python -m benchmarks.bench_load --save-baseline   (записати benchmarks/baseline.json)
+# Результат гірший за базову лінію більше ніж на --tolerance позначається як регресія,
+# і процес завершується з кодом 1.
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import sys
+import tempfile
+
+from benchmarks.bench_async import storage_url
+from benchmarks.loadgen import free_port, json_body, run_load, serve
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+STATUSES = ("Processing", "Shipped", "Completed")
+SEED_ORDERS = 1000
+
+
+def post(port: int, path: str, body: bytes, content_type: str = "application/json"):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("POST", path, body=body, headers={"Content-Type": content_type})
+    response = conn.getresponse()
+    payload = response.read()
+    conn.close()
+    if response.status != 200:
+        raise RuntimeError(f"{path}: {response.status} {payload!r}")
+
+
+def seed(port: int, books: int):
+    # Каталог з великим запасом і початкові замовлення різних статусів для опитування
+    catalog = "\n".join(json.dumps({"id": i, "title": f"Book {i}", "author": f"Author {i % 100}",
+                                    "price": 10.0 + i % 40, "quantity": 10 ** 9}) for i in range(books))
+    post(port, "/books/bulk", catalog.encode("utf-8"), "application/x-ndjson")
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for order_id in range(SEED_ORDERS):
+        order = {"id": order_id, "book_id": order_id % books, "customer_id": order_id % 50, "quantity": 1,
+                 "status": STATUSES[order_id % 3]}
+        conn.request("POST", "/orders/", body=json_body(order), headers={"Content-Type": "application/json"})
+        conn.getresponse().read()
+    conn.close()
+
+
+def browse(books: int):
+    page = 20
+
+    def next_request(client: int, n: int):
+        if n % 2:
+            return "GET", f"/books/{(client * 31 + n) % books}", None, (200,)
+        after = (client * 97 + n * page) % books
+        return "GET", f"/books/?limit={page}&after_id={after}", None, (200,)
+    return next_request
+
+
+def place_orders(books: int):
+    def next_request(client: int, n: int):
+        order = {"id": SEED_ORDERS + client * 10 ** 7 + n, "book_id": (client + n) % books,
+                 "customer_id": client, "quantity": 1}
+        return "POST", "/orders/", json_body(order), (200,)
+    return next_request
+
+
+def poll_status(books: int):
+    def next_request(client: int, n: int):
+        if n % 2:
+            return "GET", f"/orders/{(client * 13 + n) % SEED_ORDERS}", None, (200,)
+        return "GET", f"/orders/status/{STATUSES[(client + n) % 3]}?limit=50", None, (200,)
+    return next_request
+
+
+def mixed(books: int):
+    scenarios = [browse(books)] * 3 + [place_orders(books), poll_status(books)]
+
+    def next_request(client: int, n: int):
+        return scenarios[(client + n) % len(scenarios)](client, n)
+    return next_request
+
+
+WORKLOADS = {"browse": browse, "orders": place_orders, "status": poll_status, "mixed": mixed}
+
+
+def compare(name: str, result: dict, baseline: dict, tolerance: float) -> list:
+    # Регресія: RPS нижчий або p99 вищий за базову лінію більше ніж на tolerance
+    expected = baseline.get(name)
+    if expected is None:
+        return []
+    problems = []
+    if result["rps"] < expected["rps"] * (1 - tolerance):
+        problems.append(f"{name}: {result['rps']:.0f} req/s < baseline {expected['rps']:.0f}")
+    if result["p99_ms"] > expected["p99_ms"] * (1 + tolerance):
+        problems.append(f"{name}: p99 {result['p99_ms']:.1f} ms > baseline {expected['p99_ms']:.1f} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default="src.main:app")
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--books", type=int, default=10000)
+    parser.add_argument("--storage", choices=["memory", "sqlite", "log", "shared"], default="memory")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.workloads:
+        port = free_port()
+        with tempfile.TemporaryDirectory() as tmp, \
+                serve(args.app, port, env={"BOOKSTORE_STORAGE": storage_url(args.storage, tmp)},
+                      workers=args.workers):
+            seed(port, args.books)
+            result = asyncio.run(run_load("127.0.0.1", port, args.clients, args.duration,
+                                          WORKLOADS[name](args.books)))
+        results[name] = result
+        print(f"{name:<7} {args.clients:>5} clients: {result['rps']:8.0f} req/s  "
+              f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+              f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}")
+
+    # Базова лінія зберігається окремо для кожної конфігурації запуску
+    config = f"{args.storage}/{args.workers}w/{args.clients}c"
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+
+    if args.save_baseline:
+        stored[config] = {name: {key: round(value, 2) for key, value in result.items()}
+                          for name, result in results.items()}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline saved for {config}")
+        return
+
+    if config not in stored:
+        print(f"no baseline for {config}; run with --save-baseline to record one")
+        return
+    problems = [problem for name, result in results.items()
+                for problem in compare(name, result, stored[config], args.tolerance)]
+    problems += [f"{name}: {result['errors']} errors" for name, result in results.items() if result["errors"]]
+    if problems:
+        print("REGRESSIONS:")
+        for problem in problems:
+            print("  " + problem)
+        sys.exit(1)
+    print(f"no regressions against baseline {config} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
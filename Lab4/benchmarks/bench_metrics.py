@@ -0,0 +1,62 @@
+# Накладні витрати метрик на запит: той самий застосунок з MetricsMiddleware і TimedRoute
+# та без них. Запити передаються безпосередньо в ASGI-застосунок, без мережі,
+# тож різниця - це саме вартість вимірювань.
+# Запуск з каталогу Lab4: python -m benchmarks.bench_metrics --requests 20000
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from src.metrics import Metrics, MetricsMiddleware, TimedRoute
+
+
+def make_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+    if with_metrics:
+        metrics = Metrics()
+        app.router.route_class = TimedRoute.using(metrics)
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/books/{book_id}")
+    async def get_book(book_id: int):
+        return {"id": book_id, "title": "Book", "author": "Author", "price": 10.0, "quantity": 1}
+    return app
+
+
+async def drive(app: FastAPI, count: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": "/books/1", "raw_path": b"/books/1", "query_string": b"",
+             "root_path": "", "headers": [], "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80)}
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    started = time.perf_counter()
+    for _ in range(count):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    # Варіанти чергуються, а з кожного береться найкращий раунд, щоб зменшити шум
+    apps = {False: make_app(False), True: make_app(True)}
+    best = {False: float("inf"), True: float("inf")}
+    for _ in range(args.rounds):
+        for with_metrics, app in apps.items():
+            best[with_metrics] = min(best[with_metrics], asyncio.run(drive(app, args.requests)))
+    plain, measured = best[False], best[True]
+    print(f"without metrics {plain * 1e6:7.1f} us/request | with metrics {measured * 1e6:7.1f} us/request "
+          f"| overhead {(measured - plain) * 1e6:5.1f} us ({(measured - plain) / plain:.1%})")
+
+
+if __name__ == "__main__":
+    main()
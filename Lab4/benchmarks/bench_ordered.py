@@ -0,0 +1,46 @@
+# Вартість підтримки порядку ключів для page(): вставка й видалення випадкового ключа
+# в одному відсортованому списку (insort / del) і в SortedKeys при великому каталозі.
+# Запуск з каталогу Lab4: python -m benchmarks.bench_ordered --books 2000000
+import argparse
+import random
+import time
+from bisect import bisect_left, insort
+
+from src.sortedkeys import SortedKeys
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=2000000)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    # Парні ключі вже в каталозі, непарні додаються й одразу видаляються
+    fresh = [2 * rng.randrange(args.books) + 1 for _ in range(args.ops)]
+    plain = list(range(0, 2 * args.books, 2))
+    chunked = SortedKeys(plain)
+
+    started = time.perf_counter()
+    for key in fresh:
+        insort(plain, key)
+        del plain[bisect_left(plain, key)]
+    per_list = (time.perf_counter() - started) / args.ops
+    print(f"list insort + del:    {per_list * 1e6:8.2f} us per add/delete pair")
+
+    started = time.perf_counter()
+    for key in fresh:
+        chunked.add(key)
+        chunked.remove(key)
+    per_chunked = (time.perf_counter() - started) / args.ops
+    print(f"SortedKeys add + remove: {per_chunked * 1e6:5.2f} us per add/delete pair "
+          f"({per_list / per_chunked:.0f}x faster)")
+
+    started = time.perf_counter()
+    for key in fresh:
+        chunked.after(key, 50)
+    print(f"SortedKeys page of 50:   {(time.perf_counter() - started) / args.ops * 1e6:5.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Масштабування читань зі спільним сховищем (shared:) на кількох процесах uvicorn.
+# Для кожної кількості процесів сервера каталог заповнюється через один процес, коротке
+# прогрівання розносить зміни по копіях усіх процесів, після чого вимірюється сценарій
+# browse з bench_load. Генератор навантаження теж ділиться на --load-processes процесів,
+# щоб не стати вузьким місцем раніше за сервер; процеси генератора забирають ядра
+# у сервера, тож чисте масштабування видно, лише коли ядер вистачає на обидва.
+# Запуск з каталогу Lab4:
+#   python -m benchmarks.bench_scaling --workers 1 2 4 8 --load-processes 4
+import argparse
+import os
+import tempfile
+
+from benchmarks.bench_async import storage_url
+from benchmarks.bench_load import WORKLOADS, seed
+from benchmarks.loadgen import free_port, run_load_processes, serve
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default="src.main:app")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--workload", choices=list(WORKLOADS), default="browse")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--books", type=int, default=10000)
+    parser.add_argument("--load-processes", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU cores available")
+    if (os.cpu_count() or 1) < max(args.workers) + args.load_processes:
+        # Процеси сервера й генератора ділять ядра, тож приріст від процесів не видно
+        print("warning: fewer cores than server workers + load processes; "
+              "results do not show scaling, re-run on a larger host")
+    single = None
+    for workers in args.workers:
+        port = free_port()
+        with tempfile.TemporaryDirectory() as tmp, \
+                serve(args.app, port, env={"BOOKSTORE_STORAGE": storage_url("shared", tmp)}, workers=workers):
+            seed(port, args.books)
+            run_load_processes("127.0.0.1", port, args.clients, args.warmup, WORKLOADS[args.workload],
+                               (args.books,), args.load_processes)
+            result = run_load_processes("127.0.0.1", port, args.clients, args.duration, WORKLOADS[args.workload],
+                                        (args.books,), args.load_processes)
+        single = single or result["rps"]
+        speedup = result["rps"] / single if single else 0.0
+        print(f"{workers:>3} workers: {result['rps']:8.0f} req/s  x{speedup:4.2f} "
+              f"({speedup / workers:4.0%} of linear)  p50 {result['p50_ms']:7.1f} ms  "
+              f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Процесорний час на запит для двох шляхів серіалізації відповіді:
+#   model - обробник повертає dict або модель, FastAPI перевіряє його за response_model,
+#           проганяє через jsonable_encoder і кодує JSONResponse (попередня версія);
+#   fast  - обробник повертає FastJSONResponse з уже перевіреного запису.
+# Запити передаються безпосередньо в ASGI-застосунок, як у bench_metrics.
+# Запуск з каталогу Lab4: python -m benchmarks.bench_serialization --requests 20000
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from src.main import Book, Order
+from src.serialization import FastJSONResponse, orjson
+
+BOOK = {"id": 1, "title": "Book", "author": "Author", "price": 10.0, "quantity": 10 ** 9,
+        "description": "A fairly ordinary book description of moderate length."}
+PAGE = [dict(BOOK, id=i) for i in range(50)]
+
+
+def make_app(fast: bool) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse if fast else JSONResponse)
+
+    @app.get("/books/{book_id}", response_model=Book)
+    async def get_book(book_id: int):
+        return FastJSONResponse(BOOK) if fast else BOOK
+
+    @app.get("/books/", response_model=List[Book])
+    async def get_books():
+        return FastJSONResponse(PAGE) if fast else PAGE
+
+    @app.post("/orders/", response_model=Order)
+    async def add_order(order: Order):
+        record = order.model_dump()
+        return FastJSONResponse(record) if fast else order
+    return app
+
+
+REQUESTS = {
+    "GET /books/{id}": ("GET", "/books/1", b""),
+    "GET /books/ (50)": ("GET", "/books/", b""),
+    "POST /orders/": ("POST", "/orders/", json.dumps({"id": 1, "book_id": 1, "customer_id": 1,
+                                                      "quantity": 1}).encode()),
+}
+
+
+async def drive(app: FastAPI, method: str, path: str, body: bytes, count: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "root_path": "", "headers": [(b"content-type", b"application/json"),
+                                          (b"content-length", str(len(body)).encode())],
+             "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80)}
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    started = time.process_time()
+    for _ in range(count):
+        await app(dict(scope), receive, send)
+    return (time.process_time() - started) / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    print(f"encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    apps = {"model": make_app(False), "fast": make_app(True)}
+    for name, (method, path, body) in REQUESTS.items():
+        # Варіанти чергуються, а з кожного береться найкращий раунд, щоб зменшити шум
+        best = {variant: float("inf") for variant in apps}
+        for _ in range(args.rounds):
+            for variant, app in apps.items():
+                best[variant] = min(best[variant], asyncio.run(drive(app, method, path, body, args.requests)))
+        model, fast = best["model"], best["fast"]
+        print(f"{name:<17} model {model * 1e6:7.1f} us CPU/request | fast {fast * 1e6:7.1f} us CPU/request "
+              f"| saved {(model - fast) * 1e6:5.1f} us ({(model - fast) / model:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Вартість агрегатів /stats: час резервування книги й запису замовлення з InventoryStats
+# і без нього, час читання /stats-даних та, для порівняння, повний перегляд каталогу.
+# Запуск з каталогу Lab4: python -m benchmarks.bench_stats --books 100000
+import argparse
+import time
+
+from src.repository import BookRepository, Repository
+from src.stats import InventoryStats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--orders", type=int, default=100000)
+    args = parser.parse_args()
+
+    for with_stats in (False, True):
+        books = BookRepository(kind="books", ordered=True)
+        orders = Repository(indexes=("customer_id", "status"), kind="orders")
+        books.add_many([{"id": i, "title": f"Book {i}", "price": 10.0 + i % 40, "quantity": 10 ** 6}
+                        for i in range(args.books)])
+        stats = InventoryStats(books, orders) if with_stats else None
+        started = time.perf_counter()
+        for order_id in range(args.orders):
+            book_id = order_id * 7919 % args.books
+            books.reserve(book_id, 1)
+            orders.put({"id": order_id, "book_id": book_id, "customer_id": order_id % 50, "quantity": 1,
+                        "status": "Processing"})
+        per_order = (time.perf_counter() - started) / args.orders
+        print(f"{'with' if with_stats else 'without'} stats: {per_order * 1e6:6.2f} us per order")
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        stats.summary(5)
+        stats.low_stock(10)
+        stats.top_sellers(10)
+    print(f"summary + low_stock(10) + top_sellers(10): {(time.perf_counter() - started) * 1e3:6.2f} us")
+
+    started = time.perf_counter()
+    catalog = list(books)
+    sum(round(book["price"] * 100) * book["quantity"] for book in catalog)
+    sorted((book["quantity"], book["id"]) for book in catalog)[:10]
+    print(f"full scan of {args.books} books: {(time.perf_counter() - started) * 1e3:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Вимірювання запису та часу старту для сховищ Lab4.
+# Запуск з каталогу Lab4: python -m benchmarks.bench_storage --books 1000000
+import argparse
+import os
+import tempfile
+import time
+
+from src.repository import BookRepository
+from src.storage import LogStorage, SQLiteStorage
+
+
+def make_books(count: int):
+    for i in range(count):
+        yield {"id": i, "title": f"Book {i}", "author": f"Author {i % 1000}",
+               "price": 10.0 + i % 50, "quantity": i % 100, "description": None}
+
+
+def measure(name: str, open_storage, count: int, tail: int):
+    storage = open_storage()
+    start = time.perf_counter()
+    storage.save_many("books", make_books(count))
+    bulk_seconds = time.perf_counter() - start
+
+    # Кілька одиночних змін після масового завантаження (хвіст журналу)
+    books = BookRepository(kind="books", storage=storage)
+    books.load()
+    start = time.perf_counter()
+    for i in range(tail):
+        books.reserve(i, 0)
+    single_seconds = time.perf_counter() - start
+    storage.close()
+
+    start = time.perf_counter()
+    storage = open_storage()
+    books = BookRepository(kind="books", storage=storage)
+    books.load()
+    startup_seconds = time.perf_counter() - start
+    assert len(books) == count
+    storage.close()
+
+    print(f"{name:>8}: bulk write {count / bulk_seconds:>10,.0f} books/s | "
+          f"single write {tail / single_seconds:>8,.0f} ops/s | "
+          f"startup {startup_seconds:6.2f} s for {count:,} books")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--tail", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bookstore.db")
+        measure("sqlite", lambda: SQLiteStorage(db_path), args.books, args.tail)
+        log_dir = os.path.join(tmp, "log")
+        measure("log", lambda: LogStorage(log_dir, snapshot_every=args.books), args.books, args.tail)
+
+
+if __name__ == "__main__":
+    main()
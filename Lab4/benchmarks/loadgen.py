@@ -0,0 +1,178 @@
+# Простий генератор навантаження на asyncio для локальних вимірювань.
+# Кожен віртуальний клієнт тримає власне keep-alive з'єднання HTTP/1.1 і надсилає
+# запити один за одним; затримка кожного запиту записується для обчислення перцентилів.
+# serve() запускає застосунок під uvicorn в окремому процесі.
+# run_load_processes() ділить клієнтів між кількома процесами генератора, коли одного
+# циклу подій замало, щоб навантажити кілька процесів сервера.
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional, Tuple
+
+LAB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Connection:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None,
+                      headers: Tuple[Tuple[str, str], ...] = ()) -> Tuple[int, bytes]:
+        if self.writer is None:
+            await self.open()
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        if body is not None:
+            lines.append("Content-Type: application/json")
+            lines.append(f"Content-Length: {len(body)}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(head[9:12])
+        length = 0
+        for line in head.split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            if name.lower() == b"content-length":
+                length = int(value)
+            elif name.lower() == b"transfer-encoding":
+                raise ValueError("Chunked responses are not supported by the load generator")
+        content = await self.reader.readexactly(length) if length else b""
+        return status, content
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p95_ms": percentile(latencies, 0.95) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+    }
+
+
+async def run_load(host: str, port: int, clients: int, duration: float,
+                   next_request: Callable[[int, int], tuple], connect_batch: int = 500) -> dict:
+    # next_request(клієнт, номер запиту) -> (метод, шлях, тіло або None[, очікувані статуси]).
+    # Затримки міряються лише після того, як усі клієнти під'єднані
+    return summarize(*await drive(host, port, clients, duration, next_request, connect_batch))
+
+
+async def drive(host: str, port: int, clients: int, duration: float,
+                next_request: Callable[[int, int], tuple], connect_batch: int = 500,
+                first_client: int = 0) -> tuple:
+    # Повертає (затримки, кількість помилок, тривалість); клієнти нумеруються з first_client
+    connections = [Connection(host, port) for _ in range(clients)]
+    for start in range(0, clients, connect_batch):
+        await asyncio.gather(*(c.open() for c in connections[start:start + connect_batch]))
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(index: int, connection: Connection):
+        nonlocal errors
+        sent = 0
+        while time.perf_counter() < deadline:
+            method, path, body, *expected = next_request(index, sent)
+            sent += 1
+            started = time.perf_counter()
+            try:
+                status, _ = await connection.request(method, path, body)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors += 1
+                connection.close()
+                continue
+            latencies.append(time.perf_counter() - started)
+            if status >= 500 or (expected and status not in expected[0]):
+                errors += 1
+
+    began = time.perf_counter()
+    await asyncio.gather(*(client(first_client + i, c) for i, c in enumerate(connections)))
+    elapsed = time.perf_counter() - began
+    for connection in connections:
+        connection.close()
+    return latencies, errors, elapsed
+
+
+def _drive_process(host: str, port: int, clients: int, duration: float, make_workload: Callable,
+                   workload_args: tuple, first_client: int) -> tuple:
+    return asyncio.run(drive(host, port, clients, duration, make_workload(*workload_args),
+                             first_client=first_client))
+
+
+def run_load_processes(host: str, port: int, clients: int, duration: float, make_workload: Callable,
+                       workload_args: tuple = (), processes: int = 1) -> dict:
+    # make_workload(*workload_args) -> next_request; має бути функцією рівня модуля,
+    # щоб її можна було передати в інший процес
+    if processes <= 1:
+        return asyncio.run(run_load(host, port, clients, duration, make_workload(*workload_args)))
+    shares = [clients // processes + (i < clients % processes) for i in range(processes)]
+    starts = [sum(shares[:i]) for i in range(processes)]
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        results = pool.starmap(_drive_process, [(host, port, share, duration, make_workload, workload_args, start)
+                                                for share, start in zip(shares, starts) if share])
+    latencies = [latency for result in results for latency in result[0]]
+    return summarize(latencies, sum(result[1] for result in results), max(result[2] for result in results))
+
+
+def json_body(payload) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(app: str, port: int, env: Optional[dict] = None, workers: int = 1, timeout: float = 30.0):
+    # Запускає uvicorn з каталогу Lab4 і чекає, доки порт почне приймати з'єднання
+    command = [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning", "--no-access-log", "--backlog", "16384"]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, cwd=LAB_DIR, env={**os.environ, **(env or {})})
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start in time")
+                time.sleep(0.1)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
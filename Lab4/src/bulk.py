@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, Iterator, List, Tuple
+
+from src.serialization import dumps
+
+# Потокове читання та запис каталогу у форматах NDJSON і CSV.
+# Рядки CSV розбиваються за символом нового рядка, тому поля з переносами
+# рядків (наприклад, багаторядковий опис) слід імпортувати через NDJSON.
+
+BOOK_FIELDS = ["id", "title", "author", "price", "quantity", "description"]
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    # Перетворює потік байтів тіла запиту на непорожні рядки з їхніми номерами
+    # (декодування відбувається під час розбору, щоб помилку можна було прив'язати до рядка)
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def parse_ndjson(line: bytes) -> dict:
+    return json.loads(line)
+
+
+class CSVRowParser:
+    # Перший рядок CSV - заголовок з назвами полів; порожні значення стають None
+    def __init__(self):
+        self.header = None
+
+    def __call__(self, line: bytes):
+        row = next(csv.reader([line.decode("utf-8")]))
+        if self.header is None:
+            self.header = row
+            return None
+        return {field: value if value != "" else None for field, value in zip(self.header, row)}
+
+
+def encode_ndjson(books: Iterable[dict], batch_size: int = 1000) -> Iterator[bytes]:
+    # Той самий кодувальник, що й у JSON-відповідях (orjson, якщо встановлено)
+    batch = []
+    for book in books:
+        batch.append(dumps(book))
+        if len(batch) >= batch_size:
+            yield b"\n".join(batch) + b"\n"
+            batch = []
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+
+def encode_csv(books: Iterable[dict], batch_size: int = 1000) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=BOOK_FIELDS, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    rows = 0
+    for book in books:
+        writer.writerow(book)
+        rows += 1
+        if rows % batch_size == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def error_lines(errors: List[dict], line_numbers: List[int]) -> List[dict]:
+    # Замінює індекс у пакеті на номер рядка вхідних даних
+    details = []
+    for error in errors:
+        index, *loc = error["loc"]
+        details.append({"line": line_numbers[index], "loc": loc, "msg": error["msg"]})
+    return details
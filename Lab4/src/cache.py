@@ -0,0 +1,167 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match може містити кілька тегів через кому, слабкі теги W/"..." або "*"
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    # LRU-кеш серіалізованих відповідей з обмеженим часом життя (TTL).
+    # Кожен запис позначається тегами (наприклад, "books", "book:1", "orders:status:Shipped"),
+    # і запис змінює лише записи з відповідними тегами.
+    # version зростає при кожному скиданні: відповідь, обчислену до скидання,
+    # put() не збереже, тож кеш не повертає застарілих даних після гонки з записом.
+    def __init__(self, max_entries: int = 4096, ttl: float = 60.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # ключ -> (body, etag, expires_at, tags)
+        self._tagged = {}  # тег -> множина ключів
+        self._lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self._clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, key: str, body: bytes, tags: Iterable[str], version: int) -> Tuple[bytes, str]:
+        etag = make_etag(body)
+        tags = tuple(tags)
+        with self._lock:
+            if version == self.version and self.max_entries > 0:
+                if key in self._entries:
+                    self._remove(key)
+                self._entries[key] = (body, etag, self._clock() + self.ttl, tags)
+                for tag in tags:
+                    self._tagged.setdefault(tag, set()).add(key)
+                while len(self._entries) > self.max_entries:
+                    self._remove(next(iter(self._entries)))
+                    self.evictions += 1
+        return body, etag
+
+    def invalidate(self, *tags: str):
+        with self._lock:
+            self.version += 1
+            for tag in tags:
+                for key in self._tagged.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._tagged.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries)}
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[3]:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+
+class IdempotencyConflict(ValueError):
+    pass
+
+
+class IdempotencyCache:
+    # Відповіді на нещодавні запити з заголовком Idempotency-Key.
+    # Повтор з тим самим ключем отримує збережену відповідь, не змінюючи інвентар;
+    # відбиток (fingerprint) тіла запиту не дає використати ключ для іншого запиту.
+    # Час життя однаковий для всіх записів, тож порядок вставки - це й порядок
+    # завершення строку: застарілі та зайві записи завжди знімаються з початку, за O(1).
+    # bytes - приблизний обсяг кешу: довжини ключів, відбитків і тіл відповідей.
+    def __init__(self, max_entries: int = 10000, ttl: float = 24 * 3600.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # ключ -> (fingerprint, body, expires_at)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.conflicts = 0
+        self.evictions = 0
+
+    def get(self, key: str, fingerprint: str) -> Optional[bytes]:
+        # Збережене тіло відповіді або None; IdempotencyConflict, якщо ключ уже
+        # використано для запиту з іншим тілом
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != fingerprint:
+                self.conflicts += 1
+                raise IdempotencyConflict("Idempotency-Key was already used for a different request")
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, fingerprint: str, body: bytes):
+        with self._lock:
+            if self.max_entries <= 0:
+                return
+            self._remove(key)
+            self._entries[key] = (fingerprint, body, self._clock() + self.ttl)
+            self.bytes += len(key) + len(fingerprint) + len(body)
+            self._expire()
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.conflicts
+            return {"hits": self.hits, "misses": self.misses, "conflicts": self.conflicts,
+                    "evictions": self.evictions, "entries": len(self._entries), "bytes": self.bytes,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def _expire(self):
+        now = self._clock()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry[2] > now:
+                break
+            self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(key) + len(entry[0]) + len(entry[1])
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from collections import deque
+from typing import AsyncIterator, Optional
+
+# Потік подій замовлень у форматі Server-Sent Events (text/event-stream).
+# Кожна подія кодується в байти один раз і лише додається в черги підписників,
+# тож публікація коштує O(кількість підписників) без серіалізації для кожного.
+# Підписник, що чекає на подію, - це asyncio.Event і один таймер keep-alive
+# раз на keepalive секунд, тому тисячі неактивних підписників майже не навантажують цикл подій.
+#
+# Черга кожного підписника обмежена: якщо клієнт не встигає читати, його черга
+# відкидається, він отримує подію overflow і з'єднання закривається. Клієнт
+# (наприклад, EventSource у браузері) перепідключається із заголовком Last-Event-ID
+# і отримує пропущене з історії останніх подій або подію reset, якщо історія
+# вже не містить потрібних подій і стан слід перечитати запитами.
+
+
+class Subscription:
+    __slots__ = ("status", "pending", "ready", "loop", "max_pending", "overflowed")
+
+    def __init__(self, status: Optional[str], max_pending: int):
+        self.status = status
+        self.pending = deque()
+        self.ready = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        self.max_pending = max_pending
+        self.overflowed = False
+
+    def push(self, frame: bytes):
+        if self.overflowed:
+            return
+        if len(self.pending) >= self.max_pending:
+            self.overflowed = True
+            self.pending.clear()
+        else:
+            self.pending.append(frame)
+        self.ready.set()
+
+
+class EventBroker:
+    def __init__(self, max_pending: int = 100, history: int = 1000, keepalive: float = 15.0):
+        self.max_pending = max_pending
+        self.keepalive = keepalive
+        self.subscribers = set()
+        self.history = deque(maxlen=history)  # (id, статус, кадр)
+        self.last_id = 0
+        self.published = 0
+        self.overflows = 0
+
+    def publish(self, event: str, data: dict, status: Optional[str] = None):
+        # Може викликатися і з потоку циклу подій, і з інших потоків (слухачі репозиторію)
+        self.last_id += 1
+        frame = f"id: {self.last_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+        self.history.append((self.last_id, status, frame))
+        self.published += 1
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for subscription in list(self.subscribers):
+            if subscription.status is not None and subscription.status != status:
+                continue
+            if subscription.loop is current:
+                subscription.push(frame)
+            else:
+                subscription.loop.call_soon_threadsafe(subscription.push, frame)
+
+    def subscribe(self, status: Optional[str] = None, last_event_id: Optional[int] = None) -> Subscription:
+        subscription = Subscription(status, self.max_pending)
+        if last_event_id is not None and last_event_id < self.last_id:
+            if self.history and self.history[0][0] <= last_event_id + 1:
+                for event_id, event_status, frame in self.history:
+                    if event_id > last_event_id and (status is None or status == event_status):
+                        subscription.pending.append(frame)
+            else:
+                subscription.push(b"event: reset\ndata: {}\n\n")
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[bytes]:
+        # Тіло відповіді SSE; коментар ": keep-alive" не дає проміжним проксі закрити
+        # неактивне з'єднання. Підписка знімається, коли клієнт від'єднується
+        try:
+            yield b"retry: 1000\n\n"
+            while True:
+                if not subscription.pending and not subscription.overflowed:
+                    subscription.ready.clear()
+                    try:
+                        await asyncio.wait_for(subscription.ready.wait(), self.keepalive)
+                    except asyncio.TimeoutError:
+                        yield b": keep-alive\n\n"
+                        continue
+                if subscription.overflowed:
+                    self.overflows += 1
+                    yield b"event: overflow\ndata: {}\n\n"
+                    return
+                frames = b"".join(subscription.pending)
+                subscription.pending.clear()
+                yield frames
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,12 @@
+import threading
+
+
+class StripedLock:
+    # Набір замків, між якими ключі розподіляються за хешем.
+    # Операції з різними книгами здебільшого потрапляють у різні замки і не чекають
+    # одна на одну, а операції з однією книгою завжди серіалізуються.
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __call__(self, key) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
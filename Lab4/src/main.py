@@ -1,136 +1,468 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import List, Optional
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing import Annotated, List, Optional
 from fastapi import HTTPException
+from src.repository import BookNotFound, BookRepository, InsufficientStock, Repository
+from src.events import EventBroker
+from src.stats import InventoryStats
+from src.cache import IdempotencyCache, IdempotencyConflict, ResponseCache, etag_matches, make_etag
+from src.bulk import CSV, NDJSON, CSVRowParser, encode_csv, encode_ndjson, error_lines, iter_lines, parse_ndjson
+from src.storage import StorageBusy, StorageFailed, open_storage
+from src.metrics import Metrics, MetricsMiddleware, SlowRequestProfiler, TimedRoute
+from src.replica import Replica, ReplicaMiddleware
+from src.serialization import FastJSONResponse, dumps, json_safe
 
-app = FastAPI()
+# Сховище задається змінною середовища: memory (за замовчуванням), sqlite:<файл> або log:<каталог>.
+# Обробники асинхронні: зміни в пам'яті відбуваються одразу в циклі подій, запис на диск
+# виконує фоновий потік (QueuedStorage), а відповідь надсилається після await storage.sync()
+# shared:<файл> - режим для uvicorn --workers N: усі процеси працюють зі спільною базою
+# SQLite, а в пам'яті кожного живе локальна копія для читань (див. src/replica.py).
+# BOOKSTORE_BUSY_TIMEOUT_MS обмежує, скільки запис чекає на замок спільної бази,
+# блокуючи цикл подій; довше очікування завершується відповіддю 503
+storage = open_storage(os.environ.get("BOOKSTORE_STORAGE", "memory"), queued=True,
+                       busy_timeout=float(os.environ.get("BOOKSTORE_BUSY_TIMEOUT_MS", "100")) / 1000)
 
-# Інвентар книг та замовлень
-books = []
-orders = []
+# Метрики запитів для Prometheus (GET /metrics): тривалість за маршрутами, етапи обробки
+# та розміри сховищ. Профілювальник повільних запитів вмикається змінною
+# BOOKSTORE_PROFILE_SLOW_MS (поріг у мілісекундах) або через POST /metrics/profiler
+metrics = Metrics()
+metrics.profiler = SlowRequestProfiler(directory=os.environ.get("BOOKSTORE_PROFILE_DIR", "profiles"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.environ.get("BOOKSTORE_PROFILE_SLOW_MS"):
+        metrics.profiler.threshold = float(os.environ["BOOKSTORE_PROFILE_SLOW_MS"]) / 1000
+        metrics.profiler.start()
+    yield
+    metrics.profiler.stop()
+    storage.close()
+
+# Обробники повертають готові FastJSONResponse з уже перевірених записів
+# (див. src/serialization.py); response_model лишається для схеми OpenAPI
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.router.route_class = TimedRoute.using(metrics)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+# Спільна база зайнята іншими процесами: клієнт може повторити запит
+@app.exception_handler(StorageBusy)
+async def storage_busy(request: Request, exc: StorageBusy):
+    return FastJSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+
+# Фоновий запис на диск не вдався, і пам'ять розійшлася з диском: репозиторії
+# перечитують сховище, після чого зміни знову приймаються; клієнт може повторити запит
+@app.exception_handler(StorageFailed)
+async def storage_failed(request: Request, exc: StorageFailed):
+    books.reload()
+    orders.reload()
+    storage.recover()
+    return FastJSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+
+# Те саме, що й стандартна відповідь 422, але відхилені Infinity та NaN повертаються рядками
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    return FastJSONResponse({"detail": json_safe(jsonable_encoder(exc.errors()))}, status_code=422)
+
+# Інвентар книг та замовлень (індексовані за id)
+books = BookRepository(kind="books", storage=storage, ordered=True)
+orders = Repository(indexes=("customer_id", "status"), kind="orders", storage=storage)
+if storage.shared:
+    replica = Replica(storage, [books, orders])
+    replica.load()
+    app.add_middleware(ReplicaMiddleware, replica=replica)
+    metrics.gauge("bookstore_replica_changes_total", "Changes applied from other workers.",
+                  lambda: replica.applied, "counter")
+else:
+    books.load()
+    orders.load()
+
+# Кеш серіалізованих відповідей на читання. Репозиторії повідомляють про кожну зміну,
+# і кеш скидає лише пов'язані з нею теги: зміна книги - її сторінку та списки книг,
+# зміна замовлення - списки його старого та нового статусу
+response_cache = ResponseCache(max_entries=int(os.environ.get("BOOKSTORE_CACHE_SIZE", "4096")),
+                               ttl=float(os.environ.get("BOOKSTORE_CACHE_TTL", "60")))
+
+def invalidate_book(book_id, old, new):
+    if book_id is None:
+        response_cache.invalidate("books", "book")
+    else:
+        response_cache.invalidate("books", f"book:{book_id}")
+
+def invalidate_order(order_id, old, new):
+    if order_id is None:
+        response_cache.invalidate("orders")
+    else:
+        statuses = {record["status"] for record in (old, new) if record is not None}
+        response_cache.invalidate(*(f"orders:status:{status}" for status in statuses))
+
+# Відповіді на POST /orders/ з заголовком Idempotency-Key: повтор запиту після тайм-ауту
+# отримує ту саму відповідь і не резервує книги вдруге. Кеш живе в пам'яті процесу,
+# тож у режимі shared: з кількома процесами повтор, що потрапив до іншого процесу, не впізнається.
+# Повтор без ключа (чи з уже забутим ключем) відхиляється перевіркою ID замовлення в add_order
+idempotency_cache = IdempotencyCache(max_entries=int(os.environ.get("BOOKSTORE_IDEMPOTENCY_SIZE", "10000")),
+                                     ttl=float(os.environ.get("BOOKSTORE_IDEMPOTENCY_TTL", "86400")))
+
+# Потік подій замовлень (GET /orders/events) замість опитування списків за статусом.
+# Події публікуються слухачем репозиторію, тож їх породжують і add_order, і update_order,
+# а в режимі shared: - також зміни інших процесів, щойно копія їх застосує
+order_events = EventBroker(max_pending=int(os.environ.get("BOOKSTORE_EVENTS_QUEUE", "100")))
+
+def publish_order_event(order_id, old, new):
+    if new is None:
+        return
+    if old is None:
+        order_events.publish("order_created", new, new["status"])
+    elif old["status"] != new["status"]:
+        order_events.publish("order_status_changed", dict(new, previous_status=old["status"]), new["status"])
+
+books.subscribe(invalidate_book)
+orders.subscribe(invalidate_order)
+orders.subscribe(publish_order_event)
+
+# Агрегати для /stats (вартість запасу, низький залишок, продажі), що оновлюються
+# слухачами репозиторіїв разом з кожною зміною книг і замовлень
+inventory_stats = InventoryStats(books, orders)
+LOW_STOCK_THRESHOLD = int(os.environ.get("BOOKSTORE_LOW_STOCK", "5"))
+
+metrics.gauge("bookstore_books", "Books in the catalog.", lambda: len(books))
+metrics.gauge("bookstore_orders", "Orders in the store.", lambda: len(orders))
+metrics.gauge("bookstore_cache_entries", "Cached responses.", lambda: response_cache.stats()["entries"])
+metrics.gauge("bookstore_cache_hits_total", "Response cache hits.", lambda: response_cache.hits, "counter")
+metrics.gauge("bookstore_cache_misses_total", "Response cache misses.", lambda: response_cache.misses, "counter")
+metrics.gauge("bookstore_event_subscribers", "Open order event streams.", lambda: len(order_events.subscribers))
+metrics.gauge("bookstore_events_published_total", "Order events published.",
+              lambda: order_events.published, "counter")
+metrics.gauge("bookstore_event_overflows_total", "Event streams closed because the client fell behind.",
+              lambda: order_events.overflows, "counter")
+metrics.gauge("bookstore_inventory_value", "Total value of books in stock.",
+              lambda: inventory_stats.value_cents / 100)
+metrics.gauge("bookstore_low_stock_titles", "Titles at or below the low-stock threshold.",
+              lambda: inventory_stats.summary(LOW_STOCK_THRESHOLD)["low_stock_titles"])
+metrics.gauge("bookstore_idempotency_entries", "Remembered idempotent responses.",
+              lambda: idempotency_cache.stats()["entries"])
+metrics.gauge("bookstore_idempotency_bytes", "Approximate size of remembered idempotent responses.",
+              lambda: idempotency_cache.bytes)
+metrics.gauge("bookstore_idempotency_hits_total", "Retries answered from the idempotency cache.",
+              lambda: idempotency_cache.hits, "counter")
+metrics.gauge("bookstore_idempotency_misses_total", "Idempotency keys seen for the first time.",
+              lambda: idempotency_cache.misses, "counter")
+
+# Цілі поля обмежені діапазоном int64: більших чисел не приймають ні SQLite, ні orjson
+Id = Annotated[int, Field(ge=0, le=2 ** 63 - 1)]
+Int64 = Annotated[int, Field(ge=-2 ** 63, le=2 ** 63 - 1)]
 
 class Book(BaseModel):
-    id: int
+    id: Id
     title: str
     author: str
-    price: float
-    quantity: int
+    # JSON-парсер приймає Infinity та NaN, але такі ціни неможливо серіалізувати
+    # у відповідь і порахувати у вартості запасу (/stats)
+    price: float = Field(allow_inf_nan=False)
+    quantity: Int64
     description: Optional[str] = None
 
 class Order(BaseModel):
-    id: int
-    book_id: int
-    customer_id: int
-    quantity: int
+    id: Id
+    book_id: Id
+    customer_id: Id
+    quantity: Int64
     status: str = "Processing"
 
+book_list_adapter = TypeAdapter(List[Book])
+
+# Відповідь з кешу або побудована build() і збережена з тегами.
+# Клієнт з актуальним ETag у заголовку If-None-Match отримує 304 без тіла
+def cached_response(request: Request, tags: tuple, build) -> Response:
+    key = request.url.path + "?" + request.url.query
+    cached = response_cache.get(key)
+    if cached is None:
+        version = response_cache.version
+        cached = response_cache.put(key, dumps(build()), tags, version)
+    body, etag = cached
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
 
 '''КЕРУВАННЯ ІНВЕНТАРЕМ КНИГ'''
 # Додавання нової книги до інвентаря
 @app.post("/books/", response_model=Book)
-def add_book(book: Book):
-    for existing_book in books:
-        if existing_book["id"] == book.id:
-            raise HTTPException(status_code=400, detail="Book with this ID already exists")
-    books.append(book.model_dump())
-    return book
+async def add_book(book: Book):
+    record = book.model_dump()
+    if not books.add(record):
+        raise HTTPException(status_code=400, detail="Book with this ID already exists")
+    # Відповідь кодується до await: запис у пам'яті можуть змінити інші запити
+    response = FastJSONResponse(record)
+    await storage.sync()
+    return response
+
+# Масове додавання книг з потоку NDJSON або CSV: усі книги додаються разом або жодна
+@app.post("/books/bulk")
+async def add_books_bulk(request: Request, batch_size: int = Query(1000, ge=1)):
+    content_type = request.headers.get("content-type", NDJSON).split(";")[0].strip()
+    if content_type == NDJSON:
+        parse = parse_ndjson
+    elif content_type == CSV:
+        parse = CSVRowParser()
+    else:
+        raise HTTPException(status_code=415, detail="Unsupported content type")
+
+    records = []
+    seen_ids = set()
+    batch, line_numbers = [], []
+
+    # Валідація накопиченого пакета та перевірка дублікатів за множиною id
+    def flush():
+        try:
+            validated = book_list_adapter.validate_python(batch)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=error_lines(e.errors(), line_numbers))
+        for line_number, book in zip(line_numbers, validated):
+            if book.id in seen_ids or book.id in books:
+                raise HTTPException(status_code=400,
+                                    detail=f"Book with this ID already exists: {book.id} (line {line_number})")
+            seen_ids.add(book.id)
+            records.append(book.model_dump())
+        batch.clear()
+        line_numbers.clear()
+
+    async for line_number, line in iter_lines(request.stream()):
+        try:
+            item = parse(line)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Malformed row on line {line_number}")
+        if item is None:
+            continue
+        batch.append(item)
+        line_numbers.append(line_number)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    conflicts = books.add_many(records)
+    if conflicts:
+        raise HTTPException(status_code=400, detail=f"Book with this ID already exists: {conflicts[0]}")
+    await storage.sync()
+    return {"message": "Books imported successfully", "count": len(records)}
 
 # Оновлення інформації про книгу (ціна, кількість, опис)
 @app.put("/books/{book_id}", response_model=Book)
-def update_book(book_id: int, updated_book: Book):
-    for idx, book in enumerate(books):
-        if book["id"] == book_id:
-            updated_book_dict = updated_book.model_dump()
-            if updated_book_dict["id"] != book_id:
-                raise HTTPException(status_code=400, detail="Cannot change book ID")
-            books[idx] = updated_book_dict
-            return updated_book
-    raise HTTPException(status_code=404, detail="Book not found")
+async def update_book(book_id: int, updated_book: Book):
+    if book_id not in books:
+        raise HTTPException(status_code=404, detail="Book not found")
+    updated_book_dict = updated_book.model_dump()
+    if updated_book_dict["id"] != book_id:
+        raise HTTPException(status_code=400, detail="Cannot change book ID")
+    books.put(updated_book_dict)
+    response = FastJSONResponse(updated_book_dict)
+    await storage.sync()
+    return response
 
 # Отримання інформації про книгу за її ID або всі книги
+# limit/after_id повертають сторінку в порядку зростання id, а заголовок
+# Accept: application/x-ndjson вмикає потокову відповідь по одній книзі на рядок.
+# Книги у сховищі вже пройшли валідацію при додаванні, тому відповідь
+# серіалізується напряму, без повторної перевірки кожної книги за response_model.
 @app.get("/books/", response_model=List[Book])
-def get_books():
-    return books
+async def get_books(request: Request, limit: Optional[int] = Query(None, ge=1), after_id: Optional[int] = None):
+    if limit is None and after_id is None:
+        selected = books
+    else:
+        selected = books.page(after=after_id, limit=limit)
+    if NDJSON in request.headers.get("accept", ""):
+        return StreamingResponse(encode_ndjson(selected), media_type=NDJSON)
+    return cached_response(request, ("books",), lambda: list(selected))
+
+# Потокове вивантаження каталогу у форматі NDJSON або CSV
+@app.get("/books/export")
+async def export_books(export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$")):
+    if export_format == "csv":
+        return StreamingResponse(encode_csv(books), media_type=CSV)
+    return StreamingResponse(encode_ndjson(books), media_type=NDJSON)
 
 @app.get("/books/{book_id}", response_model=Book)
-def get_book(book_id: int):
-    for book in books:
-        if book["id"] == book_id:
-            return book
-    raise HTTPException(status_code=404, detail="Book not found")
+async def get_book(request: Request, book_id: int):
+    def build():
+        book = books.get(book_id)
+        if book is None:
+            raise HTTPException(status_code=404, detail="Book not found")
+        return book
+    return cached_response(request, ("book", f"book:{book_id}"), build)
 
 # Видалення книги з інвентаря
 @app.delete("/books/{book_id}")
-def delete_book(book_id: int):
-    global books
-    initial_length = len(books)
-    books = [book for book in books if book["id"] != book_id]
-    if len(books) == initial_length:
+async def delete_book(book_id: int):
+    if not books.delete(book_id):
         raise HTTPException(status_code=404, detail="Book not found")
+    await storage.sync()
     return {"message": "Book deleted successfully"}
 
 
 '''ОБРОБКА ПОКУПОК КНИГ'''
 # Додавання нового замовлення на покупку книги
 @app.post("/orders/", response_model=Order)
-def add_order(order: Order):
-
-    book = next((b for b in books if b["id"] == order.book_id), None)
+async def add_order(order: Order, idempotency_key: Optional[str] = Header(None, max_length=255)):
+    record = order.model_dump()
 
-    if book is None:
-        raise HTTPException(status_code=404, detail="Book not found")
+    # Повтор запиту з відомим ключем отримує збережену відповідь без змін інвентаря
+    if idempotency_key is not None:
+        fingerprint = make_etag(dumps(record))
+        try:
+            body = idempotency_cache.get(idempotency_key, fingerprint)
+        except IdempotencyConflict as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if body is not None:
+            # Перший запит міг ще не дочекатися запису на диск
+            await storage.sync()
+            return FastJSONResponse(body, headers={"Idempotent-Replayed": "true"})
 
-    if book["quantity"] < order.quantity:
-        raise HTTPException(status_code=400, detail="Insufficient stock")
+    # Замовлення з уже зайнятим ID відхиляється до резервування, тож не забирає книг
+    # і не підміняє попереднє замовлення
+    if order.id in orders:
+        raise HTTPException(status_code=400, detail="Order with this ID already exists")
 
-    # Зменшення кількості книг в інвентарі
-    book["quantity"] -= order.quantity
+    # Перевірка наявності та зменшення кількості книг в інвентарі одним кроком.
+    # Між перевіркою та зменшенням немає await, тож у циклі подій резервування неподільне;
+    # смуговий замок книги лише коротко захищає її від змін з інших потоків
+    try:
+        books.reserve(order.book_id, order.quantity)
+    except BookNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InsufficientStock as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    orders.append(order.model_dump())
-    return order
+    # У режимі shared: ID міг щойно зайняти інший процес або база могла бути зайнятою -
+    # тоді резерв повертається
+    try:
+        added = orders.add(record)
+    except StorageBusy:
+        books.release(order.book_id, order.quantity)
+        raise
+    if not added:
+        books.release(order.book_id, order.quantity)
+        raise HTTPException(status_code=400, detail="Order with this ID already exists")
+    response = FastJSONResponse(record)
+    # Зберігається лише успішна відповідь: відмова нічого не змінила, і повтор
+    # може вдатися, коли книги знову з'являться на складі
+    if idempotency_key is not None:
+        idempotency_cache.put(idempotency_key, fingerprint, response.body)
+    await storage.sync()
+    return response
 
 # Оновлення статусу замовлення
 @app.put("/orders/{order_id}", response_model=Order)
-def update_order(order_id: int, updated_order: Order):
+async def update_order(order_id: int, updated_order: Order):
     valid_statuses = ["Processing", "Shipped", "Completed"]
 
     # Перевірка наявності замовлення
-    for idx, order in enumerate(orders):
-        if order["id"] == order_id:
-            # Перевірка валідності статусу
-            if updated_order.status not in valid_statuses:
-                raise HTTPException(status_code=400, detail="Invalid status")
+    if order_id not in orders:
+        raise HTTPException(status_code=404, detail="Order not found")
 
-            # Оновлення тільки статусу
-            orders[idx]["status"] = updated_order.status
-            return orders[idx]
+    # Перевірка валідності статусу
+    if updated_order.status not in valid_statuses:
+        raise HTTPException(status_code=400, detail="Invalid status")
 
-    raise HTTPException(status_code=404, detail="Order not found")
+    # Оновлення тільки статусу
+    order = orders.update(order_id, status=updated_order.status)
+    response = FastJSONResponse(order)
+    await storage.sync()
+    return response
+
+# Потік подій order_created та order_status_changed (Server-Sent Events);
+# status обмежує потік замовленнями з цим статусом після зміни.
+# Маршрут оголошено до /orders/{order_id}, інакше "events" сприймалося б як ID
+@app.get("/orders/events")
+async def stream_order_events(status: Optional[str] = None,
+                              last_event_id: Optional[int] = Header(None)):
+    if status is not None and status not in ["Processing", "Shipped", "Completed"]:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    subscription = order_events.subscribe(status, last_event_id)
+    return StreamingResponse(order_events.stream(subscription), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 # Отримання інформації про замовлення за ID
 @app.get("/orders/{order_id}", response_model=Order)
-def get_order(order_id: int):
-    for order in orders:
-        if order["id"] == order_id:
-            return order
-    raise HTTPException(status_code=404, detail="Order not found")
+async def get_order(order_id: int):
+    order = orders.get(order_id)
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return FastJSONResponse(order)
 
 
 '''ВІДСТЕЖЕННЯ ЗАМОВЛЕНЬ КЛІЄНТІВ'''
 # Перегляд замовлень клієнта за його ID
 @app.get("/orders/customer/{customer_id}", response_model=dict)
-def get_customer_orders(customer_id: int):
-    customer_orders = [order for order in orders if order["customer_id"] == customer_id]
-    if not customer_orders:
+async def get_customer_orders(customer_id: int, limit: Optional[int] = Query(None, ge=1),
+                        cursor: Optional[int] = None):
+    if not orders.count("customer_id", customer_id):
         raise HTTPException(status_code=404, detail="No orders found for this customer")
-    return {"orders": customer_orders}
+    customer_orders, next_cursor = orders.find("customer_id", customer_id, after=cursor, limit=limit)
+    return FastJSONResponse({"orders": customer_orders, "next_cursor": next_cursor})
 
 # Статуси замовлень (на обробці, відправлено, виконано)
 @app.get("/orders/status/{status}", response_model=dict)
-def get_orders_by_status(status: str):
+async def get_orders_by_status(request: Request, status: str, limit: Optional[int] = Query(None, ge=1),
+                         cursor: Optional[int] = None):
     valid_statuses = ["Processing", "Shipped", "Completed"]
     if status not in valid_statuses:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    orders_by_status = [order for order in orders if order["status"] == status]
-    return {"orders": orders_by_status}
+    def build():
+        orders_by_status, next_cursor = orders.find("status", status, after=cursor, limit=limit)
+        return {"orders": orders_by_status, "next_cursor": next_cursor}
+    return cached_response(request, ("orders", f"orders:status:{status}"), build)
+
+
+'''СТАН КЕШУ ВІДПОВІДЕЙ'''
+# Лічильники влучань і промахів кешу
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return response_cache.stats()
+
+# Розмір кешу ідемпотентних відповідей і частка повторів, отриманих з нього
+@app.get("/idempotency/stats")
+async def get_idempotency_stats():
+    return idempotency_cache.stats()
+
+
+'''СТАТИСТИКА ІНВЕНТАРЯ'''
+# Загальні показники: кількість назв і одиниць, вартість запасу, продано одиниць
+# та кількість назв із залишком не більшим за поріг threshold
+@app.get("/stats")
+async def get_stats(threshold: int = Query(LOW_STOCK_THRESHOLD, ge=0)):
+    return inventory_stats.summary(threshold)
+
+# Книги з найменшим залишком; threshold відкидає книги із залишком понад поріг
+@app.get("/stats/low-stock")
+async def get_low_stock(limit: int = Query(10, ge=1, le=1000), threshold: Optional[int] = Query(None, ge=0)):
+    return inventory_stats.low_stock(limit, threshold)
+
+# Найпопулярніші книги за кількістю проданих одиниць
+@app.get("/stats/sales")
+async def get_top_sellers(limit: int = Query(10, ge=1, le=1000)):
+    return inventory_stats.top_sellers(limit)
+
+@app.get("/stats/sales/{book_id}")
+async def get_book_sales(book_id: int):
+    return {"book_id": book_id, "units_sold": inventory_stats.sold(book_id)}
+
+
+'''МЕТРИКИ ТА ПРОФІЛЮВАННЯ'''
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Увімкнення або вимкнення профілювальника повільних запитів
+@app.post("/metrics/profiler")
+async def toggle_profiler(enabled: bool, threshold_ms: float = Query(100.0, gt=0)):
+    profiler = metrics.profiler
+    profiler.threshold = threshold_ms / 1000
+    if enabled:
+        profiler.start()
+    else:
+        profiler.stop()
+    return {"enabled": profiler.running, "threshold_ms": threshold_ms, "dumps": profiler.dumps}
@@ -0,0 +1,241 @@
+import asyncio
+import contextvars
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+# Метрики запитів у форматі Prometheus.
+# Усі лічильники змінюються лише в потоці циклу подій (middleware та асинхронні обробники),
+# тож оновлення - це кілька операцій зі словниками без замків.
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    def __init__(self):
+        self.in_flight = 0
+        self.requests = Counter()  # (method, route, status) -> кількість
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.stages: Dict[Tuple[str, str], Histogram] = {}
+        self.gauges = []  # (назва, тип, опис, функція без аргументів)
+        self.profiler: Optional[SlowRequestProfiler] = None
+
+    def gauge(self, name: str, description: str, read: Callable[[], float], metric_type: str = "gauge"):
+        # Значення читається лише під час запиту /metrics; metric_type="counter" для
+        # лічильників, які ведуться деінде (наприклад, у кеші відповідей)
+        self.gauges.append((name, metric_type, description, read))
+
+    def observe_request(self, method: str, route: str, status: int, duration: float):
+        self.requests[method, route, status] += 1
+        histogram = self.latency.get((method, route))
+        if histogram is None:
+            histogram = self.latency[method, route] = Histogram()
+        histogram.observe(duration)
+
+    def observe_stage(self, route: str, stage: str, duration: float):
+        histogram = self.stages.get((route, stage))
+        if histogram is None:
+            histogram = self.stages[route, stage] = Histogram()
+        histogram.observe(duration)
+
+    def render(self) -> str:
+        lines = ["# HELP http_requests_total Completed HTTP requests.",
+                 "# TYPE http_requests_total counter"]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+        lines += ["# HELP http_requests_in_flight Requests being processed.",
+                  "# TYPE http_requests_in_flight gauge",
+                  f"http_requests_in_flight {self.in_flight}"]
+        lines += ["# HELP http_request_duration_seconds Request latency by route.",
+                  "# TYPE http_request_duration_seconds histogram"]
+        for (method, route), histogram in sorted(self.latency.items()):
+            self._render_histogram(lines, "http_request_duration_seconds", histogram, method=method, route=route)
+        lines += ["# HELP http_request_stage_seconds Time spent in request parsing and validation, "
+                  "the endpoint body and response serialization.",
+                  "# TYPE http_request_stage_seconds histogram"]
+        for (route, stage), histogram in sorted(self.stages.items()):
+            self._render_histogram(lines, "http_request_stage_seconds", histogram, route=route, stage=stage)
+        for name, metric_type, description, read in self.gauges:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}", f"{name} {read()}"]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(lines: list, name: str, histogram: Histogram, **labels):
+        label_text = _labels(**labels)
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{label_text}}} {histogram.total}")
+        lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+
+
+class MetricsMiddleware:
+    # ASGI middleware: кількість запитів у обробці, статус і повна тривалість кожного запиту.
+    # Маршрут береться з шаблону (/books/{book_id}), а не з конкретного шляху,
+    # тож кількість рядів метрик не росте разом з кількістю книг
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = self.metrics
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            finished = time.perf_counter()
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            route = route.path if route is not None else "unmatched"
+            metrics.observe_request(scope["method"], route, status, finished - started)
+            profiler = metrics.profiler
+            if profiler is not None and profiler.running and finished - started >= profiler.threshold:
+                profiler.dump(scope["method"], route, started, finished)
+
+
+# Позначки часу поточного запиту: [початок обробника, початок ендпоінта, кінець ендпоінта]
+_marks = contextvars.ContextVar("request_marks", default=None)
+
+
+class TimedRoute(APIRoute):
+    # Маршрут FastAPI, що ділить час обробника на етапи: розбір і валідація запиту
+    # (до виклику функції ендпоінта), сам ендпоінт та серіалізація відповіді після нього
+    metrics: Metrics = None
+
+    @classmethod
+    def using(cls, metrics: Metrics) -> type:
+        return type(cls.__name__, (cls,), {"metrics": metrics})
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if asyncio.iscoroutinefunction(call) and not getattr(call, "_timed", False):
+            async def timed_call(**values):
+                marks = _marks.get()
+                if marks is not None:
+                    marks[1] = time.perf_counter()
+                try:
+                    return await call(**values)
+                finally:
+                    if marks is not None:
+                        marks[2] = time.perf_counter()
+            timed_call._timed = True
+            self.dependant.call = timed_call
+
+        handler = super().get_route_handler()
+        route, metrics = self.path, self.metrics
+
+        async def timed_handler(request):
+            marks = [time.perf_counter(), None, None]
+            token = _marks.set(marks)
+            try:
+                return await handler(request)
+            finally:
+                _marks.reset(token)
+                if metrics is not None and marks[1] is not None:
+                    finished = time.perf_counter()
+                    metrics.observe_stage(route, "validation", marks[1] - marks[0])
+                    if marks[2] is not None:
+                        metrics.observe_stage(route, "endpoint", marks[2] - marks[1])
+                        metrics.observe_stage(route, "serialization", finished - marks[2])
+        return timed_handler
+
+
+class SlowRequestProfiler:
+    # Вибірковий профілювальник: фоновий потік кожні interval секунд знімає стек потоку
+    # циклу подій і тримає останні max_samples знімків. Для запиту, довшого за threshold,
+    # знімки з його проміжку часу записуються у файл у згорнутому форматі
+    # ("кадр;кадр;кадр кількість"), який приймають flamegraph.pl та speedscope.
+    # Цикл подій спільний, тож у профіль потрапляє й робота одночасних запитів.
+    def __init__(self, directory: str = "profiles", threshold: float = 0.1, interval: float = 0.005,
+                 max_samples: int = 20000):
+        self.directory = directory
+        self.threshold = threshold
+        self.interval = interval
+        self.samples = deque(maxlen=max_samples)
+        self.dumps = 0
+        self.running = False
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        # Викликається з потоку циклу подій, стек якого профілюється
+        if self.running:
+            return
+        self._target = threading.get_ident()
+        self.running = True
+        self._thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self):
+        while self.running:
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples.append((time.perf_counter(), ";".join(reversed(stack))))
+            time.sleep(self.interval)
+
+    def dump(self, method: str, route: str, started: float, finished: float) -> Optional[str]:
+        stacks = Counter(stack for moment, stack in list(self.samples) if started <= moment <= finished)
+        if not stacks:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9]+", "_", f"{method}{route}").strip("_")
+        path = os.path.join(self.directory, f"{int(time.time() * 1000)}-{name}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.dumps += 1
+        return path
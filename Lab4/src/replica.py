@@ -0,0 +1,87 @@
+import threading
+from typing import Iterable
+
+from src.repository import Repository
+from src.storage import SharedSQLiteStorage
+
+# Локальні копії спільного сховища для режиму з кількома процесами uvicorn.
+# Кожен процес тримає всі записи в пам'яті й читає лише їх, а зміни пише у спільну
+# базу SQLite. Перед обробкою запиту процес перевіряє PRAGMA data_version - одне
+# звернення без читання таблиць - і, якщо хтось закомітив зміни, дочитує журнал changes
+# та застосовує до своїх репозиторіїв ті зміни, яких не записав сам. Читання
+# масштабуються з кількістю процесів, а всі рішення про залишок і зайнятість id приймає база.
+
+
+class Replica:
+    def __init__(self, storage: SharedSQLiteStorage, repositories: Iterable[Repository],
+                 batch: int = 10000, prune_every: int = 10000, keep: int = 100000):
+        self.storage = storage
+        self.repositories = {repository.kind: repository for repository in repositories}
+        self.batch = batch
+        self.prune_every = prune_every
+        self.keep = keep
+        self.seq = 0
+        self.applied = 0
+        self.reloads = 0
+        self._version = None
+        self._since_prune = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        # Номер останньої зміни береться до читання: зміни, що встигнуть закомітитися
+        # під час load(), будуть застосовані ще раз, і це безпечно
+        with self._lock:
+            self._version = self.storage.data_version()
+            self.seq = self.storage.last_change()
+            for repository in self.repositories.values():
+                repository.reload()
+            self.storage.forget_written(self.seq)
+
+    def refresh(self) -> int:
+        # Застосовує нові зміни з журналу; повертає їх кількість
+        version = self.storage.data_version()
+        if version == self._version:
+            return 0
+        with self._lock:
+            self._version = version
+            count = 0
+            while True:
+                changes = self.storage.changes_since(self.seq, self.batch)
+                if changes is None:
+                    # Процес відстав більше ніж на keep змін - перечитуємо все
+                    self.seq = self.storage.last_change()
+                    for repository in self.repositories.values():
+                        repository.reload()
+                    self.storage.forget_written(self.seq)
+                    self.reloads += 1
+                    break
+                for seq, kind, record_id, record in changes:
+                    # Власні зміни процесу вже в пам'яті; проміжні стани перед ними
+                    # (резерв і повернення, чужий PUT між двома своїми) теж пропускаються,
+                    # щоб не будити слухачів (кеш, SSE, статистику) застарілими записами
+                    repository = self.repositories.get(kind)
+                    if repository is not None and not self.storage.written_here(kind, record_id, seq):
+                        repository.apply(record_id, record)
+                    self.seq = seq
+                count += len(changes)
+                if len(changes) < self.batch:
+                    break
+            self.applied += count
+            self._since_prune += count
+            if self._since_prune >= self.prune_every:
+                self._since_prune = 0
+                self.storage.prune(self.keep)
+            return count
+
+
+class ReplicaMiddleware:
+    # ASGI middleware: оновлює локальну копію перед кожним HTTP-запитом,
+    # тож запит бачить усі зміни, закомічені до його початку
+    def __init__(self, app, replica: Replica):
+        self.app = app
+        self.replica = replica
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.replica.refresh()
+        await self.app(scope, receive, send)
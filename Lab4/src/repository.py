@@ -0,0 +1,327 @@
+import threading
+from bisect import bisect_right, insort
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.locks import StripedLock
+from src.sortedkeys import SortedKeys
+from src.storage import MemoryStorage
+
+
+class BookNotFound(LookupError):
+    pass
+
+
+class InsufficientStock(ValueError):
+    pass
+
+
+class Repository:
+    # Сховище записів з первинним індексом за id.
+    # dict зберігає порядок вставки, тому ітерація повертає записи в тому ж порядку,
+    # що й колишній список, а пошук, заміна та видалення коштують O(1).
+    #
+    # Вторинні індекси (indexes) зберігають для кожного значення поля відсортований
+    # список порядкових номерів вставки, тож вибірка за значенням коштує
+    # O(log n + розмір сторінки), а порядковий номер слугує курсором пагінації.
+    #
+    # Кожна зміна передається у storage під назвою kind; індекси завжди живуть
+    # у пам'яті й відновлюються зі сховища методом load().
+    #
+    # ordered=True додатково підтримує відсортований набір ключів (SortedKeys) для
+    # пагінації за ключем (page), не змінюючи порядку звичайної ітерації;
+    # додавання й видалення в ньому коштують O(log n) незалежно від розміру каталогу.
+    #
+    # Слухачі (subscribe) викликаються під замком після кожної зміни з аргументами
+    # (id, старий запис, новий запис); None замість старого або нового означає
+    # додавання або видалення, а (None, None, None) - заміну всього вмісту (clear, load).
+    #
+    # Зі спільним сховищем (storage.shared) репозиторій - лише локальна копія:
+    # зайнятість id вирішує сховище, а зміни інших процесів надходять через apply().
+    def __init__(self, key: str = "id", indexes: Iterable[str] = (),
+                 kind: str = "records", storage: Optional[MemoryStorage] = None,
+                 ordered: bool = False):
+        self.key = key
+        self.kind = kind
+        self.storage = storage if storage is not None else MemoryStorage()
+        self._records = {}
+        self._seqs = {}
+        self._ids = {}
+        self._next_seq = 0
+        self._indexes = {field: {} for field in indexes}
+        self._order = SortedKeys() if ordered else None
+        # Короткий замок на зміну записів та індексів; пошук за id його не бере
+        self._write_lock = threading.RLock()
+        self.listeners = []
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(list(self._records.values()))
+
+    def __contains__(self, record_id) -> bool:
+        return record_id in self._records
+
+    def get(self, record_id) -> Optional[dict]:
+        return self._records.get(record_id)
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def add(self, record: dict) -> bool:
+        # Додає запис, лише якщо id ще не зайнятий
+        record_id = record[self.key]
+        with self._write_lock:
+            if record_id in self._records:
+                return False
+            # Спільне сховище може відмовити, якщо id щойно зайняв інший процес
+            if not self.storage.insert(self.kind, record_id, record):
+                return False
+            self._records[record_id] = record
+            self._index(record)
+            self._notify(record_id, None, record)
+            return True
+
+    def add_many(self, records: List[dict]) -> List:
+        # Додає всі записи однією операцією або жодного, якщо якийсь id уже зайнятий.
+        # Повертає список зайнятих id (порожній у разі успіху).
+        with self._write_lock:
+            conflicts = [record[self.key] for record in records if record[self.key] in self._records]
+            if conflicts:
+                return conflicts
+            # Спершу сховище: якщо запис на диск не вдасться, пам'ять лишиться незмінною
+            conflicts = self.storage.insert_many(self.kind, records, key=self.key)
+            if conflicts:
+                return conflicts
+            new_ids = {}
+            for record in records:
+                new_ids[record[self.key]] = None
+                self._records[record[self.key]] = record
+                self._index(record, ordered=False)
+            self._extend_order(new_ids)
+            for record in records:
+                self._notify(record[self.key], None, record)
+            return []
+
+    def put(self, record: dict) -> dict:
+        # Додає новий запис або замінює існуючий з тим самим id.
+        # Зміни пишуться спершу у сховище: якщо воно відмовить (StorageBusy),
+        # пам'ять лишиться незмінною
+        record_id = record[self.key]
+        with self._write_lock:
+            self.storage.save(self.kind, record_id, record)
+            old = self._records.get(record_id)
+            if old is not None:
+                self._unindex(old)
+            self._records[record_id] = record
+            self._index(record)
+            self._notify(record_id, old, record)
+            return record
+
+    def update(self, record_id, **fields) -> Optional[dict]:
+        with self._write_lock:
+            record = self._records.get(record_id)
+            if record is None:
+                return None
+            self.storage.save(self.kind, record_id, {**record, **fields})
+            old = dict(record) if self.listeners else None
+            seq = self._seqs[record_id]
+            for field, value in fields.items():
+                index = self._indexes.get(field)
+                if index is not None and record.get(field) != value:
+                    self._bucket_remove(index, record.get(field), seq)
+                    insort(index.setdefault(value, []), seq)
+            record.update(fields)
+            self._notify(record_id, old, record)
+            return record
+
+    def delete(self, record_id) -> bool:
+        with self._write_lock:
+            if record_id not in self._records:
+                return False
+            self.storage.delete(self.kind, record_id)
+            record = self._records.pop(record_id)
+            self._unindex(record)
+            self._notify(record_id, record, None)
+            return True
+
+    def clear(self):
+        with self._write_lock:
+            self.storage.clear(self.kind)
+            self._clear_memory()
+            self._notify(None, None, None)
+
+    def _clear_memory(self):
+        self._records.clear()
+        self._seqs.clear()
+        self._ids.clear()
+        for index in self._indexes.values():
+            index.clear()
+        if self._order is not None:
+            self._order.clear()
+
+    def load(self):
+        # Заповнює репозиторій зі сховища, не записуючи дані назад
+        with self._write_lock:
+            new_ids = []
+            for record in self.storage.load(self.kind):
+                old = self._records.get(record[self.key])
+                if old is None:
+                    new_ids.append(record[self.key])
+                else:
+                    self._unindex(old)
+                self._records[record[self.key]] = record
+                self._index(record, ordered=False)
+            self._extend_order(new_ids)
+            self._notify(None, None, None)
+
+    def reload(self):
+        # Відкидає вміст пам'яті й перечитує все зі сховища
+        with self._write_lock:
+            self._clear_memory()
+            self.load()
+
+    def apply(self, record_id, record: Optional[dict]):
+        # Застосовує зміну, яку вже записано у сховище (іншим процесом або цим самим),
+        # лише до пам'яті; None означає видалення. Запис, рівний наявному, пропускається,
+        # не скидаючи кеш
+        with self._write_lock:
+            old = self._records.get(record_id)
+            if old == record:
+                return
+            if record is None:
+                del self._records[record_id]
+                self._unindex(old)
+            else:
+                if old is not None:
+                    self._unindex(old)
+                self._records[record_id] = record
+                self._index(record)
+            self._notify(record_id, old, record)
+
+    # Сумісність зі списковим інтерфейсом (books.append(...) у тестах та скриптах)
+    def append(self, record: dict):
+        self.put(record)
+
+    # Вибірка за вторинним індексом з курсорною пагінацією
+    def find(self, field: str, value, after: Optional[int] = None,
+             limit: Optional[int] = None) -> Tuple[List[dict], Optional[int]]:
+        with self._write_lock:
+            bucket = self._indexes[field].get(value)
+            if not bucket:
+                return [], None
+            start = 0 if after is None else bisect_right(bucket, after)
+            end = len(bucket) if limit is None else start + limit
+            seqs = bucket[start:end]
+            records = [self._records[self._ids[seq]] for seq in seqs]
+            next_cursor = seqs[-1] if seqs and end < len(bucket) else None
+            return records, next_cursor
+
+    def count(self, field: str, value) -> int:
+        return len(self._indexes[field].get(value, ()))
+
+    # Сторінка записів у порядку зростання ключа, починаючи після ключа after
+    def page(self, after=None, limit: Optional[int] = None) -> List[dict]:
+        with self._write_lock:
+            return [self._records[record_id] for record_id in self._order.after(after, limit)]
+
+    def _notify(self, record_id, old: Optional[dict], new: Optional[dict]):
+        for listener in self.listeners:
+            listener(record_id, old, new)
+
+    def _extend_order(self, record_ids: Iterable):
+        # Пакетне додавання ключів одним сортуванням замість k окремих вставок
+        if self._order is not None:
+            self._order.update(record_ids)
+
+    def _index(self, record: dict, ordered: bool = True):
+        record_id = record[self.key]
+        seq = self._seqs.get(record_id)
+        if seq is None:
+            seq = self._seqs[record_id] = self._next_seq
+            self._ids[seq] = record_id
+            self._next_seq += 1
+            if ordered and self._order is not None:
+                self._order.add(record_id)
+        for field, index in self._indexes.items():
+            insort(index.setdefault(record.get(field), []), seq)
+
+    def _unindex(self, record: dict):
+        record_id = record[self.key]
+        seq = self._seqs[record_id]
+        for field, index in self._indexes.items():
+            self._bucket_remove(index, record.get(field), seq)
+        if self._records.get(record_id) is not record:
+            # Запис видалено повністю, а не замінено - звільняємо його номер
+            del self._seqs[record_id]
+            del self._ids[seq]
+            if self._order is not None:
+                self._order.remove(record_id)
+
+    @staticmethod
+    def _bucket_remove(index: dict, value, seq: int):
+        bucket = index.get(value)
+        if not bucket:
+            return
+        pos = bisect_right(bucket, seq) - 1
+        if pos >= 0 and bucket[pos] == seq:
+            del bucket[pos]
+        if not bucket:
+            del index[value]
+
+
+class BookRepository(Repository):
+    # Репозиторій книг з атомарним резервуванням залишку.
+    # Зміни кожної книги захищені її смугою StripedLock, тому замовлення на різні
+    # книги не блокують одне одне, а на одну книгу - ніколи не продають більше, ніж є.
+    def __init__(self, stripes: int = 64, **kwargs):
+        super().__init__(**kwargs)
+        self.locks = StripedLock(stripes)
+
+    def put(self, record: dict) -> dict:
+        with self.locks(record[self.key]):
+            return super().put(record)
+
+    def delete(self, record_id) -> bool:
+        with self.locks(record_id):
+            return super().delete(record_id)
+
+    def reserve(self, book_id, quantity: int) -> dict:
+        # Перевіряє та зменшує залишок як одну неподільну операцію
+        if self.storage.shared:
+            return self._reserve_shared(book_id, quantity)
+        with self.locks(book_id):
+            book = self.get(book_id)
+            if book is None:
+                raise BookNotFound("Book not found")
+            if book["quantity"] < quantity:
+                raise InsufficientStock("Insufficient stock")
+            # Спершу сховище: якщо запис не вдасться, залишок у пам'яті лишиться незмінним
+            self.storage.save(self.kind, book_id, {**book, "quantity": book["quantity"] - quantity})
+            old = dict(book) if self.listeners else None
+            book["quantity"] -= quantity
+            with self._write_lock:
+                self._notify(book_id, old, book)
+            return book
+
+    def release(self, book_id, quantity: int) -> Optional[dict]:
+        # Повертає на склад зарезервовані книги (замовлення, яке не вдалося записати);
+        # від'ємне резервування проходить перевірку залишку завжди
+        try:
+            return self.reserve(book_id, -quantity)
+        except BookNotFound:
+            return None
+
+    def _reserve_shared(self, book_id, quantity: int) -> dict:
+        # Залишок у пам'яті може відставати від інших процесів, тому перевірка
+        # та зменшення виконуються одним умовним UPDATE у спільному сховищі
+        # Зменшення й застосування - під одним замком, тож пам'ять проходить власні
+        # зміни в тому ж порядку, що й журнал, і Replica може їх пропускати
+        with self._write_lock:
+            book = self.storage.decrement(self.kind, book_id, "quantity", quantity)
+            if book is not None:
+                self.apply(book_id, book)
+                return book
+        if self.storage.fetch(self.kind, book_id) is None:
+            raise BookNotFound("Book not found")
+        raise InsufficientStock("Insufficient stock")
@@ -0,0 +1,49 @@
+import json
+import math
+
+from fastapi.responses import JSONResponse
+
+# Швидкий шлях серіалізації відповідей.
+# Записи в репозиторіях уже пройшли валідацію на вході, тож обробники повертають
+# FastJSONResponse напряму: FastAPI не перевіряє готову відповідь за response_model
+# і не проганяє її через jsonable_encoder, а лише надсилає байти.
+# Якщо встановлено orjson, кодування виконує він; інакше - заздалегідь створений
+# JSONEncoder з тими самими параметрами, що й у JSONResponse Starlette
+# (json.dumps з нестандартними параметрами створює новий кодувальник на кожен виклик).
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encode = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(content)
+        except orjson.JSONEncodeError:
+            # orjson не кодує цілі ширші за 64 біти - їх кодує стандартний json
+            pass
+    return _encode(content).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    # Вміст типу bytes вважається вже закодованим JSON (наприклад, з кешу відповідей)
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def json_safe(value):
+    # Замінює Infinity та NaN (у тому числі вкладені) рядками: JSON їх не допускає,
+    # а в помилках валідації такі значення повертаються клієнту як отримані
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    return value
@@ -0,0 +1,110 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain
+from typing import Iterable, Iterator, List
+
+
+class SortedKeys:
+    # Відсортований набір ключів у вигляді списку коротких відсортованих частин
+    # (як SortedList у sortedcontainers). Вставка та видалення зсувають лише одну
+    # частину довжиною до 2 * load, а частину знаходить бінарний пошук по їхніх
+    # максимумах, тож окрема зміна коштує O(log n + load) замість O(n) для одного
+    # великого списку. Частини, що виросли вдвічі, діляться, а надто малі зливаються з сусідньою.
+    def __init__(self, keys: Iterable = (), load: int = 1000):
+        self._load = load
+        self._lists = []
+        self._maxes = []
+        self._len = 0
+        self.update(keys)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._lists)
+
+    def __contains__(self, key) -> bool:
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        part = self._lists[pos]
+        return part[bisect_left(part, key)] == key
+
+    def clear(self):
+        self._lists = []
+        self._maxes = []
+        self._len = 0
+
+    def add(self, key):
+        if not self._lists:
+            self._lists.append([key])
+            self._maxes.append(key)
+        else:
+            pos = bisect_left(self._maxes, key)
+            if pos == len(self._maxes):
+                pos -= 1
+                self._lists[pos].append(key)
+                self._maxes[pos] = key
+            else:
+                insort(self._lists[pos], key)
+            if len(self._lists[pos]) > 2 * self._load:
+                self._split(pos)
+        self._len += 1
+
+    def remove(self, key):
+        pos = bisect_left(self._maxes, key)
+        part = self._lists[pos] if pos < len(self._maxes) else ()
+        i = bisect_left(part, key)
+        if i == len(part) or part[i] != key:
+            raise KeyError(key)
+        del part[i]
+        self._len -= 1
+        if not part:
+            del self._lists[pos]
+            del self._maxes[pos]
+            return
+        self._maxes[pos] = part[-1]
+        if len(part) < self._load // 4 and len(self._lists) > 1:
+            self._merge(pos)
+
+    def update(self, keys: Iterable):
+        # Пакетне додавання: одне сортування (timsort зливає вже впорядковані ключі
+        # з новими) і перебудова частин за O(n + k log k) замість k окремих вставок
+        keys = list(keys)
+        if not keys:
+            return
+        merged = list(self)
+        merged.extend(keys)
+        merged.sort()
+        self._lists = [merged[i:i + self._load] for i in range(0, len(merged), self._load)]
+        self._maxes = [part[-1] for part in self._lists]
+        self._len = len(merged)
+
+    def after(self, key=None, limit=None) -> List:
+        # До limit ключів, строго більших за key (з початку, якщо key - None)
+        if key is None:
+            pos, i = 0, 0
+        else:
+            pos = bisect_right(self._maxes, key)
+            i = bisect_right(self._lists[pos], key) if pos < len(self._lists) else 0
+        result = []
+        while pos < len(self._lists) and (limit is None or len(result) < limit):
+            part = self._lists[pos]
+            end = len(part) if limit is None else i + limit - len(result)
+            result.extend(part[i:end])
+            pos, i = pos + 1, 0
+        return result
+
+    def _split(self, pos: int):
+        part = self._lists[pos]
+        half = len(part) // 2
+        self._lists[pos:pos + 1] = [part[:half], part[half:]]
+        self._maxes[pos:pos + 1] = [part[half - 1], part[-1]]
+
+    def _merge(self, pos: int):
+        # Зливає малу частину з наступною (або попередньою, якщо вона остання)
+        if pos == len(self._lists) - 1:
+            pos -= 1
+        self._lists[pos:pos + 2] = [self._lists[pos] + self._lists[pos + 1]]
+        self._maxes[pos:pos + 2] = [self._lists[pos][-1]]
+        if len(self._lists[pos]) > 2 * self._load:
+            self._split(pos)
@@ -0,0 +1,151 @@
+import threading
+from collections import Counter
+from heapq import heapify, heappop, heappush
+from typing import List, Optional, Tuple
+
+# Агрегати каталогу для /stats, що оновлюються слухачами репозиторіїв при кожній зміні
+# замість повного перегляду книг і замовлень на кожен запит.
+#   - вартість запасу - ціле число копійок (ціна в копійках x кількість), тож сума
+#     не накопичує похибки округлення float;
+#   - низький залишок - купа пар (кількість, id), найпопулярніші книги - купа (-продано, id);
+#     оновлення коштує O(log n), а N найменших - O(N log N) незалежно від розміру каталогу.
+# (None, None, None) від репозиторію (clear, load) перераховує відповідну частину з нуля.
+
+
+def _cents(price: float) -> int:
+    return round(price * 100)
+
+
+class RankedHeap:
+    # Мін-купа пар (ключ, id) з лінивим видаленням: зміна ключа лише додає нову пару,
+    # а застарілі пропускаються під час читання (чинний ключ кожного id - у keys).
+    # Коли застарілих пар стає більше, ніж чинних, купа перебудовується, тож її розмір
+    # лишається O(n), а вартість перебудови розподіляється між оновленнями.
+    # smallest() обходить купу як дерево у порядку зростання (кандидати - у допоміжній
+    # купі), не змінюючи основну, і відвідує лише O(N) вузлів над першими N чинними парами.
+    def __init__(self):
+        self.keys = {}
+        self._heap = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def set(self, item_id, key):
+        if self.keys.get(item_id) == key:
+            return
+        self.keys[item_id] = key
+        heappush(self._heap, (key, item_id))
+        self._compact()
+
+    def discard(self, item_id):
+        if self.keys.pop(item_id, None) is not None:
+            self._compact()
+
+    def reset(self, pairs):
+        self.keys = {item_id: key for key, item_id in pairs}
+        self._heap = [(key, item_id) for item_id, key in self.keys.items()]
+        heapify(self._heap)
+
+    def smallest(self, limit: Optional[int] = None, max_key=None) -> List[Tuple]:
+        heap, keys = self._heap, self.keys
+        result, seen = [], set()
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and (limit is None or len(result) < limit):
+            (key, item_id), pos = heappop(frontier)
+            if max_key is not None and key > max_key:
+                break
+            if keys.get(item_id) == key and item_id not in seen:
+                seen.add(item_id)
+                result.append((key, item_id))
+            for child in (2 * pos + 1, 2 * pos + 2):
+                if child < len(heap):
+                    heappush(frontier, (heap[child], child))
+        return result
+
+    def _compact(self):
+        if len(self._heap) > 2 * len(self.keys) + 64:
+            self.reset([(key, item_id) for item_id, key in self.keys.items()])
+
+
+class InventoryStats:
+    def __init__(self, books, orders):
+        self.books = books
+        self.orders = orders
+        self.value_cents = 0
+        self.units_in_stock = 0
+        self.units_sold = 0
+        self._by_quantity = RankedHeap()  # id книги -> кількість
+        self._sold = Counter()  # id книги -> продано одиниць
+        self._by_sold = RankedHeap()  # id книги -> -продано
+        self._lock = threading.Lock()
+        books.subscribe(self.on_book)
+        orders.subscribe(self.on_order)
+        self._rebuild_books()
+        self._rebuild_sales()
+
+    def on_book(self, book_id, old: Optional[dict], new: Optional[dict]):
+        with self._lock:
+            if book_id is None:
+                self._rebuild_books()
+                return
+            if old is not None:
+                self.value_cents -= _cents(old["price"]) * old["quantity"]
+                self.units_in_stock -= old["quantity"]
+            if new is not None:
+                self.value_cents += _cents(new["price"]) * new["quantity"]
+                self.units_in_stock += new["quantity"]
+                self._by_quantity.set(book_id, new["quantity"])
+            else:
+                self._by_quantity.discard(book_id)
+
+    def on_order(self, order_id, old: Optional[dict], new: Optional[dict]):
+        # Продажем вважається створення замовлення; зміна статусу кількості не змінює
+        with self._lock:
+            if order_id is None:
+                self._rebuild_sales()
+            elif old is None and new is not None:
+                self._sell(new["book_id"], new["quantity"])
+
+    def _sell(self, book_id, quantity: int):
+        self._sold[book_id] += quantity
+        self._by_sold.set(book_id, -self._sold[book_id])
+        self.units_sold += quantity
+
+    def _rebuild_books(self):
+        books = list(self.books)
+        self.value_cents = sum(_cents(book["price"]) * book["quantity"] for book in books)
+        self.units_in_stock = sum(book["quantity"] for book in books)
+        self._by_quantity.reset((book["quantity"], book["id"]) for book in books)
+
+    def _rebuild_sales(self):
+        self._sold = Counter()
+        for order in self.orders:
+            self._sold[order["book_id"]] += order["quantity"]
+        self._by_sold.reset((-sold, book_id) for book_id, sold in self._sold.items())
+        self.units_sold = sum(self._sold.values())
+
+    def summary(self, threshold: int) -> dict:
+        with self._lock:
+            return {"titles": len(self._by_quantity), "units_in_stock": self.units_in_stock,
+                    "inventory_value": self.value_cents / 100, "units_sold": self.units_sold,
+                    "low_stock_titles": len(self._by_quantity.smallest(max_key=threshold))}
+
+    def low_stock(self, limit: int, threshold: Optional[int] = None) -> List[dict]:
+        # Книги з найменшим залишком (не більшим за threshold, якщо його задано)
+        with self._lock:
+            lowest = self._by_quantity.smallest(limit, max_key=threshold)
+        return [{"id": book_id, "title": self._title(book_id), "quantity": quantity}
+                for quantity, book_id in lowest]
+
+    def top_sellers(self, limit: int) -> List[dict]:
+        with self._lock:
+            top = self._by_sold.smallest(limit)
+        return [{"book_id": book_id, "title": self._title(book_id), "units_sold": -sold} for sold, book_id in top]
+
+    def sold(self, book_id) -> int:
+        return self._sold.get(book_id, 0)
+
+    def _title(self, book_id) -> Optional[str]:
+        # Продані книги можуть бути вже видалені з каталогу
+        book = self.books.get(book_id)
+        return None if book is None else book["title"]
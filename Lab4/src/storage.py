@@ -0,0 +1,565 @@
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+
+class StorageBusy(RuntimeError):
+    # Спільна база зайнята іншим процесом довше за busy_timeout; запит варто повторити
+    pass
+
+
+class StorageFailed(StorageBusy):
+    # Фоновий запис QueuedStorage не вдався: пам'ять уже містить зміни, яких немає на диску.
+    # Сховище відхиляє нові зміни, доки репозиторії не перечитають його й не викличуть recover()
+    pass
+
+
+class MemoryStorage:
+    # Сховище за замовчуванням: дані живуть лише в пам'яті процесу.
+    # Репозиторії викликають ці методи після кожної зміни, тож інші сховища
+    # лише перевизначають їх, щоб зробити зміни довговічними.
+    # shared=True означає, що сховищем одночасно користуються кілька процесів
+    # і воно, а не пам'ять процесу, вирішує, чи зайнятий id та чи вистачає залишку.
+    shared = False
+
+    def load(self, kind: str) -> Iterator[dict]:
+        return iter(())
+
+    def save(self, kind: str, record_id, record: dict):
+        pass
+
+    def save_many(self, kind: str, records: Iterable[dict], key: str = "id"):
+        for record in records:
+            self.save(kind, record[key], record)
+
+    def insert(self, kind: str, record_id, record: dict) -> bool:
+        # Додавання нового запису; репозиторій уже перевірив id у пам'яті
+        self.save(kind, record_id, record)
+        return True
+
+    def insert_many(self, kind: str, records: List[dict], key: str = "id") -> List:
+        # Додає всі записи або жодного; повертає зайняті id
+        self.save_many(kind, records, key=key)
+        return []
+
+    def delete(self, kind: str, record_id):
+        pass
+
+    def clear(self, kind: str):
+        pass
+
+    async def sync(self):
+        # Чекає, доки всі зміни, передані до виклику, стануть довговічними
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage(MemoryStorage):
+    # SQLite у режимі WAL: читачі не блокують записувача, а synchronous=NORMAL
+    # скидає журнал на диск лише на контрольних точках.
+    # Кожен потік бере з'єднання з пулу; sqlite3 кешує підготовлені запити
+    # окремо для кожного з'єднання, тож однакові SQL-рядки не розбираються повторно.
+    UPSERT = ("INSERT INTO records (kind, id, data) VALUES (?, ?, ?) "
+              "ON CONFLICT (kind, id) DO UPDATE SET data = excluded.data")
+
+    def __init__(self, path: str, pool_size: int = 4):
+        self.path = path
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "seq INTEGER PRIMARY KEY, kind TEXT NOT NULL, id INTEGER NOT NULL, "
+                "data TEXT NOT NULL, UNIQUE (kind, id))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False,
+                               isolation_level=None, cached_statements=128)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def load(self, kind: str) -> Iterator[dict]:
+        # Порядок seq відповідає порядку першої вставки запису
+        with self._connection() as conn:
+            for (data,) in conn.execute("SELECT data FROM records WHERE kind = ? ORDER BY seq", (kind,)):
+                yield json.loads(data)
+
+    def save(self, kind: str, record_id, record: dict):
+        with self._connection() as conn:
+            conn.execute(self.UPSERT, (kind, record_id, json.dumps(record)))
+
+    def save_many(self, kind: str, records: Iterable[dict], key: str = "id"):
+        # Одна транзакція на весь пакет замість коміту на кожен рядок
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(self.UPSERT, ((kind, r[key], json.dumps(r)) for r in records))
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def delete(self, kind: str, record_id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM records WHERE kind = ? AND id = ?", (kind, record_id))
+
+    def clear(self, kind: str):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM records WHERE kind = ?", (kind,))
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get().close()
+
+
+class SharedSQLiteStorage(SQLiteStorage):
+    # Спільне сховище для кількох процесів (uvicorn --workers N).
+    # База - єдине джерело істини: додавання не перезаписує чужий запис
+    # (INSERT ... DO NOTHING), а залишок зменшується умовним UPDATE, що спрацьовує
+    # лише коли залишку вистачає, - порівняння із заміною всередині одного коміту.
+    # Тригери пишуть кожну зміну records у журнал changes, з якого процеси оновлюють
+    # свої копії в пам'яті (див. src/replica.py).
+    # Запити виконуються синхронно в циклі подій, тож очікування на замок бази
+    # обмежене коротким busy_timeout (а не 5 с за замовчуванням sqlite3): якщо база
+    # зайнята довше, запис відмовляє з StorageBusy, і сервер відповідає 503.
+    shared = True
+    INSERT = "INSERT INTO records (kind, id, data) VALUES (?, ?, ?) ON CONFLICT (kind, id) DO NOTHING"
+    DECREMENT = ("UPDATE records SET data = json_set(data, ?, json_extract(data, ?) - ?) "
+                 "WHERE kind = ? AND id = ? AND json_extract(data, ?) >= ? RETURNING data")
+
+    def __init__(self, path: str, pool_size: int = 4, busy_timeout: float = 0.1):
+        self.busy_timeout = busy_timeout
+        super().__init__(path, pool_size)
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS changes ("
+                         "seq INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, "
+                         "id INTEGER NOT NULL, data TEXT)")
+            conn.execute("CREATE TRIGGER IF NOT EXISTS records_insert AFTER INSERT ON records BEGIN "
+                         "INSERT INTO changes (kind, id, data) VALUES (new.kind, new.id, new.data); END")
+            conn.execute("CREATE TRIGGER IF NOT EXISTS records_update AFTER UPDATE ON records BEGIN "
+                         "INSERT INTO changes (kind, id, data) VALUES (new.kind, new.id, new.data); END")
+            conn.execute("CREATE TRIGGER IF NOT EXISTS records_delete AFTER DELETE ON records BEGIN "
+                         "INSERT INTO changes (kind, id, data) VALUES (old.kind, old.id, NULL); END")
+        # Окреме з'єднання для опитування журналу: PRAGMA data_version на ньому
+        # змінюється після кожного коміту з будь-якого іншого з'єднання
+        self._watch = self._connect()
+        self._watch_lock = threading.Lock()
+        self._written = {}
+        self._written_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = super()._connect()
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        with super()._connection() as conn:
+            try:
+                yield conn
+            except sqlite3.OperationalError as e:
+                if "locked" in str(e):
+                    raise StorageBusy("Storage is busy, retry later") from e
+                raise
+
+    @contextmanager
+    def _transaction(self):
+        # Кожна зміна - окрема транзакція IMMEDIATE: поки вона триває, інші процеси не пишуть,
+        # тож усі нові рядки журналу changes належать саме цьому процесу. Їхні номери
+        # запам'ятовуються (written), і Replica.refresh не програє власні зміни вдруге.
+        # Тіло може саме відкотити транзакцію (ROLLBACK) - тоді нічого не запам'ятовується
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+                yield conn
+                if not conn.in_transaction:
+                    return
+                written = conn.execute("SELECT seq, kind, id FROM changes WHERE seq > ?", (before,)).fetchall()
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        with self._written_lock:
+            for seq, kind, record_id in written:
+                self._written[kind, record_id] = seq
+
+    def written_here(self, kind: str, record_id, seq: int) -> bool:
+        # Чи є зміна seq власною зміною цього процесу або передує його пізнішій зміні
+        # того самого запису. Такі зміни пам'ять уже пройшла (або пропустила як проміжні),
+        # а запам'ятований номер забувається, щойно журнал його досягне
+        with self._written_lock:
+            last = self._written.get((kind, record_id))
+            if last is None:
+                return False
+            if seq >= last:
+                del self._written[kind, record_id]
+            return seq <= last
+
+    def forget_written(self, seq: int):
+        # Після повного перечитування копії власні зміни до seq уже в пам'яті
+        with self._written_lock:
+            self._written = {key: last for key, last in self._written.items() if last > seq}
+
+    def fetch(self, kind: str, record_id) -> Optional[dict]:
+        with self._connection() as conn:
+            row = conn.execute("SELECT data FROM records WHERE kind = ? AND id = ?", (kind, record_id)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save(self, kind: str, record_id, record: dict):
+        with self._transaction() as conn:
+            conn.execute(self.UPSERT, (kind, record_id, json.dumps(record)))
+
+    def save_many(self, kind: str, records: Iterable[dict], key: str = "id"):
+        with self._transaction() as conn:
+            conn.executemany(self.UPSERT, ((kind, r[key], json.dumps(r)) for r in records))
+
+    def insert(self, kind: str, record_id, record: dict) -> bool:
+        with self._transaction() as conn:
+            return conn.execute(self.INSERT, (kind, record_id, json.dumps(record))).rowcount == 1
+
+    def insert_many(self, kind: str, records: List[dict], key: str = "id") -> List:
+        with self._transaction() as conn:
+            inserted = conn.executemany(self.INSERT, ((kind, r[key], json.dumps(r)) for r in records)).rowcount
+            if inserted == len(records):
+                return []
+            conn.execute("ROLLBACK")
+        # Пакет відкинуто; визначаємо, які саме id уже зайняті
+        return [r[key] for r in records if self.fetch(kind, r[key]) is not None]
+
+    def decrement(self, kind: str, record_id, field: str, amount: int) -> Optional[dict]:
+        # Зменшує числове поле на amount, лише якщо його значення не менше за amount.
+        # Повертає оновлений запис або None, якщо запису немає чи значення замале
+        path = "$." + field
+        with self._transaction() as conn:
+            row = conn.execute(self.DECREMENT, (path, path, amount, kind, record_id, path, amount)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def delete(self, kind: str, record_id):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM records WHERE kind = ? AND id = ?", (kind, record_id))
+
+    def clear(self, kind: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM records WHERE kind = ?", (kind,))
+
+    def data_version(self) -> int:
+        with self._watch_lock:
+            return self._watch.execute("PRAGMA data_version").fetchone()[0]
+
+    def last_change(self) -> int:
+        with self._watch_lock:
+            return self._watch.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def changes_since(self, seq: int, limit: int = 10000) -> Optional[list]:
+        # Зміни після seq у порядку комітів: [(seq, kind, id, запис або None)].
+        # Записувачі SQLite серіалізовані, а AUTOINCREMENT не повторює номерів, тож
+        # номери йдуть без пропусків; пропуск означає, що потрібні зміни вже видалено
+        # з журналу (prune), і тоді повертається None - копію слід перечитати повністю
+        with self._watch_lock:
+            rows = self._watch.execute("SELECT seq, kind, id, data FROM changes WHERE seq > ? "
+                                       "ORDER BY seq LIMIT ?", (seq, limit)).fetchall()
+        if rows and rows[0][0] != seq + 1:
+            return None
+        return [(s, kind, record_id, None if data is None else json.loads(data))
+                for s, kind, record_id, data in rows]
+
+    def prune(self, keep: int):
+        # Залишає в журналі лише останні keep змін
+        with self._connection() as conn:
+            conn.execute("DELETE FROM changes WHERE seq <= (SELECT MAX(seq) FROM changes) - ?", (keep,))
+
+    def close(self):
+        with self._watch_lock:
+            self._watch.close()
+        super().close()
+
+
+class LogStorage(MemoryStorage):
+    # Журнал лише на дописування (JSON Lines) з періодичними знімками стану.
+    # Після кожних snapshot_every записів повний стан пишеться у snapshot.json
+    # (через тимчасовий файл і атомарне перейменування), а журнал обнуляється,
+    # тож відновлення читає знімок і програє лише хвіст журналу після нього.
+    def __init__(self, directory: str, snapshot_every: int = 10000, fsync: bool = False):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.snapshot_path = os.path.join(directory, "snapshot.json")
+        self.log_path = os.path.join(directory, "log.jsonl")
+        self._lock = threading.Lock()
+        self._state = {}
+        self._pending = 0
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+        self._log = open(self.log_path, "a", encoding="utf-8")
+
+    def _recover(self):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            for kind, records in snapshot.items():
+                self._state[kind] = {record_id: record for record_id, record in records}
+        if os.path.exists(self.log_path):
+            valid = 0
+            with open(self.log_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    self._apply(entry)
+                    self._pending += 1
+                    valid += len(line)
+            # Обрізаємо обірваний останній рядок після аварійної зупинки,
+            # щоб нові записи не опинилися за ним
+            os.truncate(self.log_path, valid)
+
+    def _apply(self, entry: dict):
+        records = self._state.setdefault(entry["kind"], {})
+        if entry["op"] == "put":
+            records[entry["id"]] = entry["record"]
+        elif entry["op"] == "delete":
+            records.pop(entry["id"], None)
+        elif entry["op"] == "clear":
+            records.clear()
+
+    def _append(self, entry: dict):
+        with self._lock:
+            self._apply(entry)
+            self._log.write(json.dumps(entry) + "\n")
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            self._pending += 1
+            if self._pending >= self.snapshot_every:
+                self._snapshot()
+
+    def _snapshot(self):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({kind: list(records.items()) for kind, records in self._state.items()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._log.seek(0)
+        self._log.truncate()
+        self._pending = 0
+
+    def snapshot(self):
+        with self._lock:
+            self._snapshot()
+
+    def load(self, kind: str) -> Iterator[dict]:
+        return iter(list(self._state.get(kind, {}).values()))
+
+    def save(self, kind: str, record_id, record: dict):
+        self._append({"op": "put", "kind": kind, "id": record_id, "record": record})
+
+    def save_many(self, kind: str, records: Iterable[dict], key: str = "id"):
+        # Весь пакет пишеться під одним замком і скидається на диск один раз
+        with self._lock:
+            for record in records:
+                entry = {"op": "put", "kind": kind, "id": record[key], "record": record}
+                self._apply(entry)
+                self._log.write(json.dumps(entry) + "\n")
+                self._pending += 1
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            if self._pending >= self.snapshot_every:
+                self._snapshot()
+
+    def delete(self, kind: str, record_id):
+        self._append({"op": "delete", "kind": kind, "id": record_id})
+
+    def clear(self, kind: str):
+        self._append({"op": "clear", "kind": kind})
+
+    def close(self):
+        with self._lock:
+            self._log.close()
+
+
+class QueuedStorage(MemoryStorage):
+    # Неблокувальна обгортка над сховищем для асинхронних обробників.
+    # save/delete/clear лише ставлять зміну в чергу (з копією запису на момент виклику),
+    # а окремий потік записувача забирає все накопичене й пише послідовні збереження
+    # одного kind одним save_many - тобто одним комітом SQLite або одним скиданням журналу.
+    # Обробник відповідає клієнту після await sync(), тож цикл подій не чекає на диск,
+    # а одночасні запити отримують спільний груповий коміт.
+    # Якщо пакет не записався, пам'ять репозиторіїв розходиться з диском: решта черги
+    # відкидається, усі, хто чекає, і всі наступні зміни отримують StorageFailed, доки
+    # репозиторії не перечитають сховище (reload) і не буде викликано recover().
+    def __init__(self, storage: MemoryStorage):
+        self.storage = storage
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._queued = 0
+        self._written = 0
+        self._failed = None
+        self._waiters = []  # (номер зміни, цикл подій, future)
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+        self._writer.start()
+
+    def load(self, kind: str) -> Iterator[dict]:
+        return self.storage.load(kind)
+
+    def save(self, kind: str, record_id, record: dict):
+        self._enqueue(("save", kind, record_id, dict(record)))
+
+    def save_many(self, kind: str, records: Iterable[dict], key: str = "id"):
+        with self._condition:
+            self._check()
+            for record in records:
+                self._pending.append(("save", kind, record[key], dict(record)))
+                self._queued += 1
+            self._condition.notify()
+
+    def delete(self, kind: str, record_id):
+        self._enqueue(("delete", kind, record_id, None))
+
+    def clear(self, kind: str):
+        self._enqueue(("clear", kind, None, None))
+
+    def _enqueue(self, operation: tuple):
+        with self._condition:
+            self._check()
+            self._pending.append(operation)
+            self._queued += 1
+            self._condition.notify()
+
+    async def sync(self):
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            self._check()
+            if self._written >= self._queued:
+                return
+            future = loop.create_future()
+            self._waiters.append((self._queued, loop, future))
+        await future
+
+    def flush(self):
+        # Синхронне очікування запису всієї черги (для тестів і завершення роботи)
+        with self._condition:
+            self._condition.wait_for(lambda: self._written >= self._queued)
+            self._check()
+
+    def recover(self):
+        # Знову приймає зміни; викликається після того, як репозиторії перечитали сховище
+        with self._condition:
+            self._failed = None
+
+    def _check(self):
+        if self._failed is not None:
+            raise StorageFailed("Storage write failed, data is being reloaded") from self._failed
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+            error = None
+            try:
+                self._write(batch)
+            except Exception as e:
+                error = e
+            with self._condition:
+                self._written += len(batch)
+                if error is not None:
+                    # Зміни після невдалого пакета спиралися на пам'ять, якої немає на диску
+                    self._failed = error
+                    self._written += len(self._pending)
+                    self._pending.clear()
+                ready, waiting = [], []
+                for waiter in self._waiters:
+                    (ready if waiter[0] <= self._written else waiting).append(waiter)
+                self._waiters = waiting
+                self._condition.notify_all()
+            for _, loop, future in ready:
+                loop.call_soon_threadsafe(self._resolve, future, error)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, error):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            failure = StorageFailed("Storage write failed, data is being reloaded")
+            failure.__cause__ = error
+            future.set_exception(failure)
+
+    def _write(self, batch: list):
+        # Послідовні збереження одного kind об'єднуються в один save_many
+        run_kind, run = None, []
+        for op, kind, record_id, record in batch:
+            if run and (op != "save" or kind != run_kind):
+                self._save_run(run_kind, run)
+                run = []
+            if op == "save":
+                run_kind = kind
+                run.append((record_id, record))
+            elif op == "delete":
+                self.storage.delete(kind, record_id)
+            else:
+                self.storage.clear(kind)
+        if run:
+            self._save_run(run_kind, run)
+
+    def _save_run(self, kind: str, run: list):
+        if all(record.get("id") == record_id for record_id, record in run):
+            self.storage.save_many(kind, [record for _, record in run])
+        else:
+            for record_id, record in run:
+                self.storage.save(kind, record_id, record)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._writer.join()
+        self.storage.close()
+
+
+def open_storage(url: str, queued: bool = False, busy_timeout: float = 0.1) -> MemoryStorage:
+    # "memory", "sqlite:<шлях до файлу>", "log:<каталог>" або "shared:<шлях до файлу>";
+    # queued=True переносить запис на диск у фоновий потік (див. QueuedStorage),
+    # busy_timeout (с) - найдовше очікування на замок спільної бази.
+    # Спільне сховище ніколи не загортається в чергу: додавання та резервування мають
+    # дізнатися результат від бази ще до відповіді клієнту
+    scheme, _, location = url.partition(":")
+    if scheme == "memory":
+        return MemoryStorage()
+    if scheme == "shared":
+        return SharedSQLiteStorage(location, busy_timeout=busy_timeout)
+    if scheme == "sqlite":
+        storage = SQLiteStorage(location)
+    elif scheme == "log":
+        storage = LogStorage(location)
+    else:
+        raise ValueError(f"Unknown storage: {url}")
+    return QueuedStorage(storage) if queued else storage
@@ -1,6 +1,12 @@
+import os
+import sqlite3
+import tempfile
 import unittest
+from unittest import mock
 from fastapi.testclient import TestClient
-from src.main import app
+import json
+from src.main import app, books
+from src.storage import SharedSQLiteStorage
 
 # Ініціалізація клієнта для тестування FastAPI
 client = TestClient(app)
@@ -96,5 +102,70 @@ class TestBooks(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.json(), {"detail": "Book not found"})
 
+
+class TestBooksListing(unittest.TestCase):
+
+    def setUp(self):
+        books.clear()
+        for book_id in (5, 2, 9, 7):
+            books.append({"id": book_id, "title": f"Book {book_id}", "author": "Author",
+                          "price": 10.0, "quantity": 1, "description": None})
+
+    # Тест, що без параметрів повертаються всі книги в порядку додавання
+    def test_list_all_books(self):
+        response = client.get("/books/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([book["id"] for book in response.json()], [5, 2, 9, 7])
+
+    # Тест пагінації за ключем (limit/after_id)
+    def test_keyset_pagination(self):
+        page = client.get("/books/", params={"limit": 2}).json()
+        self.assertEqual([book["id"] for book in page], [2, 5])
+        page = client.get("/books/", params={"limit": 2, "after_id": page[-1]["id"]}).json()
+        self.assertEqual([book["id"] for book in page], [7, 9])
+        page = client.get("/books/", params={"limit": 2, "after_id": 9}).json()
+        self.assertEqual(page, [])
+
+    # Тест, що видалена книга зникає зі сторінок
+    def test_pagination_after_delete(self):
+        client.delete("/books/5")
+        page = client.get("/books/", params={"limit": 10, "after_id": 2}).json()
+        self.assertEqual([book["id"] for book in page], [7, 9])
+
+    # Тест потокової відповіді NDJSON
+    def test_ndjson_stream(self):
+        response = client.get("/books/", params={"limit": 3}, headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        lines = response.text.splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [2, 5, 7])
+
+
+class TestSharedStorageBusy(unittest.TestCase):
+
+    # Порожній каталог на спільній базі, яку тримає відкритою транзакцією інше з'єднання
+    def setUp(self):
+        books.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "shared.db")
+        self.storage = SharedSQLiteStorage(path, busy_timeout=0.05)
+        self.holder = sqlite3.connect(path, isolation_level=None)
+        self.holder.execute("BEGIN IMMEDIATE")
+
+    def tearDown(self):
+        self.holder.execute("ROLLBACK")
+        self.holder.close()
+        self.storage.close()
+        self.tmp.cleanup()
+
+    # Тест, що запит, якому спільна база не дісталася вчасно, отримує 503, а не чекає 5 с
+    def test_busy_storage_returns_503(self):
+        with mock.patch.object(books, "storage", self.storage):
+            response = client.post("/books/", json={
+                "id": 1, "title": "Book 1", "author": "Author", "price": 1.0, "quantity": 1})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "1")
+        self.assertNotIn(1, books)
+
+
 if __name__ == "__main__":
     unittest.main()
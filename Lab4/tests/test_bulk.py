@@ -0,0 +1,84 @@
+import json
+import unittest
+from fastapi.testclient import TestClient
+from src.main import app, books
+
+client = TestClient(app)
+
+
+def ndjson(*rows):
+    return "\n".join(json.dumps(row) for row in rows) + "\n"
+
+
+class TestBulkImportExport(unittest.TestCase):
+
+    def setUp(self):
+        books.clear()
+        books.append({"id": 1, "title": "Existing", "author": "Author", "price": 5.0,
+                      "quantity": 1, "description": None})
+
+    # Тест масового імпорту у форматі NDJSON
+    def test_import_ndjson(self):
+        body = ndjson(
+            {"id": 2, "title": "Book 2", "author": "Author B", "price": 12.5, "quantity": 3},
+            {"id": 3, "title": "Book 3", "author": "Author C", "price": 7.0, "quantity": 1,
+             "description": "Third"},
+        )
+        response = client.post("/books/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"message": "Books imported successfully", "count": 2})
+        self.assertEqual(client.get("/books/3").json()["description"], "Third")
+
+    # Тест масового імпорту у форматі CSV
+    def test_import_csv(self):
+        body = "id,title,author,price,quantity,description\n2,Book 2,Author B,12.5,3,\n3,\"Book, 3\",Author C,7,1,Third\n"
+        response = client.post("/books/bulk", content=body, headers={"Content-Type": "text/csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.get("/books/2").json(), {
+            "id": 2, "title": "Book 2", "author": "Author B", "price": 12.5, "quantity": 3, "description": None
+        })
+        self.assertEqual(client.get("/books/3").json()["title"], "Book, 3")
+
+    # Тест, що дублікат id відхиляє весь пакет
+    def test_import_duplicate_is_atomic(self):
+        body = ndjson(
+            {"id": 2, "title": "Book 2", "author": "Author B", "price": 12.5, "quantity": 3},
+            {"id": 1, "title": "Duplicate", "author": "Author", "price": 1.0, "quantity": 1},
+        )
+        response = client.post("/books/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(books), 1)
+        self.assertEqual(client.get("/books/2").status_code, 404)
+
+    # Тест, що помилка валідації повідомляє номер рядка
+    def test_import_validation_error(self):
+        body = ndjson(
+            {"id": 2, "title": "Book 2", "author": "Author B", "price": 12.5, "quantity": 3},
+            {"id": 3, "title": "Book 3", "author": "Author C", "price": "free", "quantity": 1},
+        )
+        response = client.post("/books/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["detail"][0]["line"], 2)
+        self.assertEqual(len(books), 1)
+
+    # Тест непідтримуваного формату
+    def test_import_unsupported_content_type(self):
+        response = client.post("/books/bulk", content="<books/>", headers={"Content-Type": "application/xml"})
+        self.assertEqual(response.status_code, 415)
+
+    # Тест потокового експорту, сумісного з імпортом
+    def test_export_round_trip(self):
+        books.append({"id": 2, "title": "Book, 2", "author": "Author B", "price": 12.5,
+                      "quantity": 3, "description": None})
+        exported = client.get("/books/export").text
+        self.assertEqual([json.loads(line)["id"] for line in exported.splitlines()], [1, 2])
+
+        exported_csv = client.get("/books/export", params={"format": "csv"}).text
+        books.clear()
+        response = client.post("/books/bulk", content=exported_csv, headers={"Content-Type": "text/csv"})
+        self.assertEqual(response.json()["count"], 2)
+        self.assertEqual(client.get("/books/2").json()["title"], "Book, 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import unittest
+from fastapi.testclient import TestClient
+from src.cache import IdempotencyCache, IdempotencyConflict, ResponseCache, etag_matches
+from src.main import app, books, idempotency_cache, orders, response_cache
+
+client = TestClient(app)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = ResponseCache(max_entries=2, ttl=10, clock=lambda: self.now)
+
+    # Тест витіснення найдавніше використаного запису
+    def test_lru_eviction(self):
+        self.cache.put("a", b"1", (), self.cache.version)
+        self.cache.put("b", b"2", (), self.cache.version)
+        self.cache.get("a")
+        self.cache.put("c", b"3", (), self.cache.version)
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    # Тест завершення часу життя запису
+    def test_ttl_expiry(self):
+        self.cache.put("a", b"1", (), self.cache.version)
+        self.now = 9.9
+        self.assertIsNotNone(self.cache.get("a"))
+        self.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "evictions": 0, "entries": 0})
+
+    # Тест, що скидання тегу видаляє лише позначені ним записи
+    def test_invalidate_by_tag(self):
+        self.cache.put("a", b"1", ("books", "book:1"), self.cache.version)
+        self.cache.put("b", b"2", ("orders",), self.cache.version)
+        self.cache.invalidate("book:1")
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("b"))
+
+    # Тест, що відповідь, обчислена до скидання, не потрапляє в кеш
+    def test_stale_put_is_dropped(self):
+        version = self.cache.version
+        self.cache.invalidate("books")
+        self.cache.put("a", b"1", ("books",), version)
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"x", W/"abc"', '"abc"'))
+        self.assertTrue(etag_matches("*", '"abc"'))
+        self.assertFalse(etag_matches('"x"', '"abc"'))
+        self.assertFalse(etag_matches(None, '"abc"'))
+
+
+class TestCachedEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        books.clear()
+        orders.clear()
+        response_cache.clear()
+        books.put({"id": 1, "title": "Book 1", "author": "Author", "price": 10.0, "quantity": 5,
+                   "description": None})
+
+    # Тест повторного читання з кешу та відповіді 304 на If-None-Match
+    def test_etag_not_modified(self):
+        first = client.get("/books/1")
+        etag = first.headers["etag"]
+        hits = response_cache.hits
+        second = client.get("/books/1", headers={"If-None-Match": etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers["etag"], etag)
+        self.assertEqual(response_cache.hits, hits + 1)
+
+    # Тест, що замовлення скидає кеш книги та списку книг
+    def test_order_invalidates_book(self):
+        etag = client.get("/books/1").headers["etag"]
+        client.get("/books/")
+        client.post("/orders/", json={"id": 1, "book_id": 1, "customer_id": 1, "quantity": 2})
+        response = client.get("/books/1", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["quantity"], 3)
+        self.assertEqual(client.get("/books/").json()[0]["quantity"], 3)
+
+    # Тест, що зміна статусу скидає списки старого та нового статусу
+    def test_status_change_invalidates_both_lists(self):
+        client.post("/orders/", json={"id": 1, "book_id": 1, "customer_id": 1, "quantity": 1})
+        self.assertEqual(len(client.get("/orders/status/Processing").json()["orders"]), 1)
+        self.assertEqual(client.get("/orders/status/Shipped").json()["orders"], [])
+        client.put("/orders/1", json={"id": 1, "book_id": 1, "customer_id": 1, "quantity": 1,
+                                      "status": "Shipped"})
+        self.assertEqual(client.get("/orders/status/Processing").json()["orders"], [])
+        self.assertEqual(len(client.get("/orders/status/Shipped").json()["orders"]), 1)
+
+    # Тест, що помилки не кешуються, а лічильники доступні через API
+    def test_missing_book_not_cached(self):
+        before = client.get("/cache/stats").json()
+        self.assertEqual(client.get("/books/2").status_code, 404)
+        client.post("/books/", json={"id": 2, "title": "Book 2", "author": "Author", "price": 5.0,
+                                     "quantity": 1})
+        self.assertEqual(client.get("/books/2").status_code, 200)
+        stats = client.get("/cache/stats").json()
+        self.assertEqual(stats["hits"], before["hits"])
+        self.assertEqual(stats["misses"], before["misses"] + 2)
+
+
+class TestIdempotencyCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = IdempotencyCache(max_entries=2, ttl=10, clock=lambda: self.now)
+
+    # Тест повтору, завершення строку та обсягу кешу
+    def test_replay_and_expiry(self):
+        self.assertIsNone(self.cache.get("k1", "f1"))
+        self.cache.put("k1", "f1", b"body")
+        self.assertEqual(self.cache.get("k1", "f1"), b"body")
+        self.assertEqual(self.cache.bytes, len("k1") + len("f1") + len(b"body"))
+        self.now = 10
+        self.assertIsNone(self.cache.get("k1", "f1"))
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 2, "conflicts": 0, "evictions": 0,
+                                              "entries": 0, "bytes": 0, "hit_rate": 1 / 3})
+
+    # Тест витіснення найстаршого ключа
+    def test_bounded_size(self):
+        for key in ("a", "b", "c"):
+            self.cache.put(key, "f", b"1")
+        self.assertIsNone(self.cache.get("a", "f"))
+        self.assertEqual(self.cache.get("c", "f"), b"1")
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(self.cache.bytes, 2 * 3)
+
+    # Тест, що ключ не можна використати для іншого запиту
+    def test_fingerprint_mismatch(self):
+        self.cache.put("k", "f1", b"1")
+        with self.assertRaises(IdempotencyConflict):
+            self.cache.get("k", "f2")
+
+
+class TestIdempotentOrders(unittest.TestCase):
+
+    def setUp(self):
+        books.clear()
+        orders.clear()
+        books.put({"id": 1, "title": "Book 1", "author": "Author", "price": 10.0, "quantity": 5,
+                   "description": None})
+        self.order = {"id": 1, "book_id": 1, "customer_id": 1, "quantity": 2}
+
+    # Тест, що повтор з тим самим ключем не зменшує залишок удруге
+    def test_retry_is_answered_from_cache(self):
+        headers = {"Idempotency-Key": "order-retry-1"}
+        first = client.post("/orders/", json=self.order, headers=headers)
+        hits = idempotency_cache.hits
+        second = client.post("/orders/", json=self.order, headers=headers)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers["idempotent-replayed"], "true")
+        self.assertEqual(books.get(1)["quantity"], 3)
+        self.assertEqual(idempotency_cache.hits, hits + 1)
+        self.assertGreater(client.get("/idempotency/stats").json()["bytes"], 0)
+
+    # Тест, що той самий ключ з іншим тілом відхиляється
+    def test_key_reuse_with_different_body(self):
+        headers = {"Idempotency-Key": "order-retry-2"}
+        client.post("/orders/", json=self.order, headers=headers)
+        response = client.post("/orders/", json=dict(self.order, quantity=1), headers=headers)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(books.get(1)["quantity"], 3)
+
+    # Тест, що відмова не запам'ятовується і повтор може вдатися пізніше
+    def test_failure_is_not_cached(self):
+        headers = {"Idempotency-Key": "order-retry-3"}
+        order = dict(self.order, quantity=10)
+        self.assertEqual(client.post("/orders/", json=order, headers=headers).status_code, 400)
+        books.update(1, quantity=20)
+        self.assertEqual(client.post("/orders/", json=order, headers=headers).status_code, 200)
+        self.assertEqual(books.get(1)["quantity"], 10)
+
+    # Тест, що повтор без ключа (або з ключем, який уже забуто) відхиляється за ID
+    # і не забирає книг удруге
+    def test_retry_without_key_is_rejected(self):
+        self.assertEqual(client.post("/orders/", json=self.order).status_code, 200)
+        for headers in ({}, {"Idempotency-Key": "order-retry-4"}):
+            response = client.post("/orders/", json=self.order, headers=headers)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()["detail"], "Order with this ID already exists")
+        self.assertEqual(books.get(1)["quantity"], 3)
+        self.assertEqual(len(orders), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
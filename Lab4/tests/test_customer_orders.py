@@ -96,5 +96,31 @@ class TestCustomerOrders(unittest.TestCase):
         self.assertEqual(data["orders"][0]["id"], 1)
         self.assertEqual(data["orders"][1]["id"], 2)
 
+    # Тест посторінкового отримання замовлень клієнта та фільтрації за статусом
+    def test_customer_orders_pagination(self):
+        for order_id in range(1, 4):
+            client.post("/orders/", json={
+                "id": order_id,
+                "book_id": 1,
+                "customer_id": 7,
+                "quantity": 1
+            })
+        client.put("/orders/2", json={"id": 2, "book_id": 1, "customer_id": 7, "quantity": 1, "status": "Shipped"})
+
+        data = client.get("/orders/customer/7", params={"limit": 2}).json()
+        self.assertEqual([order["id"] for order in data["orders"]], [1, 2])
+
+        data = client.get("/orders/customer/7", params={"limit": 2, "cursor": data["next_cursor"]}).json()
+        self.assertEqual([order["id"] for order in data["orders"]], [3])
+        self.assertIsNone(data["next_cursor"])
+
+        data = client.get("/orders/status/Processing").json()
+        self.assertEqual([order["id"] for order in data["orders"]], [1, 3])
+
+    # Тест, що клієнт без замовлень отримує 404
+    def test_customer_without_orders(self):
+        response = client.get("/orders/customer/999")
+        self.assertEqual(response.status_code, 404)
+
 if __name__ == "__main__":
     unittest.main()
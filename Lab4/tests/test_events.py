@@ -0,0 +1,129 @@
+import asyncio
+import json
+import unittest
+import httpx
+from src.events import EventBroker
+from src.main import app, books, order_events, orders
+
+
+def parse_events(data: bytes) -> list:
+    # Кадри SSE -> [(подія, дані)]; коментарі та службові кадри пропускаються
+    events = []
+    for frame in data.decode("utf-8").split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.split("\n") if ": " in line and line[0] != ":")
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestEventBroker(unittest.TestCase):
+
+    # Тест фільтра за статусом
+    def test_status_filter(self):
+        async def scenario():
+            broker = EventBroker()
+            everything, shipped = broker.subscribe(), broker.subscribe("Shipped")
+            broker.publish("order_created", {"id": 1}, "Processing")
+            broker.publish("order_status_changed", {"id": 1}, "Shipped")
+            return len(everything.pending), len(shipped.pending)
+        self.assertEqual(asyncio.run(scenario()), (2, 1))
+
+    # Тест, що клієнт, який не встигає читати, отримує overflow і від'єднується
+    def test_overflow_closes_stream(self):
+        async def scenario():
+            broker = EventBroker(max_pending=3)
+            subscription = broker.subscribe()
+            for order_id in range(5):
+                broker.publish("order_created", {"id": order_id}, "Processing")
+            chunks = [chunk async for chunk in broker.stream(subscription)]
+            return chunks, broker
+        chunks, broker = asyncio.run(scenario())
+        self.assertEqual(parse_events(b"".join(chunks)), [("overflow", {})])
+        self.assertEqual(broker.overflows, 1)
+        self.assertEqual(broker.subscribers, set())
+
+    # Тест відновлення пропущених подій за Last-Event-ID
+    def test_replay_after_reconnect(self):
+        async def scenario():
+            broker = EventBroker(history=3)
+            for order_id in range(5):
+                broker.publish("order_created", {"id": order_id}, "Processing")
+            replayed = broker.subscribe(last_event_id=3)
+            too_old = broker.subscribe(last_event_id=1)
+            return parse_events(b"".join(replayed.pending)), parse_events(b"".join(too_old.pending))
+        replayed, too_old = asyncio.run(scenario())
+        self.assertEqual([data["id"] for _, data in replayed], [3, 4])
+        self.assertEqual(too_old, [("reset", {})])
+
+
+class TestOrderEventStream(unittest.TestCase):
+
+    def setUp(self):
+        books.clear()
+        orders.clear()
+        books.put({"id": 1, "title": "Book 1", "author": "Author", "price": 10.0, "quantity": 10 ** 6,
+                   "description": None})
+
+    # Тест з тисячею одночасних підписників: кожен отримує створення замовлення
+    # та зміну статусу, а після від'єднання підписки знімаються
+    def test_many_subscribers(self):
+        subscribers = 1000
+
+        async def open_stream(query: str):
+            disconnected = asyncio.Event()
+            received = bytearray()
+            arrived = asyncio.Event()
+
+            async def receive():
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.body":
+                    received.extend(message.get("body", b""))
+                    arrived.set()
+
+            scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                     "scheme": "http", "path": "/orders/events", "raw_path": b"/orders/events",
+                     "query_string": query.encode(), "root_path": "", "headers": [],
+                     "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80)}
+            task = asyncio.create_task(app(scope, receive, send))
+            return task, disconnected, received, arrived
+
+        async def wait_for_events(received: bytearray, arrived: asyncio.Event, count: int):
+            while len(parse_events(bytes(received))) < count:
+                arrived.clear()
+                await arrived.wait()
+
+        async def scenario():
+            streams = [await open_stream("status=Shipped" if i % 2 else "") for i in range(subscribers)]
+            while len(order_events.subscribers) < subscribers:
+                await asyncio.sleep(0.01)
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                order = {"id": 1, "book_id": 1, "customer_id": 1, "quantity": 1}
+                self.assertEqual((await client.post("/orders/", json=order)).status_code, 200)
+                response = await client.put("/orders/1", json=dict(order, status="Shipped"))
+                self.assertEqual(response.status_code, 200)
+
+            await asyncio.wait_for(asyncio.gather(*(
+                wait_for_events(received, arrived, 1 if i % 2 else 2)
+                for i, (_, _, received, arrived) in enumerate(streams))), timeout=30)
+            results = [parse_events(bytes(received)) for _, _, received, _ in streams]
+
+            for _, disconnected, _, _ in streams:
+                disconnected.set()
+            await asyncio.wait_for(asyncio.gather(*(task for task, _, _, _ in streams)), timeout=30)
+            return results
+
+        results = asyncio.run(scenario())
+        self.assertEqual([event for event, _ in results[0]], ["order_created", "order_status_changed"])
+        self.assertEqual(results[0][1][1]["previous_status"], "Processing")
+        self.assertEqual(results[1], [("order_status_changed", results[0][1][1])])
+        self.assertTrue(all(result == results[i % 2] for i, result in enumerate(results)))
+        self.assertEqual(order_events.subscribers, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import time
+import unittest
+from fastapi.testclient import TestClient
+from src.main import app, books, metrics
+from src.metrics import SlowRequestProfiler
+
+client = TestClient(app)
+
+
+def busy_wait(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        books.clear()
+        books.put({"id": 1, "title": "Book 1", "author": "Author", "price": 10.0, "quantity": 5,
+                   "description": None})
+
+    # Тест, що запити враховуються за шаблоном маршруту разом з етапами обробки
+    def test_route_latency_and_stages(self):
+        before = metrics.requests["GET", "/books/{book_id}", 200]
+        client.get("/books/1")
+        client.get("/books/1")
+        self.assertEqual(metrics.requests["GET", "/books/{book_id}", 200], before + 2)
+        text = client.get("/metrics").text
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="/books/{book_id}",le="+Inf"}', text)
+        for stage in ("validation", "endpoint", "serialization"):
+            self.assertIn(f'http_request_stage_seconds_count{{route="/books/{{book_id}}",stage="{stage}"}}', text)
+
+    # Тест розмірів сховищ та формату відповіді
+    def test_store_sizes(self):
+        response = client.get("/metrics")
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn("bookstore_books 1\n", response.text)
+        self.assertIn("# TYPE bookstore_cache_hits_total counter", response.text)
+        self.assertIn("http_requests_in_flight 1\n", response.text)
+
+    # Тест перемикача профілювальника через API
+    def test_toggle_profiler(self):
+        response = client.post("/metrics/profiler", params={"enabled": True, "threshold_ms": 250})
+        self.assertEqual(response.json()["enabled"], True)
+        self.assertEqual(metrics.profiler.threshold, 0.25)
+        response = client.post("/metrics/profiler", params={"enabled": False})
+        self.assertEqual(response.json()["enabled"], False)
+
+
+class TestSlowRequestProfiler(unittest.TestCase):
+
+    # Тест, що знімки стеку з проміжку повільного запиту записуються у згорнутому форматі
+    def test_dump_folded_stacks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = SlowRequestProfiler(directory=tmp, interval=0.001)
+            profiler.start()
+            try:
+                started = time.perf_counter()
+                busy_wait(0.05)
+                finished = time.perf_counter()
+            finally:
+                profiler.stop()
+            path = profiler.dump("GET", "/books/{book_id}", started, finished)
+            self.assertEqual(os.path.basename(path).split("-", 1)[1], "GET_books_book_id.folded")
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertTrue(any("busy_wait (test_metrics.py" in line for line in lines))
+            self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from fastapi.testclient import TestClient
-from src.main import app
+from src.main import app, books, orders
 
 client = TestClient(app)
 
@@ -8,8 +8,8 @@ class TestOrders(unittest.TestCase):
 
     def setUp(self):
         # Очистити дані перед кожним тестом
-        client.delete("/books/")
-        client.delete("/orders/")
+        books.clear()
+        orders.clear()
 
     # Тест для перевірки успішного оформлення замовлення
     def test_successful_order(self):
@@ -82,6 +82,21 @@ class TestOrders(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.json(), {"detail": "Insufficient stock"})
 
+    # Тест, що замовлення з уже зайнятим ID відхиляється і не забирає книг
+    def test_duplicate_order_id_rejected(self):
+        client.post(
+            "/books/",
+            json={"id": 1, "title": "Book 1", "author": "Author A", "price": 10.0, "quantity": 5}
+        )
+        client.post("/orders/", json={"id": 6, "book_id": 1, "customer_id": 1, "quantity": 1})
+
+        response = client.post("/orders/", json={"id": 6, "book_id": 1, "customer_id": 2, "quantity": 2})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Order with this ID already exists"})
+        self.assertEqual(client.get("/books/1").json()["quantity"], 4)
+        self.assertEqual(client.get("/orders/6").json()["customer_id"], 1)
+        self.assertEqual(client.get("/stats").json()["units_sold"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
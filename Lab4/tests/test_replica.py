@@ -0,0 +1,149 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from src.replica import Replica
+from src.repository import BookRepository, InsufficientStock, Repository
+from src.storage import SharedSQLiteStorage
+
+
+def buy_until_sold_out(path: str) -> int:
+    # Окремий процес зі своєю копією купує по одній книзі, доки залишок не закінчиться
+    storage = SharedSQLiteStorage(path)
+    books = BookRepository(kind="books", storage=storage)
+    Replica(storage, [books]).load()
+    sold = 0
+    while True:
+        try:
+            books.reserve(1, 1)
+        except InsufficientStock:
+            break
+        sold += 1
+    storage.close()
+    return sold
+
+
+class TestReplica(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "shared.db")
+        self.workers = [self.start_worker() for _ in range(2)]
+
+    def tearDown(self):
+        for storage, _, _ in self.workers:
+            storage.close()
+        self.tmp.cleanup()
+
+    # Окремий "процес": власне з'єднання з базою, власні репозиторії та копія
+    def start_worker(self):
+        storage = SharedSQLiteStorage(self.path)
+        books = BookRepository(kind="books", storage=storage, ordered=True)
+        orders = Repository(indexes=("status",), kind="orders", storage=storage)
+        replica = Replica(storage, [books, orders])
+        replica.load()
+        return storage, books, replica
+
+    # Тест, що зміни одного процесу з'являються в іншому після refresh()
+    def test_refresh_applies_changes(self):
+        (_, books_a, _), (_, books_b, replica_b) = self.workers
+        books_a.add({"id": 1, "title": "Book 1", "quantity": 5})
+        books_a.add({"id": 2, "title": "Book 2", "quantity": 5})
+        self.assertNotIn(1, books_b)
+        self.assertEqual(replica_b.refresh(), 2)
+        self.assertEqual(books_b.get(1)["title"], "Book 1")
+        self.assertEqual([book["id"] for book in books_b.page()], [1, 2])
+
+        books_a.delete(1)
+        replica_b.refresh()
+        self.assertNotIn(1, books_b)
+        self.assertEqual(replica_b.refresh(), 0)
+
+    # Тест, що слухачі копії (наприклад, кеш відповідей) дізнаються про чужі зміни,
+    # а власні зміни, повернуті з журналу, не викликають їх вдруге
+    def test_listeners_see_remote_changes_once(self):
+        (_, books_a, replica_a), (_, books_b, replica_b) = self.workers
+        events_a, events_b = [], []
+        books_a.subscribe(lambda book_id, old, new: events_a.append(book_id))
+        books_b.subscribe(lambda book_id, old, new: events_b.append(book_id))
+        books_a.add({"id": 1, "title": "Book 1", "quantity": 5})
+        replica_a.refresh()
+        replica_b.refresh()
+        self.assertEqual(events_a, [1])
+        self.assertEqual(events_b, [1])
+
+    # Тест, що журнал не програє власні проміжні стани: резерв із поверненням
+    # і чужий PUT між двома своїми не будять слухачів і не відкочують пам'ять
+    def test_refresh_skips_own_intermediate_states(self):
+        (_, books_a, replica_a), (_, books_b, _) = self.workers
+        books_a.add({"id": 1, "title": "Shipped", "quantity": 3})
+        replica_a.refresh()
+        events = []
+        books_a.subscribe(lambda book_id, old, new: events.append(new))
+        books_a.reserve(1, 2)
+        books_a.release(1, 2)
+        books_b.put({"id": 1, "title": "Processing", "quantity": 3})
+        books_a.put({"id": 1, "title": "Shipped", "quantity": 3})
+        del events[:]
+        self.assertEqual(replica_a.refresh(), 4)
+        self.assertEqual(events, [])
+        self.assertEqual(books_a.get(1)["title"], "Shipped")
+
+        books_b.put({"id": 1, "title": "Delivered", "quantity": 3})
+        replica_a.refresh()
+        self.assertEqual(events, [{"id": 1, "title": "Delivered", "quantity": 3}])
+
+    # Тест, що id, зайнятий в іншому процесі, не можна додати, навіть якщо копія ще не оновилася
+    def test_add_checks_shared_storage(self):
+        (_, books_a, _), (_, books_b, _) = self.workers
+        self.assertTrue(books_a.add({"id": 1, "title": "Book 1", "quantity": 5}))
+        self.assertFalse(books_b.add({"id": 1, "title": "Other", "quantity": 1}))
+        self.assertEqual(books_b.add_many([{"id": 2, "quantity": 1}, {"id": 1, "quantity": 1}]), [1])
+        self.assertNotIn(2, books_b)
+
+    # Тест, що резервування з застарілою копією спирається на залишок у базі
+    def test_reserve_with_stale_replica(self):
+        (_, books_a, replica_a), (_, books_b, replica_b) = self.workers
+        books_a.add({"id": 1, "title": "Book 1", "quantity": 3})
+        replica_b.refresh()
+        books_a.reserve(1, 2)
+        self.assertEqual(books_b.get(1)["quantity"], 3)
+        with self.assertRaises(InsufficientStock):
+            books_b.reserve(1, 2)
+        self.assertEqual(books_b.reserve(1, 1)["quantity"], 0)
+        replica_a.refresh()
+        self.assertEqual(books_a.get(1)["quantity"], 0)
+
+    # Тест повернення резерву на склад через спільне сховище
+    def test_release_returns_stock(self):
+        (storage_a, books_a, _), _ = self.workers
+        books_a.add({"id": 1, "title": "Book 1", "quantity": 3})
+        books_a.reserve(1, 2)
+        books_a.release(1, 2)
+        self.assertEqual(storage_a.fetch("books", 1)["quantity"], 3)
+        self.assertIsNone(books_a.release(99, 1))
+
+    # Тест, що копія, яка відстала більше, ніж зберігає журнал, перечитується повністю
+    def test_reload_after_prune(self):
+        (storage_a, books_a, _), (_, books_b, replica_b) = self.workers
+        for book_id in range(5):
+            books_a.add({"id": book_id, "quantity": 1})
+        books_a.delete(0)
+        storage_a.prune(keep=2)
+        replica_b.refresh()
+        self.assertEqual(replica_b.reloads, 1)
+        self.assertEqual([book["id"] for book in books_b], [1, 2, 3, 4])
+
+    # Тест, що кілька процесів разом не продають більше, ніж є на складі
+    def test_processes_never_oversell(self):
+        _, books, _ = self.workers[0]
+        books.add({"id": 1, "title": "Book 1", "quantity": 200})
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(4) as pool:
+            sold = pool.map(buy_until_sold_out, [self.path] * 4)
+        self.assertEqual(sum(sold), 200)
+        self.assertEqual(self.workers[0][0].fetch("books", 1)["quantity"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import random
+import unittest
+from src.repository import Repository
+from src.sortedkeys import SortedKeys
+
+
+class TestRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = Repository()
+        self.repo.put({"id": 1, "title": "Book 1"})
+        self.repo.put({"id": 2, "title": "Book 2"})
+
+    # Тест пошуку запису за первинним ключем
+    def test_get_by_id(self):
+        self.assertEqual(self.repo.get(2)["title"], "Book 2")
+        self.assertIsNone(self.repo.get(999))
+
+    # Тест, що add не перезаписує існуючий запис
+    def test_add_duplicate_id(self):
+        self.assertFalse(self.repo.add({"id": 1, "title": "Duplicate"}))
+        self.assertEqual(self.repo.get(1)["title"], "Book 1")
+        self.assertTrue(self.repo.add({"id": 3, "title": "Book 3"}))
+
+    # Тест видалення запису
+    def test_delete(self):
+        self.assertTrue(self.repo.delete(1))
+        self.assertFalse(self.repo.delete(1))
+        self.assertNotIn(1, self.repo)
+        self.assertEqual(len(self.repo), 1)
+
+    # Тест, що ітерація зберігає порядок вставки, а заміна - позицію запису
+    def test_iteration_order(self):
+        self.repo.append({"id": 0, "title": "Book 0"})
+        self.repo.put({"id": 1, "title": "Updated"})
+        self.assertEqual([r["id"] for r in self.repo], [1, 2, 0])
+        self.assertEqual(self.repo.get(1)["title"], "Updated")
+
+    # Тест оновлення окремих полів
+    def test_update_fields(self):
+        record = self.repo.update(2, title="Renamed")
+        self.assertEqual(record["title"], "Renamed")
+        self.assertIsNone(self.repo.update(999, title="Nope"))
+
+    # Тест, що слухачі отримують старий і новий стан кожної зміни
+    def test_listeners_receive_changes(self):
+        changes = []
+        self.repo.subscribe(lambda record_id, old, new: changes.append((record_id, old, new)))
+        self.repo.add({"id": 3, "title": "Book 3"})
+        self.repo.update(1, title="Renamed")
+        self.repo.delete(2)
+        self.repo.clear()
+        self.assertEqual(changes, [
+            (3, None, {"id": 3, "title": "Book 3"}),
+            (1, {"id": 1, "title": "Book 1"}, {"id": 1, "title": "Renamed"}),
+            (2, {"id": 2, "title": "Book 2"}, None),
+            (None, None, None),
+        ])
+
+
+class TestOrderedPages(unittest.TestCase):
+
+    # Тест, що сторінки за ключем враховують поодинокі та пакетні вставки
+    def test_page_after_add_many(self):
+        repo = Repository(ordered=True)
+        repo.put({"id": 10})
+        self.assertEqual(repo.add_many([{"id": 3}, {"id": 12}, {"id": 1}]), [])
+        self.assertEqual(repo.add_many([{"id": 4}, {"id": 10}]), [10])
+        repo.delete(3)
+        self.assertEqual([r["id"] for r in repo.page(limit=2)], [1, 10])
+        self.assertEqual([r["id"] for r in repo.page(after=1)], [10, 12])
+        self.assertIsNone(repo.get(4))
+
+
+class TestSortedKeys(unittest.TestCase):
+
+    # Тест, що після випадкових вставок, видалень і пакетних додавань набір
+    # збігається зі звичайним відсортованим списком (мала load, щоб частини ділилися й зливалися)
+    def test_matches_sorted_list(self):
+        rng = random.Random(3)
+        keys, expected = SortedKeys(load=4), set()
+        for _ in range(3000):
+            key = rng.randrange(500)
+            action = rng.random()
+            if action < 0.5 and key not in expected:
+                keys.add(key)
+                expected.add(key)
+            elif action < 0.95 and key in expected:
+                keys.remove(key)
+                expected.discard(key)
+            elif action >= 0.95:
+                batch = [k for k in rng.sample(range(500), 10) if k not in expected]
+                keys.update(batch)
+                expected.update(batch)
+        ordered = sorted(expected)
+        self.assertEqual(list(keys), ordered)
+        self.assertEqual(len(keys), len(ordered))
+        self.assertTrue(all(len(part) <= 8 for part in keys._lists))
+        for after in (None, -1, 0, 137, 250, 499, 500):
+            start = [k for k in ordered if after is None or k > after]
+            self.assertEqual(keys.after(after, 7), start[:7])
+            self.assertEqual(keys.after(after), start)
+        self.assertEqual(137 in keys, 137 in expected)
+        with self.assertRaises(KeyError):
+            keys.remove(1000)
+
+
+class TestSecondaryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = Repository(indexes=("customer_id", "status"))
+        for order_id in range(1, 6):
+            self.repo.put({"id": order_id, "customer_id": order_id % 2, "status": "Processing"})
+
+    # Тест вибірки за вторинним індексом у порядку вставки
+    def test_find_by_index(self):
+        records, next_cursor = self.repo.find("customer_id", 1)
+        self.assertEqual([r["id"] for r in records], [1, 3, 5])
+        self.assertIsNone(next_cursor)
+        self.assertEqual(self.repo.count("customer_id", 0), 2)
+
+    # Тест, що зміна статусу переносить запис між індексами
+    def test_update_moves_between_buckets(self):
+        self.repo.update(3, status="Shipped")
+        processing, _ = self.repo.find("status", "Processing")
+        shipped, _ = self.repo.find("status", "Shipped")
+        self.assertEqual([r["id"] for r in processing], [1, 2, 4, 5])
+        self.assertEqual([r["id"] for r in shipped], [3])
+
+    # Тест, що видалення та заміна запису оновлюють індекси
+    def test_delete_and_replace_update_indexes(self):
+        self.repo.delete(2)
+        self.repo.put({"id": 4, "customer_id": 1, "status": "Completed"})
+        self.assertEqual(self.repo.count("customer_id", 0), 0)
+        records, _ = self.repo.find("customer_id", 1)
+        self.assertEqual([r["id"] for r in records], [1, 3, 4, 5])
+        self.assertEqual(self.repo.count("status", "Completed"), 1)
+
+    # Тест курсорної пагінації
+    def test_find_pagination(self):
+        page, cursor = self.repo.find("status", "Processing", limit=2)
+        self.assertEqual([r["id"] for r in page], [1, 2])
+        page, cursor = self.repo.find("status", "Processing", after=cursor, limit=2)
+        self.assertEqual([r["id"] for r in page], [3, 4])
+        page, cursor = self.repo.find("status", "Processing", after=cursor, limit=2)
+        self.assertEqual([r["id"] for r in page], [5])
+        self.assertIsNone(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
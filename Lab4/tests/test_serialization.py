@@ -0,0 +1,67 @@
+import unittest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from src.main import app, books, orders
+from src.serialization import FastJSONResponse, dumps
+
+client = TestClient(app)
+
+
+class TestSerialization(unittest.TestCase):
+
+    # Тест, що швидкий кодувальник дає ті самі байти, що й JSONResponse
+    def test_dumps_matches_json_response(self):
+        content = {"id": 1, "title": "Кобзар", "price": 10.5, "description": None, "tags": [1, 2]}
+        self.assertEqual(dumps(content), JSONResponse(content).body)
+
+    # Тест, що байти вважаються вже закодованим JSON
+    def test_response_passes_bytes_through(self):
+        response = FastJSONResponse(b'{"id":1}')
+        self.assertEqual(response.body, b'{"id":1}')
+        self.assertEqual(response.headers["content-type"], "application/json")
+
+    # Тест, що цілі ширші за 64 біти кодуються стандартним json, а не падають
+    def test_dumps_wide_int(self):
+        self.assertEqual(dumps({"id": 2 ** 70}), b'{"id":1180591620717411303424}')
+
+
+class TestFastResponses(unittest.TestCase):
+
+    def setUp(self):
+        books.clear()
+        orders.clear()
+        books.append({"id": 1, "title": "Book 1", "author": "Author 1", "price": 10.0, "quantity": 5})
+
+    # Тест, що відповідь на створення містить усі поля моделі, включно зі значеннями за замовчуванням
+    def test_created_records_include_defaults(self):
+        response = client.post("/books/", json={"id": 2, "title": "Book 2", "author": "Author 2",
+                                                "price": 12.5, "quantity": 1})
+        self.assertEqual(response.json(), {"id": 2, "title": "Book 2", "author": "Author 2", "price": 12.5,
+                                           "quantity": 1, "description": None})
+        response = client.post("/orders/", json={"id": 1, "book_id": 1, "customer_id": 7, "quantity": 2})
+        self.assertEqual(response.json(), {"id": 1, "book_id": 1, "customer_id": 7, "quantity": 2,
+                                           "status": "Processing"})
+
+    # Тест, що відповідь фіксує стан запису на момент обробки запиту
+    def test_response_is_snapshot_of_record(self):
+        client.post("/orders/", json={"id": 1, "book_id": 1, "customer_id": 7, "quantity": 1})
+        response = client.put("/orders/1", json={"id": 1, "book_id": 1, "customer_id": 7, "quantity": 1,
+                                                 "status": "Shipped"})
+        orders.update(1, status="Completed")
+        self.assertEqual(response.json()["status"], "Shipped")
+        self.assertEqual(client.get("/orders/1").json()["status"], "Completed")
+
+    # Тест, що id поза діапазоном int64 відхиляється валідацією і не ламає список книг
+    def test_out_of_range_ids_rejected(self):
+        response = client.post("/books/", json={"id": 2 ** 70, "title": "Big", "author": "Author",
+                                                "price": 1.0, "quantity": 1})
+        self.assertEqual(response.status_code, 422)
+        response = client.post("/orders/", json={"id": 2 ** 63, "book_id": 1, "customer_id": 7, "quantity": 1})
+        self.assertEqual(response.status_code, 422)
+        response = client.get("/books/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([book["id"] for book in response.json()], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import random
+import unittest
+from fastapi.testclient import TestClient
+from src.main import app, books, orders
+from src.repository import BookRepository, InsufficientStock, Repository
+from src.stats import InventoryStats, RankedHeap
+
+client = TestClient(app)
+
+
+class TestRankedHeap(unittest.TestCase):
+
+    # Тест, що застарілі та повторні пари не потрапляють у результат, а купа стискається
+    def test_lazy_updates(self):
+        heap = RankedHeap()
+        for item_id in range(100):
+            heap.set(item_id, 100 - item_id)
+        heap.set(5, 3)
+        heap.set(5, 95)
+        heap.discard(99)
+        for _ in range(1000):
+            heap.set(0, 50)
+            heap.set(0, 100)
+        self.assertEqual(heap.smallest(3), [(2, 98), (3, 97), (4, 96)])
+        self.assertEqual(heap.smallest(max_key=5), [(2, 98), (3, 97), (4, 96), (5, 95)])
+        self.assertEqual([item_id for _, item_id in heap.smallest()].count(5), 1)
+        self.assertEqual(len(heap), 99)
+        self.assertLessEqual(len(heap._heap), 2 * len(heap) + 64)
+
+
+class TestInventoryStats(unittest.TestCase):
+
+    def setUp(self):
+        self.books = BookRepository(kind="books", ordered=True)
+        self.orders = Repository(indexes=("status",), kind="orders")
+        self.stats = InventoryStats(self.books, self.orders)
+
+    # Тест, що агрегати після випадкових змін збігаються з повним переглядом
+    def test_matches_full_scan(self):
+        rng = random.Random(7)
+        for book_id in range(50):
+            self.books.add({"id": book_id, "title": f"Book {book_id}", "price": rng.choice([9.99, 12.5, 0.1]),
+                            "quantity": rng.randint(0, 20)})
+        for order_id in range(300):
+            book_id = rng.randrange(60)
+            action = rng.random()
+            if action < 0.6:
+                try:
+                    self.books.reserve(book_id, 1)
+                except (InsufficientStock, LookupError):
+                    continue
+                self.orders.put({"id": order_id, "book_id": book_id, "quantity": 1, "status": "Processing"})
+            elif action < 0.8 and book_id in self.books:
+                self.books.update(book_id, price=rng.choice([5.05, 7.0]), quantity=rng.randint(0, 20))
+            elif action < 0.9:
+                self.books.delete(book_id)
+            else:
+                self.books.put({"id": book_id, "title": f"Book {book_id}", "price": 3.3, "quantity": 2})
+
+        summary = self.stats.summary(threshold=3)
+        all_books = list(self.books)
+        self.assertEqual(summary["titles"], len(all_books))
+        self.assertEqual(summary["inventory_value"],
+                         sum(round(book["price"] * 100) * book["quantity"] for book in all_books) / 100)
+        self.assertEqual(summary["low_stock_titles"], sum(book["quantity"] <= 3 for book in all_books))
+        self.assertEqual(summary["units_sold"], len(self.orders))
+        lowest = sorted((book["quantity"], book["id"]) for book in all_books)[:5]
+        self.assertEqual([(row["quantity"], row["id"]) for row in self.stats.low_stock(5)], lowest)
+        for book_id in range(60):
+            self.assertEqual(self.stats.sold(book_id),
+                             sum(order["quantity"] for order in self.orders if order["book_id"] == book_id))
+
+    # Тест, що зміна статусу замовлення не рахується як продаж, а очищення скидає продажі
+    def test_sales(self):
+        for book_id, sold in ((1, 2), (2, 5), (3, 1)):
+            self.books.add({"id": book_id, "title": f"Book {book_id}", "price": 1.0, "quantity": 10})
+            self.orders.put({"id": book_id, "book_id": book_id, "quantity": sold, "status": "Processing"})
+        self.orders.update(2, status="Shipped")
+        self.assertEqual([row["book_id"] for row in self.stats.top_sellers(2)], [2, 1])
+        self.assertEqual(self.stats.top_sellers(1)[0]["units_sold"], 5)
+        self.orders.clear()
+        self.assertEqual(self.stats.top_sellers(10), [])
+        self.assertEqual(self.stats.summary(0)["units_sold"], 0)
+
+    # Тест порогу низького залишку
+    def test_low_stock_threshold(self):
+        for book_id, quantity in ((1, 0), (2, 4), (3, 9)):
+            self.books.add({"id": book_id, "title": f"Book {book_id}", "price": 1.0, "quantity": quantity})
+        self.assertEqual([row["id"] for row in self.stats.low_stock(10, threshold=4)], [1, 2])
+        self.books.reserve(3, 6)
+        self.assertEqual([row["id"] for row in self.stats.low_stock(10, threshold=4)], [1, 3, 2])
+
+
+class TestStatsEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        books.clear()
+        orders.clear()
+        for book_id, quantity in ((1, 3), (2, 10)):
+            books.put({"id": book_id, "title": f"Book {book_id}", "author": "Author", "price": 2.5,
+                       "quantity": quantity, "description": None})
+
+    def test_stats_follow_orders(self):
+        client.post("/orders/", json={"id": 1, "book_id": 2, "customer_id": 1, "quantity": 8})
+        stats = client.get("/stats", params={"threshold": 3}).json()
+        self.assertEqual(stats, {"titles": 2, "units_in_stock": 5, "inventory_value": 12.5, "units_sold": 8,
+                                 "low_stock_titles": 2})
+        self.assertEqual(client.get("/stats/low-stock", params={"limit": 1}).json(),
+                         [{"id": 2, "title": "Book 2", "quantity": 2}])
+        self.assertEqual(client.get("/stats/sales").json(), [{"book_id": 2, "title": "Book 2", "units_sold": 8}])
+        self.assertEqual(client.get("/stats/sales/1").json(), {"book_id": 1, "units_sold": 0})
+
+    # Тест, що нескінченні ціни та NaN відхиляються до того, як потрапити в агрегати
+    def test_non_finite_price_rejected(self):
+        book = {"id": 3, "title": "Book 3", "author": "Author", "quantity": 1}
+        for price in ("Infinity", "-Infinity", "NaN"):
+            body = json.dumps(book)[:-1] + f', "price": {price}}}'
+            response = client.post("/books/", content=body, headers={"Content-Type": "application/json"})
+            self.assertEqual(response.status_code, 422)
+            response = client.put("/books/1", content=body.replace('"id": 3', '"id": 1'),
+                                  headers={"Content-Type": "application/json"})
+            self.assertEqual(response.status_code, 422)
+        response = client.post("/books/bulk", content="id,title,author,price,quantity\n3,Book 3,Author,inf,1\n",
+                               headers={"Content-Type": "text/csv"})
+        self.assertEqual(response.status_code, 422)
+        self.assertNotIn(3, books)
+        self.assertEqual(client.get("/stats").json()["inventory_value"], 32.5)
+        self.assertEqual(client.delete("/books/1").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from src.main import app, books, orders
+from src.repository import BookRepository, InsufficientStock
+from src.storage import MemoryStorage, StorageBusy
+
+client = TestClient(app)
+
+
+class TestStockReservation(unittest.TestCase):
+
+    def setUp(self):
+        # Часте перемикання потоків, щоб гонки проявлялися, якщо резервування не атомарне
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    # Стрес-тест: багато потоків резервують одну книгу, залишок не стає від'ємним
+    def test_concurrent_reservations_never_oversell(self):
+        repo = BookRepository()
+        repo.put({"id": 1, "quantity": 100})
+        sold = []
+        start = threading.Barrier(16)
+
+        def worker():
+            start.wait()
+            for _ in range(50):
+                try:
+                    repo.reserve(1, 1)
+                    sold.append(1)
+                except InsufficientStock:
+                    pass
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(sold), 100)
+        self.assertEqual(repo.get(1)["quantity"], 0)
+
+    # Паралельні замовлення через API продають рівно стільки, скільки є на складі
+    def test_concurrent_orders_via_api(self):
+        books.clear()
+        orders.clear()
+        books.append({"id": 1, "title": "Hot Book", "author": "Author", "price": 10.0, "quantity": 20})
+
+        def place(order_id):
+            return client.post("/orders/", json={
+                "id": order_id, "book_id": 1, "customer_id": order_id, "quantity": 1
+            }).status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(place, range(1, 41)))
+
+        self.assertEqual(statuses.count(200), 20)
+        self.assertEqual(statuses.count(400), 20)
+        self.assertEqual(books.get(1)["quantity"], 0)
+        self.assertEqual(len(orders), 20)
+
+    # Тест, що залишок у пам'яті не змінюється, якщо сховище відмовило у записі резерву
+    def test_failed_save_keeps_quantity(self):
+        class BusyStorage(MemoryStorage):
+            def save(self, kind, record_id, record):
+                raise StorageBusy("Storage is busy, retry later")
+
+        repo = BookRepository()
+        repo.put({"id": 1, "quantity": 5})
+        repo.storage = BusyStorage()
+        with self.assertRaises(StorageBusy):
+            repo.reserve(1, 2)
+        self.assertEqual(repo.get(1)["quantity"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from src.repository import BookRepository, Repository
+from src.storage import LogStorage, MemoryStorage, QueuedStorage, SharedSQLiteStorage, SQLiteStorage, StorageBusy, StorageFailed, open_storage
+
+
+class StorageTestMixin:
+    # Спільні тести для всіх довговічних сховищ
+
+    def reopen(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = self.reopen()
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def restart(self):
+        self.storage.close()
+        self.storage = self.reopen()
+
+    # Тест, що книги та замовлення переживають перезапуск
+    def test_records_survive_restart(self):
+        books = BookRepository(kind="books", storage=self.storage)
+        books.put({"id": 1, "title": "Book 1", "quantity": 5})
+        books.put({"id": 2, "title": "Book 2", "quantity": 3})
+        books.reserve(1, 2)
+        books.delete(2)
+        orders = Repository(indexes=("status",), kind="orders", storage=self.storage)
+        orders.put({"id": 10, "status": "Processing"})
+        orders.update(10, status="Shipped")
+
+        self.restart()
+        books = BookRepository(kind="books", storage=self.storage)
+        books.load()
+        orders = Repository(indexes=("status",), kind="orders", storage=self.storage)
+        orders.load()
+
+        self.assertEqual(list(books), [{"id": 1, "title": "Book 1", "quantity": 3}])
+        self.assertEqual(orders.count("status", "Shipped"), 1)
+        self.assertEqual(orders.count("status", "Processing"), 0)
+
+    # Тест, що оновлення не змінює порядок записів після відновлення
+    def test_load_keeps_insertion_order(self):
+        repo = Repository(kind="books", storage=self.storage)
+        for record_id in (3, 1, 2):
+            repo.put({"id": record_id, "version": 1})
+        repo.put({"id": 3, "version": 2})
+
+        self.restart()
+        repo = Repository(kind="books", storage=self.storage)
+        repo.load()
+        self.assertEqual([r["id"] for r in repo], [3, 1, 2])
+        self.assertEqual(repo.get(3)["version"], 2)
+
+    # Тест очищення
+    def test_clear(self):
+        repo = Repository(kind="books", storage=self.storage)
+        repo.put({"id": 1})
+        repo.clear()
+        self.restart()
+        self.assertEqual(list(self.storage.load("books")), [])
+
+
+class TestSQLiteStorage(StorageTestMixin, unittest.TestCase):
+
+    def reopen(self):
+        return SQLiteStorage(os.path.join(self.tmp.name, "bookstore.db"))
+
+    # Тест, що база працює в режимі WAL
+    def test_wal_mode(self):
+        with self.storage._connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+
+class TestLogStorage(StorageTestMixin, unittest.TestCase):
+
+    def reopen(self):
+        return LogStorage(self.tmp.name, snapshot_every=3)
+
+    # Тест, що після знімка журнал містить лише хвіст змін
+    def test_snapshot_truncates_log(self):
+        repo = Repository(kind="books", storage=self.storage)
+        for record_id in range(4):
+            repo.put({"id": record_id})
+
+        with open(self.storage.log_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        self.restart()
+        self.assertEqual([r["id"] for r in self.storage.load("books")], [0, 1, 2, 3])
+
+    # Тест, що обірваний останній рядок журналу не ламає відновлення
+    def test_recovery_ignores_torn_tail(self):
+        Repository(kind="books", storage=self.storage).put({"id": 1})
+        self.storage.close()
+        with open(self.storage.log_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "ki')
+        self.storage = self.reopen()
+        Repository(kind="books", storage=self.storage).put({"id": 2})
+        self.restart()
+        self.assertEqual([r["id"] for r in self.storage.load("books")], [1, 2])
+
+
+class TestQueuedStorage(StorageTestMixin, unittest.TestCase):
+
+    def reopen(self):
+        return QueuedStorage(SQLiteStorage(os.path.join(self.tmp.name, "books.db")))
+
+    # Тест, що sync() чекає на запис усіх змін, а зміни, що накопичилися за час
+    # попереднього запису, пишуться одним пакетом
+    def test_sync_waits_for_group_commit(self):
+        calls = []
+        started, gate = threading.Event(), threading.Event()
+
+        class SlowStorage(MemoryStorage):
+            def save_many(self, kind, records, key="id"):
+                started.set()
+                gate.wait()
+                calls.append([record[key] for record in records])
+
+        storage = QueuedStorage(SlowStorage())
+        storage.save("books", 0, {"id": 0})
+        started.wait()
+        for record_id in (1, 2, 3):
+            storage.save("books", record_id, {"id": record_id})
+        gate.set()
+        asyncio.run(storage.sync())
+        self.assertEqual(calls, [[0], [1, 2, 3]])
+        storage.close()
+
+    # Тест, що після невдалого запису сховище відхиляє зміни (пам'ять лишається незмінною),
+    # доки репозиторій не перечитає диск і не буде викликано recover()
+    def test_writer_failure_blocks_writes_until_recover(self):
+        failing = threading.Event()
+
+        class FlakyStorage(SQLiteStorage):
+            def save_many(self, kind, records, key="id"):
+                if failing.is_set():
+                    raise sqlite3.OperationalError("disk I/O error")
+                super().save_many(kind, records, key=key)
+
+        self.storage.close()
+        self.storage = QueuedStorage(FlakyStorage(os.path.join(self.tmp.name, "books.db")))
+        repo = Repository(kind="books", storage=self.storage)
+        repo.put({"id": 1, "quantity": 5})
+        self.storage.flush()
+
+        failing.set()
+        repo.put({"id": 1, "quantity": 4})
+        with self.assertRaises(StorageFailed):
+            asyncio.run(self.storage.sync())
+        with self.assertRaises(StorageFailed):
+            repo.put({"id": 2, "quantity": 1})
+        self.assertNotIn(2, repo)
+
+        failing.clear()
+        repo.reload()
+        self.storage.recover()
+        self.assertEqual(repo.get(1), {"id": 1, "quantity": 5})
+        repo.put({"id": 2, "quantity": 1})
+        asyncio.run(self.storage.sync())
+        self.restart()
+        self.assertEqual([r["id"] for r in self.storage.load("books")], [1, 2])
+
+    # Тест, що збережений запис - це копія на момент виклику
+    def test_save_copies_record(self):
+        repo = Repository(kind="books", storage=self.storage)
+        record = {"id": 1, "quantity": 5}
+        repo.put(record)
+        self.storage.flush()
+        record["quantity"] = 0
+        self.restart()
+        self.assertEqual(list(self.storage.load("books")), [{"id": 1, "quantity": 5}])
+
+
+class TestSharedSQLiteStorage(StorageTestMixin, unittest.TestCase):
+
+    def reopen(self):
+        return SharedSQLiteStorage(os.path.join(self.tmp.name, "shared.db"))
+
+    # Тест, що додавання не перезаписує вже наявний запис
+    def test_insert_keeps_existing_record(self):
+        self.assertTrue(self.storage.insert("books", 1, {"id": 1, "title": "First"}))
+        self.assertFalse(self.storage.insert("books", 1, {"id": 1, "title": "Second"}))
+        self.assertEqual(self.storage.fetch("books", 1)["title"], "First")
+
+    # Тест, що пакет із зайнятим id не додає жодного запису
+    def test_insert_many_is_all_or_nothing(self):
+        self.storage.insert("books", 2, {"id": 2})
+        conflicts = self.storage.insert_many("books", [{"id": 1}, {"id": 2}, {"id": 3}])
+        self.assertEqual(conflicts, [2])
+        self.assertIsNone(self.storage.fetch("books", 1))
+        self.assertEqual(self.storage.insert_many("books", [{"id": 1}, {"id": 3}]), [])
+
+    # Тест умовного зменшення залишку
+    def test_decrement_requires_enough_stock(self):
+        self.storage.insert("books", 1, {"id": 1, "quantity": 3})
+        self.assertEqual(self.storage.decrement("books", 1, "quantity", 2), {"id": 1, "quantity": 1})
+        self.assertIsNone(self.storage.decrement("books", 1, "quantity", 2))
+        self.assertIsNone(self.storage.decrement("books", 99, "quantity", 1))
+        self.assertEqual(self.storage.fetch("books", 1)["quantity"], 1)
+
+    # Тест журналу змін: збереження, видалення та обрізання
+    def test_changes_since(self):
+        self.storage.save("books", 1, {"id": 1})
+        self.storage.save("books", 1, {"id": 1, "quantity": 2})
+        self.storage.delete("books", 1)
+        self.assertEqual(self.storage.changes_since(0), [(1, "books", 1, {"id": 1}),
+                                                         (2, "books", 1, {"id": 1, "quantity": 2}),
+                                                         (3, "books", 1, None)])
+        self.assertEqual(self.storage.changes_since(2), [(3, "books", 1, None)])
+        self.storage.prune(keep=1)
+        self.assertIsNone(self.storage.changes_since(0))
+        self.assertEqual(self.storage.changes_since(3), [])
+
+    # Тест, що запис у зайняту базу швидко відмовляє, а пам'ять репозиторію не змінюється
+    def test_busy_database_fails_fast(self):
+        storage = SharedSQLiteStorage(os.path.join(self.tmp.name, "shared.db"), busy_timeout=0.05)
+        books = BookRepository(kind="books", storage=storage)
+        books.add({"id": 1, "quantity": 3})
+        holder = sqlite3.connect(os.path.join(self.tmp.name, "shared.db"), isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            started = time.perf_counter()
+            for write in (lambda: books.add({"id": 2}), lambda: books.put({"id": 1, "quantity": 9}),
+                          lambda: books.update(1, quantity=7), lambda: books.delete(1),
+                          lambda: books.reserve(1, 1)):
+                with self.assertRaises(StorageBusy):
+                    write()
+            self.assertLess(time.perf_counter() - started, 2)
+            self.assertEqual(list(books), [{"id": 1, "quantity": 3}])
+        finally:
+            holder.execute("ROLLBACK")
+            holder.close()
+        self.assertEqual(books.reserve(1, 1)["quantity"], 2)
+        storage.close()
+
+
+class TestOpenStorage(unittest.TestCase):
+
+    def test_unknown_storage(self):
+        with self.assertRaises(ValueError):
+            open_storage("redis:localhost")
+
+    # Тест, що спільне сховище не загортається в чергу
+    def test_shared_storage_is_not_queued(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = open_storage("shared:" + os.path.join(tmp, "shared.db"), queued=True)
+            self.assertIsInstance(storage, SharedSQLiteStorage)
+            storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()